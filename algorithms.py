@@ -1,114 +1,164 @@
+"""Disk scheduling algorithms.
+
+Every algorithm takes the request queue (a list or a 1-D array of
+cylinders), the head position and the disk size. It returns the service
+order as a NumPy array whose first element is the head. The array is int32
+whenever the disk fits in it, so a sequence costs 4 bytes per request
+instead of a Python list's ~36. The sorted queue is split at the head, and
+the two partitions are copied straight from slice views into one
+preallocated output.
+"""
+import numpy as np
+
+INT32_LIMIT = np.iinfo(np.int32).max
+
+def sequence_dtype(disk_size):
+    """Smallest integer dtype that holds every cylinder of the disk"""
+    return np.int32 if disk_size - 1 <= INT32_LIMIT else np.int64
+
+def assemble(dtype, *parts):
+    """Write scalars and array views into one new buffer, in order"""
+    sequence = np.empty(sum(np.size(part) for part in parts), dtype=dtype)
+    start = 0
+    for part in parts:
+        stop = start + np.size(part)
+        sequence[start:stop] = part
+        start = stop
+    return sequence
+
+def split_at_head(requests, head, dtype):
+    """Sorted queue as (below head, at or above head) views"""
+    ordered = np.sort(np.asarray(requests, dtype=dtype))
+    # Find the split point (first request at or beyond the head)
+    split_point = np.searchsorted(ordered, head, side='left')
+    return ordered[:split_point], ordered[split_point:]
+
 def fcfs(requests, head, disk_size):
     """First Come First Serve algorithm"""
-    sequence = [head] + requests
-    return sequence
+    return assemble(sequence_dtype(disk_size), head, np.asarray(requests))
 
 def sstf(requests, head, disk_size):
-    """Shortest Seek Time First algorithm"""
+    """Shortest Seek Time First algorithm
+
+    Serviced requests always form a contiguous run of the sorted queue, so
+    the next request is one of the two neighbours of that run. Sorting once
+    and walking two pointers outwards keeps this O(n log n).
+
+    Tie-break: when the nearest request below and the nearest request above
+    the head are equally far away, the one that appears first in the
+    original request queue is serviced first.
+    """
+    dtype = sequence_dtype(disk_size)
+    requests = np.asarray(requests, dtype=dtype)
+    if not len(requests):
+        return assemble(dtype, head)
+
+    # Collapse duplicates: once the head reaches a cylinder, every request
+    # for that cylinder is serviced before moving on (seek distance 0)
+    values, first_index, counts = np.unique(requests, return_index=True, return_counts=True)
+    positions = values.tolist()
+    first_index = first_index.tolist()
+
+    # Nearest unserviced request on each side of the head
+    hi = int(np.searchsorted(values, head, side='left'))
+    lo = hi - 1
     current = head
-    sequence = [head]
-    remaining = requests.copy()
-    
-    while remaining:
-        # Find the closest request
-        closest = min(remaining, key=lambda x: abs(x - current))
-        sequence.append(closest)
-        current = closest
-        remaining.remove(closest)
-    
-    return sequence
+    order = []
+
+    while lo >= 0 or hi < len(positions):
+        if lo < 0:
+            take_high = True
+        elif hi >= len(positions):
+            take_high = False
+        else:
+            down = current - positions[lo]
+            up = positions[hi] - current
+            if up != down:
+                take_high = up < down
+            else:
+                take_high = first_index[hi] < first_index[lo]
+
+        if take_high:
+            order.append(hi)
+            current = positions[hi]
+            hi += 1
+        else:
+            order.append(lo)
+            current = positions[lo]
+            lo -= 1
+
+    return assemble(dtype, head, np.repeat(values[order], counts[order]))
 
 def scan(requests, head, disk_size):
     """SCAN (Elevator) algorithm"""
-    sequence = [head]
-    current = head
-    
-    # Sort requests
-    requests = sorted(requests)
-    
-    # Find the split point
-    split_point = 0
-    for i, req in enumerate(requests):
-        if req >= head:
-            split_point = i
-            break
-    
-    # Go right first
-    sequence.extend(requests[split_point:])
-    sequence.append(disk_size - 1)
-    
-    # Then go left
-    sequence.extend(reversed(requests[:split_point]))
-    
-    return sequence
+    dtype = sequence_dtype(disk_size)
+    left, right = split_at_head(requests, head, dtype)
+    # Go right to the end of the disk, then back left
+    return assemble(dtype, head, right, disk_size - 1, left[::-1])
 
 def cscan(requests, head, disk_size):
     """C-SCAN (Circular SCAN) algorithm"""
-    sequence = [head]
-    current = head
-    
-    # Sort requests
-    requests = sorted(requests)
-    
-    # Find the split point
-    split_point = 0
-    for i, req in enumerate(requests):
-        if req >= head:
-            split_point = i
-            break
-    
-    # Go right first
-    sequence.extend(requests[split_point:])
-    sequence.append(disk_size - 1)
-    sequence.append(0)  # Jump to beginning
-    
-    # Continue from beginning
-    sequence.extend(requests[:split_point])
-    
-    return sequence
+    dtype = sequence_dtype(disk_size)
+    left, right = split_at_head(requests, head, dtype)
+    # Go right to the end, jump to the beginning and continue
+    return assemble(dtype, head, right, disk_size - 1, 0, left)
 
 def look(requests, head, disk_size):
     """LOOK algorithm"""
-    sequence = [head]
-    current = head
-    
-    # Sort requests
-    requests = sorted(requests)
-    
-    # Find the split point
-    split_point = 0
-    for i, req in enumerate(requests):
-        if req >= head:
-            split_point = i
-            break
-    
-    # Go right first
-    sequence.extend(requests[split_point:])
-    
-    # Then go left
-    sequence.extend(reversed(requests[:split_point]))
-    
-    return sequence
+    dtype = sequence_dtype(disk_size)
+    left, right = split_at_head(requests, head, dtype)
+    # Go right, then left
+    return assemble(dtype, head, right, left[::-1])
 
 def clook(requests, head, disk_size):
     """C-LOOK algorithm"""
-    sequence = [head]
-    current = head
-    
-    # Sort requests
-    requests = sorted(requests)
-    
-    # Find the split point
-    split_point = 0
-    for i, req in enumerate(requests):
-        if req >= head:
-            split_point = i
-            break
-    
-    # Go right first
-    sequence.extend(requests[split_point:])
-    
-    # Jump to beginning of requests
-    sequence.extend(requests[:split_point])
-    
-    return sequence 
\ No newline at end of file
+    dtype = sequence_dtype(disk_size)
+    left, right = split_at_head(requests, head, dtype)
+    # Go right, then jump to the lowest request
+    return assemble(dtype, head, right, left)
+
+def _online(policy, requests, head, disk_size):
+    # These schedulers are defined by their pending queues and timers, so
+    # a static queue is run through the event-driven simulation with every
+    # request arriving at t=0 as a read
+    import timesim
+    sequence = timesim.simulate(requests, None, head, disk_size, policy)["sequence"]
+    return np.asarray(sequence, dtype=sequence_dtype(disk_size))
+
+def nstep_scan(requests, head, disk_size):
+    """N-Step SCAN algorithm"""
+    return _online("N-Step SCAN", requests, head, disk_size)
+
+def fscan(requests, head, disk_size):
+    """F-SCAN algorithm"""
+    return _online("F-SCAN", requests, head, disk_size)
+
+def deadline(requests, head, disk_size):
+    """Deadline algorithm (read/write expiry FIFOs)"""
+    return _online("Deadline", requests, head, disk_size)
+
+def mq_deadline(requests, head, disk_size):
+    """mq-deadline style batching algorithm"""
+    return _online("MQ-Deadline", requests, head, disk_size)
+
+def satf(requests, head, disk_size):
+    """Shortest Access Time First algorithm
+
+    Requests may be (cylinder, sector) pairs. Plain cylinders have no known
+    sector, so each is charged half a revolution and the order is SSTF's.
+    """
+    return _online("SATF", requests, head, disk_size)
+
+ALGORITHMS = {
+    "FCFS": fcfs,
+    "SSTF": sstf,
+    "SCAN": scan,
+    "C-SCAN": cscan,
+    "LOOK": look,
+    "C-LOOK": clook,
+    "N-Step SCAN": nstep_scan,
+    "F-SCAN": fscan,
+    "Deadline": deadline,
+    "MQ-Deadline": mq_deadline,
+    "SATF": satf
+}
@@ -0,0 +1,138 @@
+"""Vectorized scheduling over many workloads at once.
+
+Each function takes a 2-D array of workloads (one scenario per row), a
+vector of head positions and a disk size (scalar or one per row), and
+returns the service orders as a 2-D array whose first column is the head.
+The orders match the single-queue functions in algorithms.py.
+"""
+import numpy as np
+
+import algorithms
+
+def _prepare(workloads, heads, disk_size):
+    workloads = np.atleast_2d(np.asarray(workloads, dtype=np.int64))
+    rows = workloads.shape[0]
+    heads = np.broadcast_to(np.asarray(heads, dtype=np.int64), (rows,))
+    disk_size = np.broadcast_to(np.asarray(disk_size, dtype=np.int64), (rows,))
+    return workloads, heads, disk_size
+
+def _split(workloads, heads):
+    """Sort every row and find where each head splits it"""
+    ordered = np.sort(workloads, axis=1)
+    # Row-wise searchsorted(side='left'): count of requests below the head
+    split = (ordered < heads[:, None]).sum(axis=1)
+    return ordered, split
+
+def _with_head(heads, body):
+    return np.concatenate([heads[:, None], body], axis=1)
+
+def _insert_columns(body, position, values):
+    """Insert per-row constant columns into body at a per-row position"""
+    rows, n = body.shape
+    width = n + values.shape[1]
+    col = np.arange(width)[None, :]
+    offset = col - position[:, None]
+    inserted = (offset >= 0) & (offset < values.shape[1])
+    src = np.where(offset >= values.shape[1], col - values.shape[1], col)
+    src = np.clip(src, 0, max(n - 1, 0))
+    if n:
+        out = np.take_along_axis(body, src, axis=1)
+    else:
+        out = np.empty((rows, width), dtype=body.dtype)
+    extra = np.take_along_axis(values, np.clip(offset, 0, values.shape[1] - 1), axis=1)
+    return np.where(inserted, extra, out)
+
+def fcfs_batch(workloads, heads, disk_size):
+    """First Come First Serve over a batch of workloads"""
+    workloads, heads, disk_size = _prepare(workloads, heads, disk_size)
+    return _with_head(heads, workloads)
+
+def sstf_batch(workloads, heads, disk_size):
+    """Shortest Seek Time First over a batch of workloads
+
+    SSTF picks each request from the current head position, so it cannot be
+    expressed as a single array operation; rows are run through
+    algorithms.sstf one at a time.
+    """
+    workloads, heads, disk_size = _prepare(workloads, heads, disk_size)
+    out = np.empty((workloads.shape[0], workloads.shape[1] + 1), dtype=np.int64)
+    for row in range(workloads.shape[0]):
+        out[row] = algorithms.sstf(workloads[row], int(heads[row]), int(disk_size[row]))
+    return out
+
+def look_batch(workloads, heads, disk_size):
+    """LOOK over a batch of workloads"""
+    workloads, heads, disk_size = _prepare(workloads, heads, disk_size)
+    ordered, split = _split(workloads, heads)
+    n = ordered.shape[1]
+    j = np.arange(n)[None, :]
+    k = split[:, None]
+    # Right side ascending, then left side descending
+    index = np.where(j < n - k, k + j, n - 1 - j)
+    return _with_head(heads, np.take_along_axis(ordered, index, axis=1))
+
+def clook_batch(workloads, heads, disk_size):
+    """C-LOOK over a batch of workloads"""
+    workloads, heads, disk_size = _prepare(workloads, heads, disk_size)
+    ordered, split = _split(workloads, heads)
+    n = ordered.shape[1]
+    if n == 0:
+        return heads[:, None].copy()
+    # Right side ascending, then wrap around to the lowest request
+    index = (split[:, None] + np.arange(n)[None, :]) % n
+    return _with_head(heads, np.take_along_axis(ordered, index, axis=1))
+
+def scan_batch(workloads, heads, disk_size):
+    """SCAN (Elevator) over a batch of workloads"""
+    workloads, heads, disk_size = _prepare(workloads, heads, disk_size)
+    body = look_batch(workloads, heads, disk_size)[:, 1:]
+    _, split = _split(workloads, heads)
+    edge = (disk_size - 1)[:, None]
+    body = _insert_columns(body, body.shape[1] - split, edge)
+    return _with_head(heads, body)
+
+def cscan_batch(workloads, heads, disk_size):
+    """C-SCAN (Circular SCAN) over a batch of workloads"""
+    workloads, heads, disk_size = _prepare(workloads, heads, disk_size)
+    body = clook_batch(workloads, heads, disk_size)[:, 1:]
+    _, split = _split(workloads, heads)
+    edges = np.stack([disk_size - 1, np.zeros_like(disk_size)], axis=1)
+    body = _insert_columns(body, body.shape[1] - split, edges)
+    return _with_head(heads, body)
+
+BATCH_ALGORITHMS = {
+    "FCFS": fcfs_batch,
+    "SSTF": sstf_batch,
+    "SCAN": scan_batch,
+    "C-SCAN": cscan_batch,
+    "LOOK": look_batch,
+    "C-LOOK": clook_batch
+}
+
+def batch_metrics(sequences):
+    """Calculate calculate_metrics-style fields for every row of a batch"""
+    sequences = np.atleast_2d(sequences)
+    num_operations = max(sequences.shape[1] - 1, 0)
+    total_movement = np.abs(np.diff(sequences, axis=1)).sum(axis=1)
+    if num_operations:
+        avg_seek_time = total_movement / num_operations
+    else:
+        avg_seek_time = np.zeros(sequences.shape[0])
+    return {
+        "total_movement": total_movement,
+        "avg_seek_time": avg_seek_time,
+        "num_operations": num_operations
+    }
+
+def run_batch(workloads, heads, disk_size, selected=None):
+    """Run the selected algorithms over every workload row
+
+    Returns a dict keyed by algorithm name holding the service orders under
+    "sequence" plus the batch_metrics fields for each row.
+    """
+    workloads, heads, disk_size = _prepare(workloads, heads, disk_size)
+    results = {}
+    for algo in selected or BATCH_ALGORITHMS:
+        sequences = BATCH_ALGORITHMS[algo](workloads, heads, disk_size)
+        results[algo] = {"sequence": sequences, **batch_metrics(sequences)}
+    return results
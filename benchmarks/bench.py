@@ -0,0 +1,220 @@
+"""Scaling benchmarks for the scheduling algorithms, metrics and rendering.
+
+Every benchmark runs over workloads of growing size (10 up to --max-size
+requests). It records wall time, peak traced memory and requests per second
+into a JSON results file. Sizes are abandoned for a benchmark once one run
+takes longer than --time-limit, so a quadratic path stops early instead of
+stalling the whole suite.
+
+    python benchmarks/bench.py --max-size 1000000 -o results.json
+    python benchmarks/bench.py --save-baseline benchmarks/baseline.json
+    python benchmarks/bench.py --baseline benchmarks/baseline.json
+
+With --baseline the exit status is 1 if any benchmark got slower than the
+baseline by more than --tolerance (a fraction, 1.0 means twice as slow),
+or no longer reached a size the baseline did: a path that turned
+quadratic hits --time-limit early and drops its larger sizes.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+import algorithms
+import batch
+from decimate import plot_decimated
+from metrics import calculate_metrics
+from renderer import SequenceRenderer
+
+DISK_SIZE = 1 << 20
+SEED = 1234
+
+def make_workload(size):
+    rng = np.random.default_rng(SEED)
+    return rng.integers(0, DISK_SIZE, size)
+
+def bench_algorithm(func):
+    def setup(size):
+        requests = make_workload(size)
+        return lambda: func(requests, DISK_SIZE // 2, DISK_SIZE)
+    return setup
+
+def bench_metrics(size):
+    sequence = algorithms.fcfs(make_workload(size), DISK_SIZE // 2, DISK_SIZE)
+    return lambda: calculate_metrics(sequence)
+
+def bench_batch(size):
+    # Square-ish batch: rows * columns == size
+    columns = max(int(size ** 0.5), 1)
+    rows = max(size // columns, 1)
+    rng = np.random.default_rng(SEED)
+    workloads = rng.integers(0, DISK_SIZE, (rows, columns))
+    heads = rng.integers(0, DISK_SIZE, rows)
+    selected = ["FCFS", "SCAN", "C-SCAN", "LOOK", "C-LOOK"]
+    return lambda: batch.run_batch(workloads, heads, DISK_SIZE, selected)
+
+def bench_comparison_plot(size):
+    requests = make_workload(size)
+    sequences = [algorithms.ALGORITHMS[name](requests, DISK_SIZE // 2, DISK_SIZE)
+                 for name in ("FCFS", "SSTF", "LOOK")]
+
+    def run():
+        fig, ax = plt.subplots(figsize=(10, 6))
+        for sequence in sequences:
+            plot_decimated(ax, np.arange(len(sequence)), np.asarray(sequence), marker='o')
+        ax.legend(["FCFS", "SSTF", "LOOK"])
+        fig.canvas.draw()
+        plt.close(fig)
+    return run
+
+def bench_animation(size):
+    sequence = algorithms.look(make_workload(size), DISK_SIZE // 2, DISK_SIZE)
+
+    def run():
+        fig, ax = plt.subplots(figsize=(10, 6))
+        ax.set_ylim(-10, DISK_SIZE + 10)
+        renderer = SequenceRenderer(ax, sequence, '#1f77b4')
+        fig.canvas.draw()
+        for frame in range(len(sequence)):
+            renderer.show(frame)
+        renderer.finish()
+        plt.close(fig)
+    return run
+
+BENCHMARKS = {
+    **{f"algorithms.{func.__name__}": bench_algorithm(func) for func in algorithms.ALGORITHMS.values()},
+    "metrics.calculate_metrics": bench_metrics,
+    "batch.run_batch": bench_batch,
+    "plot.comparison": bench_comparison_plot,
+    "plot.animation": bench_animation,
+}
+
+# Frame-by-frame animation is bounded by the canvas, not by the algorithms
+MAX_SIZES = {"plot.animation": 10 ** 3}
+
+def measure(setup, size, track_memory):
+    run = setup(size)
+    gc.collect()
+    start = time.perf_counter()
+    run()
+    wall_time = time.perf_counter() - start
+
+    peak_memory = None
+    if track_memory:
+        run = setup(size)
+        gc.collect()
+        tracemalloc.start()
+        run()
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return {
+        "size": size,
+        "wall_time": wall_time,
+        "peak_memory": peak_memory,
+        "ops_per_sec": size / wall_time if wall_time > 0 else None
+    }
+
+def run_benchmarks(names, sizes, time_limit, track_memory):
+    results = []
+    for name in names:
+        for size in sizes:
+            if size > MAX_SIZES.get(name, size):
+                break
+            result = {"benchmark": name, **measure(BENCHMARKS[name], size, track_memory)}
+            results.append(result)
+            print(f"{name:28s} n={size:<10d} {result['wall_time']:10.4f}s", file=sys.stderr)
+            if result["wall_time"] > time_limit:
+                break
+    return results
+
+def compare(results, baseline, tolerance, sizes=None):
+    """Return (benchmark, size, baseline_time, time) for every regression
+
+    A size the baseline has but this run skipped counts too, with a time
+    of None. Only benchmarks that ran, and sizes in `sizes` if given, are
+    expected.
+    """
+    reference = {(r["benchmark"], r["size"]): r["wall_time"] for r in baseline["results"]}
+    measured = {(r["benchmark"], r["size"]) for r in results}
+    ran = {r["benchmark"] for r in results}
+    regressions = [(name, size, before, None) for (name, size), before in reference.items()
+                   if name in ran and (name, size) not in measured and (sizes is None or size in sizes)]
+    for result in results:
+        key = (result["benchmark"], result["size"])
+        if key not in reference:
+            continue
+        # Ignore sub-millisecond runs, they are dominated by timer noise
+        if max(reference[key], result["wall_time"]) < 1e-3:
+            continue
+        if result["wall_time"] > reference[key] * (1 + tolerance):
+            regressions.append((*key, reference[key], result["wall_time"]))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the scaling benchmark suite")
+    parser.add_argument("-o", "--output", default="bench_results.json",
+                        help="JSON results file")
+    parser.add_argument("--max-size", type=int, default=10 ** 7,
+                        help="Largest workload size (sizes go up by powers of ten from 10)")
+    parser.add_argument("--time-limit", type=float, default=10.0,
+                        help="Skip larger sizes once a run takes longer than this many seconds")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="Skip the second, tracemalloc-instrumented run of each size")
+    parser.add_argument("-k", "--filter", default="",
+                        help="Only run benchmarks whose name contains this string")
+    parser.add_argument("--baseline", help="Baseline results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=1.0,
+                        help="Allowed slowdown relative to the baseline")
+    parser.add_argument("--save-baseline", help="Also write the results to this baseline file")
+    args = parser.parse_args(argv)
+
+    sizes = []
+    size = 10
+    while size <= args.max_size:
+        sizes.append(size)
+        size *= 10
+    names = [name for name in BENCHMARKS if args.filter in name]
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "matplotlib": matplotlib.__version__,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": run_benchmarks(names, sizes, args.time_limit, not args.no_memory)
+    }
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(report["results"], baseline, args.tolerance, sizes)
+        for name, size, before, after in regressions:
+            after = "not reached" if after is None else f"{after:.4f}s"
+            print(f"REGRESSION {name} n={size}: {before:.4f}s -> {after}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
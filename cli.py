@@ -0,0 +1,246 @@
+"""Headless batch runner for the disk scheduling algorithms.
+
+Reads one scenario per line as JSON, for example
+
+    {"id": 1, "head": 50, "disk_size": 200, "requests": [98, 183, 37], "algorithms": ["SSTF", "LOOK"]}
+
+and writes one JSON line of metrics per scenario and algorithm. Instead of
+"requests" a scenario may name a block-I/O trace to replay:
+
+    {"head": 0, "disk_size": 5000, "trace": {"path": "hm_0.csv", "format": "msr", "chunk_size": 1024}}
+
+and an "arrivals" list (ms, one per request) switches to the event-driven
+simulation in timesim.py, which adds wait/response percentiles. A
+"sectors" list (one per request) does the same and makes rotational
+latency exact, which is what SATF schedules on. With --optimal each
+scenario also gets an "OPTIMAL" record from oracle.py and every record an
+"optimality_gap": relative to the least possible head movement, or for
+timed scenarios to the lower bound on the makespan. A "workload" object
+generates the requests (and arrivals, if it names an arrival process)
+with workloads.py instead of listing them:
+
+    {"head": 0, "disk_size": 5000, "workload": {"n": 1000, "pattern": "zipf", "seed": 7, "arrivals": "poisson"}}
+
+Trace scenarios take --drive and --optimal but not --sequence. Their
+OPTIMAL record is the least head movement when each chunk is served in
+turn, and has no timings.
+
+Every record repeats the scenario's "head", "disk_size" and queue
+"depth" (and a workload's "pattern" and "seed"), so results.py can
+filter imported CLI output on them like sweep output.
+
+--profile writes a Chrome trace of the run (see profiling.py), with a
+span per algorithm run and metric calculation.
+
+Neither tkinter nor matplotlib is imported, only the scheduling modules
+and NumPy, so it runs on machines without a display or the GUI
+dependencies.
+"""
+import argparse
+import json
+import sys
+
+from metrics import calculate_metrics
+from profiling import PROFILER
+from registry import ALGORITHMS, get_algorithm
+
+def scenario_fields(scenario, head, disk_size):
+    """Scenario parameters repeated in each record, so results.py can filter on them"""
+    fields = {"id": scenario["id"]} if "id" in scenario else {}
+    fields.update(head=head, disk_size=disk_size)
+    if "workload" in scenario:
+        workload = scenario["workload"]
+        fields["depth"] = int(workload["n"])
+        fields["pattern"] = workload.get("pattern", "uniform")
+        if workload.get("seed") is not None:
+            fields["seed"] = int(workload["seed"])
+    elif "requests" in scenario:
+        fields["depth"] = len(scenario["requests"])
+    return fields
+
+def run_scenario(scenario, default_algorithms=None, include_sequence=False, drive=None,
+                 optimal=False):
+    """Yield one metrics record per algorithm for a single scenario"""
+    head = int(scenario["head"])
+    disk_size = int(scenario["disk_size"])
+    names = scenario.get("algorithms") or default_algorithms or list(ALGORITHMS)
+    if "drive" in scenario:
+        from drive import DriveModel
+        drive = DriveModel.from_dict(scenario["drive"])
+    if "trace" in scenario:
+        yield from run_trace_scenario(scenario, names, head, disk_size, drive, include_sequence,
+                                      optimal)
+        return
+    fields = scenario_fields(scenario, head, disk_size)
+    if "workload" in scenario:
+        scenario = {**scenario, **generated_requests(scenario["workload"], disk_size)}
+    requests = [int(r) for r in scenario["requests"]]
+    if "arrivals" in scenario or "sectors" in scenario:
+        yield from run_timed_scenario(scenario, names, requests, head, disk_size, drive,
+                                      include_sequence, optimal)
+        return
+
+    best = None
+    if optimal:
+        import oracle
+        best = oracle.optimal_movement(requests, head)
+    for name in names:
+        with PROFILER.phase(f"algorithm:{name}", "algorithm"):
+            sequence = get_algorithm(name)(requests, head, disk_size)
+        with PROFILER.phase("calculate_metrics", "metrics"):
+            record = {"algorithm": name, **calculate_metrics(sequence, drive, requests)}
+        PROFILER.count("requests_processed", len(requests))
+        if optimal:
+            record["optimality_gap"] = oracle.optimality_gap(record["total_movement"], best)
+        if include_sequence:
+            record["sequence"] = sequence.tolist()
+        yield {**fields, **record}
+    if optimal:
+        record = {"algorithm": oracle.NAME, **oracle.optimal_metrics(requests, head, disk_size, drive)}
+        if include_sequence:
+            record["sequence"] = oracle.optimal_sequence(requests, head, disk_size).tolist()
+        yield {**fields, **record}
+
+def generated_requests(workload, disk_size):
+    """Scenario fields for a workloads.py generator spec"""
+    import workloads
+
+    generated = workloads.generate_workload(
+        int(workload["n"]), disk_size, workload.get("pattern", "uniform"), workload.get("seed"),
+        write_fraction=workload.get("write_fraction", 0.0), arrivals=workload.get("arrivals"),
+        pattern_params=workload.get("pattern_params"), arrival_params=workload.get("arrival_params"))
+    fields = {"requests": generated["cylinder"].tolist(), "writes": generated["write"].tolist()}
+    if "arrival" in generated:
+        fields["arrivals"] = generated["arrival"].tolist()
+    return fields
+
+def run_trace_scenario(scenario, names, head, disk_size, drive=None, include_sequence=False,
+                       optimal=False):
+    """Replay a block-I/O trace instead of an inline request list"""
+    # Like oracle, workloads and timesim, only loaded by the scenarios that use it
+    import traces
+
+    if include_sequence:
+        raise ValueError("--sequence is not supported for trace scenarios")
+    fields = scenario_fields(scenario, head, disk_size)
+    trace = scenario["trace"]
+    chunk_size = int(trace.get("chunk_size", traces.DEFAULT_CHUNK_SIZE))
+    highest_lba = trace.get("max_lba")
+    if highest_lba is None:
+        highest_lba = traces.max_lba(trace["path"], trace["format"], chunk_size)
+    highest_lba = int(highest_lba)
+
+    best = None
+    if optimal:
+        import oracle
+        with PROFILER.phase(f"replay:{oracle.NAME}", "algorithm"):
+            best, served = oracle.optimal_chunked_movement(
+                traces.iter_cylinders(trace["path"], trace["format"], disk_size, chunk_size, highest_lba), head)
+    for name in names:
+        with PROFILER.phase(f"replay:{name}", "algorithm"):
+            metrics = traces.replay(trace["path"], trace["format"], name, head, disk_size,
+                                    chunk_size, highest_lba, drive)
+        PROFILER.count("requests_processed", metrics["num_operations"])
+        record = {"algorithm": name, **metrics}
+        if optimal:
+            record["optimality_gap"] = oracle.optimality_gap(record["total_movement"], best)
+        yield {**fields, **record}
+    if optimal:
+        yield {**fields, "algorithm": oracle.NAME, "total_movement": best,
+               "avg_seek_time": best / served if served else 0, "num_operations": served}
+
+def run_timed_scenario(scenario, names, requests, head, disk_size, drive, include_sequence,
+                       optimal=False):
+    """Event-driven run where requests only become visible at their arrival time"""
+    import timesim
+
+    fields = scenario_fields(scenario, head, disk_size)
+    bound = None
+    if optimal:
+        import oracle
+        bound = oracle.makespan_bound(requests, scenario.get("arrivals"), head, disk_size, drive,
+                                      scenario.get("sizes"), scenario.get("sectors"))
+
+    for name in names:
+        if name not in timesim.POLICIES:
+            raise ValueError(f"No time-based policy for algorithm: {name}")
+        with PROFILER.phase(f"simulate:{name}", "algorithm"):
+            result = timesim.simulate(requests, scenario.get("arrivals"), head, disk_size, name,
+                                      drive, scenario.get("sizes"), scenario.get("writes"),
+                                      scenario.get("sectors"))
+        PROFILER.count("requests_processed", len(requests))
+        record = {"algorithm": name, **result["metrics"]}
+        if optimal:
+            record["optimality_gap"] = oracle.optimality_gap(record["makespan_ms"], bound)
+        if include_sequence:
+            record["sequence"] = result["sequence"]
+        yield {**fields, **record}
+    if optimal:
+        record = {"algorithm": oracle.NAME, "makespan_lower_bound_ms": bound}
+        yield {**fields, **record}
+
+def run_stream(lines, out, default_algorithms=None, include_sequence=False, drive=None,
+               optimal=False):
+    """Run every scenario in an iterable of JSON lines, writing JSON lines to out
+
+    Returns the number of lines that could not be processed.
+    """
+    errors = 0
+    for line_number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            scenario = json.loads(line)
+            for record in run_scenario(scenario, default_algorithms, include_sequence, drive,
+                                       optimal):
+                out.write(json.dumps(record) + "\n")
+        except KeyError as e:
+            errors += 1
+            print(f"line {line_number}: missing field {e}", file=sys.stderr)
+        except (ValueError, TypeError, OSError) as e:
+            errors += 1
+            print(f"line {line_number}: {e}", file=sys.stderr)
+    return errors
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run disk scheduling scenarios from JSONL without the GUI")
+    parser.add_argument("input", nargs="?", default="-",
+                        help="JSONL scenario file (default: stdin)")
+    parser.add_argument("-o", "--output", default="-",
+                        help="JSONL output file (default: stdout)")
+    parser.add_argument("-a", "--algorithms", nargs="+", choices=list(ALGORITHMS),
+                        help="Algorithms for scenarios that do not list their own")
+    parser.add_argument("--sequence", action="store_true",
+                        help="Include the full service order in each record")
+    parser.add_argument("--drive", action="store_true",
+                        help="Add millisecond timings from the default drive model "
+                             "(scenarios may also give their own \"drive\" parameters)")
+    parser.add_argument("--optimal", action="store_true",
+                        help="Add an OPTIMAL record per scenario and each algorithm's optimality gap")
+    parser.add_argument("--profile", metavar="PATH",
+                        help="Write a Chrome trace of the run (open in chrome://tracing or Perfetto)")
+    args = parser.parse_args(argv)
+
+    drive = None
+    if args.drive:
+        from drive import DriveModel
+        drive = DriveModel()
+
+    infile = sys.stdin if args.input == "-" else open(args.input)
+    outfile = sys.stdout if args.output == "-" else open(args.output, "w")
+    if args.profile:
+        PROFILER.enable()
+    try:
+        errors = run_stream(infile, outfile, args.algorithms, args.sequence, drive, args.optimal)
+    finally:
+        if infile is not sys.stdin:
+            infile.close()
+        if outfile is not sys.stdout:
+            outfile.close()
+        if args.profile:
+            PROFILER.export(args.profile)
+    return 1 if errors else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+"""Level-of-detail plotting for very long sequences.
+
+DecimatedLine keeps the full data but only hands the visible part, reduced
+to the first/min/max/last point of each pixel-wide bucket, to the renderer.
+Because the reduction happens at draw time it follows zooming, panning and
+window resizes on its own. Above MARKER_THRESHOLD visible points the
+markers are dropped and the line is drawn on its own.
+"""
+import numpy as np
+from matplotlib.lines import Line2D
+
+MARKER_THRESHOLD = 2000
+STATIC_BUCKETS = 2000
+
+def minmax_decimate(x, y, buckets):
+    """Reduce (x, y) to the min and max of each of roughly `buckets` chunks
+
+    x must be sorted. The first and last points are always kept, so the
+    drawn envelope is identical to the full line at that resolution.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    n = len(y)
+    if buckets <= 0 or n <= 4 * buckets:
+        return x, y
+    keep = np.unique(np.concatenate((_extremes(y, -(-n // buckets)), [n - 1])))
+    return x[keep], y[keep]
+
+def _extremes(y, size):
+    """Sorted indices of the first point and each size-long chunk's min and max"""
+    n = len(y)
+    buckets = -(-n // size)
+    padded = np.pad(y, (0, size * buckets - n), mode='edge').reshape(buckets, size)
+    starts = np.arange(buckets) * size
+    lows = np.minimum(padded.argmin(axis=1) + starts, n - 1)
+    highs = np.minimum(padded.argmax(axis=1) + starts, n - 1)
+    return np.unique(np.concatenate(([0], lows, highs)))
+
+class DecimatedLine(Line2D):
+    def __init__(self, x, y, marker_threshold=MARKER_THRESHOLD, **kwargs):
+        self.full_marker = kwargs.pop('marker', 'None')
+        self.marker_threshold = marker_threshold
+        super().__init__([], [], marker=self.full_marker, **kwargs)
+        self._view_key = None
+        self.set_full_data(x, y)
+
+    def set_full_data(self, x, y):
+        """Replace the full data; cheap, the reduction is deferred to draw time"""
+        self.full_x = np.asarray(x)
+        self.full_y = np.asarray(y)
+        self._view_key = None
+        self.stale = True
+
+    def _visible_range(self):
+        n = len(self.full_x)
+        lo, hi = sorted(self.axes.get_xlim())
+        # One point beyond each edge keeps the line running off the axes
+        start = max(np.searchsorted(self.full_x, lo, side='left') - 1, 0)
+        stop = min(np.searchsorted(self.full_x, hi, side='right') + 1, n)
+        return start, stop
+
+    def draw(self, renderer):
+        if self.axes is not None and len(self.full_x):
+            start, stop = self._visible_range()
+            buckets = max(int(self.axes.bbox.width), 1)
+            key = (start, stop, buckets, len(self.full_x))
+            if key != self._view_key:
+                self._view_key = key
+                xs, ys = minmax_decimate(self.full_x[start:stop], self.full_y[start:stop], buckets)
+                self.set_data(xs, ys)
+                dense = stop - start > self.marker_threshold
+                self.set_marker('None' if dense else self.full_marker)
+        elif not len(self.full_x):
+            self.set_data([], [])
+        super().draw(renderer)
+
+def plot_decimated(ax, x, y, **kwargs):
+    """Add a DecimatedLine to a 2D axes and include its full extent in autoscaling"""
+    line = DecimatedLine(x, y, **kwargs)
+    ax.add_line(line)
+    if len(line.full_x):
+        ax.update_datalim([(line.full_x.min(), line.full_y.min()),
+                           (line.full_x.max(), line.full_y.max())])
+        ax.autoscale_view()
+    return line
+
+def static_decimate(x, y, buckets=STATIC_BUCKETS):
+    """Fixed-resolution reduction for axes that cannot re-decimate (3D)"""
+    return minmax_decimate(x, y, buckets)
+
+class PrefixDecimator:
+    """static_decimate() of every prefix of one sequence, for 3D playback
+
+    The chunks are sized from the full length, so a prefix is the
+    precomputed min/max points of its complete chunks plus the raw points
+    of the chunk in progress. A frame costs O(chunk size), not O(frame).
+    """
+
+    def __init__(self, x, y, buckets=STATIC_BUCKETS):
+        self.x = np.asarray(x)
+        self.y = np.asarray(y)
+        n = len(self.y)
+        self.size = -(-n // buckets) if buckets > 0 and n > 4 * buckets else 0
+        self.keep = _extremes(self.y, self.size) if self.size else None
+
+    def prefix(self, stop):
+        """Reduced (x, y) of the first stop points"""
+        if not self.size:
+            return self.x[:stop], self.y[:stop]
+        done = stop // self.size * self.size
+        index = np.concatenate((self.keep[:np.searchsorted(self.keep, done)], np.arange(done, stop)))
+        if stop and index[-1] != stop - 1:
+            index = np.append(index, stop - 1)
+        return self.x[index], self.y[index]
@@ -0,0 +1,134 @@
+"""Physical timing model of a rotating disk drive.
+
+Seek time follows the usual three-region curve: zero for no movement, a
+settle constant plus a square-root term for short seeks (arm still
+accelerating), and a constant plus a linear term for long seeks (arm
+coasting at full speed). Rotational latency and transfer time come from
+the spindle speed and the media transfer rate. The defaults are the
+Ruemmler & Wilkes figures for an HP 97560.
+
+Only the steps that serve a request pay rotational latency and transfer
+time. SCAN's stop at the disk end and C-SCAN's return to cylinder 0 are
+pure seeks; request_mask() tells them apart when the requests are given.
+"""
+import numpy as np
+
+def request_mask(sequence, requests):
+    """True for the steps of sequence (after the start) that serve a request
+
+    A cylinder visited more often than it is requested (an edge or jump
+    stop) is a request for its first visits and a pure seek after that.
+    """
+    steps = np.asarray(sequence, dtype=np.int64)[1:]
+    values, counts = np.unique(np.asarray(requests, dtype=np.int64), return_counts=True)
+    order = np.argsort(steps, kind="stable")
+    ordered = steps[order]
+    # Rank of each visit among the visits to the same cylinder
+    rank = np.arange(len(ordered)) - np.searchsorted(ordered, ordered)
+    slot = np.minimum(np.searchsorted(values, ordered), max(len(values) - 1, 0))
+    requested = np.where(values[slot] == ordered, counts[slot], 0) if len(values) else 0
+    mask = np.empty(len(steps), dtype=bool)
+    mask[order] = rank < requested
+    return mask
+
+class DriveModel:
+    def __init__(self, short_seek_ms=3.24, short_seek_sqrt_ms=0.400,
+                 long_seek_ms=8.00, long_seek_per_cyl_ms=0.008,
+                 seek_boundary=383, rpm=4002, transfer_mb_s=2.4,
+                 request_bytes=4096, sectors_per_track=72):
+        self.short_seek_ms = short_seek_ms
+        self.short_seek_sqrt_ms = short_seek_sqrt_ms
+        self.long_seek_ms = long_seek_ms
+        self.long_seek_per_cyl_ms = long_seek_per_cyl_ms
+        self.seek_boundary = seek_boundary
+        self.rpm = rpm
+        self.transfer_mb_s = transfer_mb_s
+        self.request_bytes = request_bytes
+        self.sectors_per_track = sectors_per_track
+
+    @classmethod
+    def from_dict(cls, params):
+        return cls(**params)
+
+    def key(self):
+        """Hashable identity of the parameters, for caching"""
+        return tuple(sorted(vars(self).items()))
+
+    @property
+    def rotation_ms(self):
+        return 60000.0 / self.rpm
+
+    def seek_time(self, distance):
+        """Seek time in ms for one or many cylinder distances"""
+        distance = np.abs(np.asarray(distance, dtype=np.float64))
+        short = self.short_seek_ms + self.short_seek_sqrt_ms * np.sqrt(distance)
+        long = self.long_seek_ms + self.long_seek_per_cyl_ms * distance
+        return np.where(distance == 0, 0.0, np.where(distance < self.seek_boundary, short, long))
+
+    def seek_ms(self, distance):
+        """Scalar seek_time(), cheaper for one decision at a time"""
+        distance = abs(distance)
+        if distance == 0:
+            return 0.0
+        if distance < self.seek_boundary:
+            return self.short_seek_ms + self.short_seek_sqrt_ms * distance ** 0.5
+        return self.long_seek_ms + self.long_seek_per_cyl_ms * distance
+
+    def rotational_wait(self, sector, time_ms):
+        """ms until `sector` passes under the head, starting at time_ms
+
+        The platter is taken to be at sector 0 at t=0 and spins at a
+        constant rate.
+        """
+        rotation = self.rotation_ms
+        return (sector * rotation / self.sectors_per_track - time_ms) % rotation
+
+    def transfer_time(self, sizes=None, count=1):
+        """Transfer time in ms for the given request sizes in bytes"""
+        if sizes is None:
+            sizes = np.full(count, self.request_bytes, dtype=np.float64)
+        return np.asarray(sizes, dtype=np.float64) / (self.transfer_mb_s * 1e6) * 1000.0
+
+    def service_times(self, sequence, sizes=None, requests=None):
+        """Per-step (seek, rotational latency, transfer) times in ms
+
+        Without sector positions the rotational latency of each request is
+        its expected value, half a revolution. Given the requests, steps
+        that serve none (see request_mask()) cost only their seek, and
+        sizes has one entry per served request.
+        """
+        sequence = np.asarray(sequence, dtype=np.int64)
+        seek = self.seek_time(np.diff(sequence))
+        if requests is None:
+            served = np.ones(len(seek), dtype=bool)
+        else:
+            served = request_mask(sequence, requests)
+        rotation = np.where(served, self.rotation_ms / 2, 0.0)
+        transfer = np.zeros(len(seek))
+        transfer[served] = self.transfer_time(sizes, int(served.sum()))
+        return seek, rotation, transfer
+
+    def metrics(self, sequence, sizes=None, requests=None):
+        """Timing metrics in milliseconds for a scheduling sequence
+
+        Pass the requests so that SCAN and C-SCAN edge and jump stops are
+        not charged rotation and transfer; the average is then per request.
+        """
+        if len(sequence) < 2:
+            return {
+                "seek_time_ms": 0.0,
+                "rotational_latency_ms": 0.0,
+                "transfer_time_ms": 0.0,
+                "total_time_ms": 0.0,
+                "avg_access_time_ms": 0.0
+            }
+        seek, rotation, transfer = self.service_times(sequence, sizes, requests)
+        operations = len(seek) if requests is None else len(requests)
+        total = float(seek.sum() + rotation.sum() + transfer.sum())
+        return {
+            "seek_time_ms": float(seek.sum()),
+            "rotational_latency_ms": float(rotation.sum()),
+            "transfer_time_ms": float(transfer.sum()),
+            "total_time_ms": total,
+            "avg_access_time_ms": total / operations if operations else 0.0
+        }
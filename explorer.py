@@ -0,0 +1,345 @@
+"""Sweep explorer: heatmaps of a metric over head position x queue depth.
+
+Each algorithm gets one heatmap cell per (head, depth) pair. A cell is the
+mean over a few seeded random queues, and every head of a seed sees the
+same queue. The cells are computed by the sweep.py workers (and through
+them the batch.py engine) on a process pool, one depth row per task.
+
+Rows are submitted coarse to fine: the first and last depth, then the
+middle, then the quarters and so on. Until a row is done, the display shows
+the nearest finished row in its place. A large grid therefore looks
+complete, if blocky, after the first few tasks and sharpens as the rest
+arrive. A "winner" map shows which algorithm is best in each cell, or a
+tie where several share the best value (every algorithm does at depth
+1). Each algorithm's heatmap is dimmed where it loses.
+
+Latency metrics run the queues through timesim.py with Poisson arrivals.
+"""
+from concurrent.futures import FIRST_COMPLETED, wait
+import math
+import os
+
+import numpy as np
+
+import sweep
+
+METRICS = {
+    "total_movement": "Total Head Movement",
+    "avg_seek_time": "Average Seek Distance",
+    "mean_response_ms": "Mean Response Time (ms)",
+    "p95_response_ms": "95th Percentile Response Time (ms)",
+    "p99_response_ms": "99th Percentile Response Time (ms)"
+}
+
+# Metrics that need arrival times, and the arrival process used for them
+TIMED_METRICS = {"mean_response_ms", "p95_response_ms", "p99_response_ms"}
+ARRIVALS = "poisson"
+
+# winners() codes for cells with no single best algorithm
+UNKNOWN = -1
+TIED = -2
+TIE_COLOR = "#d9d9d9"
+
+def coarse_to_fine(count):
+    """Row indices 0..count-1, spread out first and filled in later"""
+    order = []
+    seen = set()
+    step = 1 << max(count - 1, 1).bit_length()
+    while step:
+        for i in list(range(0, count, step)) + [count - 1]:
+            if 0 <= i < count and i not in seen:
+                seen.add(i)
+                order.append(i)
+        step >>= 1
+    return order
+
+def grid_axis(low, high, steps):
+    """Up to `steps` distinct, evenly spread integers from low to high"""
+    return np.unique(np.linspace(low, high, max(int(steps), 1)).round().astype(np.int64))
+
+class ExplorerGrid:
+    """Running sums of a metric per algorithm, depth row and head column"""
+
+    def __init__(self, algorithms, heads, depths, metric):
+        self.algorithms = list(algorithms)
+        self.heads = np.asarray(heads)
+        self.depths = np.asarray(depths)
+        self.metric = metric
+        shape = (len(self.algorithms), len(self.depths), len(self.heads))
+        self.sums = np.zeros(shape)
+        self.counts = np.zeros(shape, dtype=np.int64)
+        self.rows_done = np.zeros(len(self.depths), dtype=bool)
+        self._algorithm = {name: i for i, name in enumerate(self.algorithms)}
+        self._depth = {int(d): i for i, d in enumerate(self.depths)}
+        self._head = {int(h): i for i, h in enumerate(self.heads)}
+
+    def add(self, records, row):
+        """Fold one finished depth row of sweep records into the grid"""
+        a = np.array([self._algorithm[r["algorithm"]] for r in records], dtype=np.int64)
+        d = np.array([self._depth[r["depth"]] for r in records], dtype=np.int64)
+        h = np.array([self._head[r["head"]] for r in records], dtype=np.int64)
+        values = np.array([r[self.metric] for r in records], dtype=np.float64)
+        np.add.at(self.sums, (a, d, h), values)
+        np.add.at(self.counts, (a, d, h), 1)
+        # Only marked done once its sums are complete; readers look at this
+        self.rows_done[row] = True
+
+    @property
+    def progress(self):
+        return int(self.rows_done.sum()), len(self.rows_done)
+
+    def values(self, fill=True):
+        """Mean per cell, shape (algorithms, depths, heads)
+
+        Unfinished rows are NaN, or with fill a copy of the nearest
+        finished row.
+        """
+        done = np.flatnonzero(self.rows_done)
+        means = np.full(self.sums.shape, np.nan)
+        if not len(done):
+            return means
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means[:, done] = self.sums[:, done] / self.counts[:, done]
+        if fill and len(done) < len(self.rows_done):
+            rows = np.arange(len(self.rows_done))
+            right = np.clip(np.searchsorted(done, rows), 0, len(done) - 1)
+            left = np.clip(right - 1, 0, len(done) - 1)
+            nearest = np.where(np.abs(done[left] - rows) <= np.abs(done[right] - rows),
+                               done[left], done[right])
+            means = means[:, nearest]
+        return means
+
+    def winners(self, values):
+        """Index of the lowest algorithm per cell, UNKNOWN or TIED where there is none"""
+        known = ~np.isnan(values).any(axis=0)
+        filled = np.where(known, values, 0)
+        tied = (filled == filled.min(axis=0)).sum(axis=0) > 1
+        return np.where(known, np.where(tied, TIED, np.argmin(filled, axis=0)), UNKNOWN)
+
+def explore(grid, disk_size, seeds=4, pattern="uniform", workers=None, on_row=None):
+    """Fill grid using a process pool; on_row(done, total) after each row
+
+    on_row may raise to abandon the run; queued rows are then dropped.
+    """
+    spec = {
+        "heads": grid.heads.tolist(),
+        "disk_sizes": [disk_size],
+        "depths": grid.depths.tolist(),
+        "seeds": seeds,
+        "algorithms": grid.algorithms,
+        "pattern": pattern
+    }
+    if grid.metric in TIMED_METRICS:
+        spec["arrivals"] = ARRIVALS
+    spec = sweep.normalize_spec(spec)
+    row_points = len(spec["heads"]) * len(spec["seeds"])
+    rows = iter(coarse_to_fine(len(grid.depths)))
+    workers = workers or os.cpu_count() or 1
+
+    with sweep.worker_pool(workers, spec) as pool:
+        try:
+            running = {}
+            while True:
+                while len(running) < workers * 2:
+                    row = next(rows, None)
+                    if row is None:
+                        break
+                    running[pool.submit(sweep.run_chunk, row * row_points, (row + 1) * row_points)] = row
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    grid.add(future.result(), running.pop(future))
+                    if on_row:
+                        on_row(*grid.progress)
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+    return grid
+
+class SweepExplorer:
+    """Toplevel window that runs explore() in the background and draws the grid"""
+
+    def __init__(self, root, algorithms, disk_size, color_map, pattern="uniform"):
+        import tkinter as tk
+        from tkinter import ttk
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from profiling import instrument_canvas
+
+        self.tk = tk
+        self.root = root
+        self.algorithms = list(algorithms)
+        self.color_map = color_map
+        self.pattern = pattern
+        self.task = None
+        self.grid = None
+        self.images = []
+
+        self.window = tk.Toplevel(root)
+        self.window.title("Sweep Explorer")
+        self.window.geometry("1100x800")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+        self.window.grid_columnconfigure(0, weight=1)
+        self.window.grid_rowconfigure(1, weight=1)
+
+        self.disk_size = tk.IntVar(value=disk_size)
+        self.head_steps = tk.IntVar(value=200)
+        self.max_depth = tk.IntVar(value=200)
+        self.depth_steps = tk.IntVar(value=200)
+        self.seeds = tk.IntVar(value=4)
+        self.metric = tk.StringVar(value="total_movement")
+        self.status = tk.StringVar(value="")
+
+        controls = ttk.Frame(self.window, padding="5")
+        controls.grid(row=0, column=0, sticky="ew")
+        fields = [("Disk Size:", self.disk_size), ("Head Steps:", self.head_steps),
+                  ("Max Depth:", self.max_depth), ("Depth Steps:", self.depth_steps),
+                  ("Seeds:", self.seeds)]
+        for column, (label, variable) in enumerate(fields):
+            ttk.Label(controls, text=label).grid(row=0, column=2 * column, padx=2)
+            ttk.Entry(controls, textvariable=variable, width=6).grid(row=0, column=2 * column + 1, padx=2)
+        ttk.Label(controls, text="Metric:").grid(row=1, column=0, padx=2, pady=5)
+        ttk.Combobox(controls, textvariable=self.metric, values=list(METRICS), state="readonly",
+                     width=18).grid(row=1, column=1, columnspan=3, sticky="w", pady=5)
+        ttk.Button(controls, text="Run", command=self.run).grid(row=1, column=4, pady=5)
+        self.cancel_button = ttk.Button(controls, text="Cancel", command=self.cancel, state=tk.DISABLED)
+        self.cancel_button.grid(row=1, column=5, pady=5)
+        ttk.Label(controls, textvariable=self.status).grid(row=1, column=6, columnspan=4, sticky="w")
+
+        self.fig = Figure(figsize=(11, 7))
+        self.canvas = instrument_canvas(FigureCanvasTkAgg(self.fig, master=self.window))
+        self.canvas.get_tk_widget().grid(row=1, column=0, sticky="nsew")
+
+    def run(self):
+        from tkinter import messagebox
+        from tasks import BackgroundTask
+
+        self.cancel()
+        try:
+            disk_size = self.disk_size.get()
+            heads = grid_axis(0, disk_size - 1, self.head_steps.get())
+            depths = grid_axis(1, self.max_depth.get(), self.depth_steps.get())
+            seeds = self.seeds.get()
+            if disk_size < 1 or seeds < 1 or depths[0] < 1:
+                raise ValueError("disk size, depths and seeds must be positive")
+        except (self.tk.TclError, ValueError) as e:
+            messagebox.showerror("Error", f"Invalid grid: {e}", parent=self.window)
+            return
+
+        grid = ExplorerGrid(self.algorithms, heads, depths, self.metric.get())
+        self.grid = grid
+        self.setup_figure()
+
+        def work(progress):
+            return explore(grid, disk_size, seeds, self.pattern,
+                           on_row=lambda done, total: progress(done, total, "rows"))
+
+        self.task = BackgroundTask(self.root, work, self.finished, self.failed,
+                                   self.show_progress, self.cancelled)
+        self.cancel_button.config(state=self.tk.NORMAL)
+        self.status.set("Starting workers...")
+        self.task.start()
+
+    def setup_figure(self):
+        from matplotlib.colors import ListedColormap
+        from matplotlib.patches import Patch
+
+        grid = self.grid
+        self.fig.clear()
+        panels = len(grid.algorithms) + 1
+        columns = math.ceil(math.sqrt(panels))
+        rows = math.ceil(panels / columns)
+        extent = [grid.heads[0] - 0.5, grid.heads[-1] + 0.5, grid.depths[0] - 0.5, grid.depths[-1] + 0.5]
+        blank = np.full((len(grid.depths), len(grid.heads)), np.nan)
+
+        self.images = []
+        self.masks = []
+        for i, name in enumerate(grid.algorithms):
+            ax = self.fig.add_subplot(rows, columns, i + 1)
+            self.images.append(ax.imshow(blank, origin="lower", aspect="auto", extent=extent,
+                                         cmap="viridis", interpolation="nearest"))
+            # Dims the cells this algorithm does not win
+            self.masks.append(ax.imshow(np.zeros(blank.shape + (4,)), origin="lower", aspect="auto",
+                                        extent=extent, interpolation="nearest"))
+            ax.set_title(name, fontsize=9)
+            ax.set_xlabel("Head Position", fontsize=8)
+            ax.set_ylabel("Queue Depth", fontsize=8)
+            ax.tick_params(labelsize=7)
+        self.fig.subplots_adjust(hspace=0.45, wspace=0.3)
+        self.colorbar = self.fig.colorbar(self.images[0], ax=self.fig.axes, shrink=0.8)
+        self.colorbar.set_label(METRICS[grid.metric])
+
+        colors = [self.color_map.get(name, ('#888888',))[0] for name in grid.algorithms]
+        ax = self.fig.add_subplot(rows, columns, panels)
+        # Tied cells are drawn in a neutral colour after the algorithms' own
+        self.winner_image = ax.imshow(np.ma.masked_all(blank.shape), origin="lower", aspect="auto",
+                                      extent=extent, cmap=ListedColormap(colors + [TIE_COLOR]), vmin=-0.5,
+                                      vmax=len(colors) + 0.5, interpolation="nearest")
+        ax.set_title("Winner (lowest)", fontsize=9)
+        ax.set_xlabel("Head Position", fontsize=8)
+        ax.tick_params(labelsize=7)
+        ax.legend(handles=[Patch(color=c, label=n) for n, c in zip(grid.algorithms, colors)]
+                  + [Patch(color=TIE_COLOR, label="Tie")], fontsize=7, loc="upper right")
+        self.canvas.draw()
+
+    def redraw(self):
+        values = self.grid.values()
+        finite = values[np.isfinite(values)]
+        if not len(finite):
+            return
+        low, high = float(finite.min()), float(finite.max())
+        winners = self.grid.winners(values)
+        best = values.min(axis=0)
+        for i, (image, mask) in enumerate(zip(self.images, self.masks)):
+            image.set_data(values[i])
+            image.set_clim(low, high if high > low else low + 1)
+            overlay = np.zeros(values[i].shape + (4,))
+            # Unknown cells compare as False (NaN), tied winners are not dimmed
+            overlay[..., 3] = np.where(values[i] > best, 0.55, 0.0)
+            overlay[..., :3] = 1.0
+            mask.set_data(overlay)
+        shown = np.where(winners == TIED, len(self.grid.algorithms), winners)
+        self.winner_image.set_data(np.ma.masked_equal(shown, UNKNOWN))
+        self.canvas.draw_idle()
+
+    def show_progress(self, done, total, label):
+        if not self.window.winfo_exists():
+            return
+        self.status.set(f"{done}/{total} {label}")
+        self.redraw()
+
+    def finished(self, grid):
+        self.task = None
+        if not self.window.winfo_exists():
+            return
+        self.cancel_button.config(state=self.tk.DISABLED)
+        done, total = grid.progress
+        self.status.set(f"Done: {len(grid.heads)} x {len(grid.depths)} grid, {done}/{total} rows")
+        self.redraw()
+
+    def failed(self, error):
+        from tkinter import messagebox
+
+        self.task = None
+        if not self.window.winfo_exists():
+            return
+        self.cancel_button.config(state=self.tk.DISABLED)
+        self.status.set("Failed")
+        messagebox.showerror("Error", f"Sweep failed: {error}", parent=self.window)
+
+    def cancelled(self):
+        self.task = None
+        if not self.window.winfo_exists():
+            return
+        self.cancel_button.config(state=self.tk.DISABLED)
+        done, total = self.grid.progress
+        self.status.set(f"Cancelled at {done}/{total} rows")
+        self.redraw()
+
+    def cancel(self):
+        if self.task is not None:
+            self.task.cancel()
+
+    def close(self):
+        self.cancel()
+        self.window.destroy()
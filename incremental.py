@@ -0,0 +1,228 @@
+"""Incremental metrics for SCAN, C-SCAN, LOOK and C-LOOK under queue edits.
+
+These four orders depend only on the sorted queue and the head. So their
+head movement is the length of a short path through a few waypoints (the
+head, the lowest and highest request on each side of it, and the disk
+ends), and every waypoint is a sorted-index lookup. With a drive model the
+seek time adds up seek_time() over neighbouring distinct cylinders inside
+each partition. IncrementalQueue keeps that sum up to date as cylinders
+come and go, subtracting the one pair that straddles the head.
+
+The distinct cylinders live in a blocked sorted list (sorted blocks of at
+most 2 * block_size values, found by bisecting the block maxima). Adding,
+removing or moving a request, or moving the head, costs O(log n) plus a
+shift within one block. On a queue of 10^6 requests an edit plus a
+metrics query takes tens of microseconds. Re-running a single algorithm
+takes tens of milliseconds.
+"""
+from bisect import bisect_left, insort
+
+import numpy as np
+
+import algorithms
+
+INCREMENTAL_ALGORITHMS = ("SCAN", "C-SCAN", "LOOK", "C-LOOK")
+
+DEFAULT_BLOCK_SIZE = 1024
+
+class IncrementalQueue:
+    def __init__(self, requests, head, disk_size, drive=None, block_size=DEFAULT_BLOCK_SIZE):
+        self.head = int(head)
+        self.disk_size = int(disk_size)
+        self.drive = drive
+        self.block_size = block_size
+        values, counts = np.unique(np.asarray(requests, dtype=np.int64), return_counts=True)
+        self.counts = dict(zip(values.tolist(), counts.tolist()))
+        self.total = int(counts.sum())
+        distinct = values.tolist()
+        self.blocks = [distinct[i:i + block_size] for i in range(0, len(distinct), block_size)]
+        self.maxes = [block[-1] for block in self.blocks]
+        # Seek time summed over every pair of neighbouring distinct cylinders
+        self.seek_sum = 0.0
+        if drive is not None and len(values) > 1:
+            self.seek_sum = float(drive.seek_time(np.diff(values)).sum())
+
+    def __len__(self):
+        return self.total
+
+    def __contains__(self, cylinder):
+        return cylinder in self.counts
+
+    # Sorted index of distinct cylinders
+
+    def _below(self, value):
+        """Largest distinct cylinder < value, or None"""
+        i = bisect_left(self.maxes, value)
+        if i < len(self.blocks):
+            block = self.blocks[i]
+            j = bisect_left(block, value)
+            if j:
+                return block[j - 1]
+        return self.blocks[i - 1][-1] if i else None
+
+    def _at_or_above(self, value):
+        """Smallest distinct cylinder >= value, or None"""
+        i = bisect_left(self.maxes, value)
+        if i == len(self.blocks):
+            return None
+        block = self.blocks[i]
+        return block[bisect_left(block, value)]
+
+    def _insert(self, value):
+        if not self.blocks:
+            self.blocks.append([value])
+            self.maxes.append(value)
+            return
+        i = min(bisect_left(self.maxes, value), len(self.blocks) - 1)
+        block = self.blocks[i]
+        insort(block, value)
+        self.maxes[i] = block[-1]
+        if len(block) > 2 * self.block_size:
+            half = len(block) // 2
+            self.blocks[i:i + 1] = [block[:half], block[half:]]
+            self.maxes[i:i + 1] = [block[half - 1], block[-1]]
+
+    def _delete(self, value):
+        i = bisect_left(self.maxes, value)
+        block = self.blocks[i]
+        del block[bisect_left(block, value)]
+        if block:
+            self.maxes[i] = block[-1]
+        else:
+            del self.blocks[i]
+            del self.maxes[i]
+
+    def _seek(self, low, high):
+        if low is None or high is None:
+            return 0.0
+        return self.drive.seek_ms(high - low)
+
+    # Edits
+
+    def add(self, cylinder, count=1):
+        """Queue count more requests for cylinder"""
+        cylinder = int(cylinder)
+        if cylinder in self.counts:
+            self.counts[cylinder] += count
+        else:
+            if self.drive is not None:
+                below, above = self._below(cylinder), self._at_or_above(cylinder)
+                self.seek_sum += (self._seek(below, cylinder) + self._seek(cylinder, above)
+                                  - self._seek(below, above))
+            self._insert(cylinder)
+            self.counts[cylinder] = count
+        self.total += count
+
+    def remove(self, cylinder):
+        """Drop one request for cylinder; ValueError if there is none"""
+        cylinder = int(cylinder)
+        if cylinder not in self.counts:
+            raise ValueError(f"No request for cylinder {cylinder} in the queue")
+        self.total -= 1
+        if self.counts[cylinder] > 1:
+            self.counts[cylinder] -= 1
+            return
+        del self.counts[cylinder]
+        self._delete(cylinder)
+        if self.drive is not None:
+            below, above = self._below(cylinder), self._at_or_above(cylinder)
+            self.seek_sum -= (self._seek(below, cylinder) + self._seek(cylinder, above)
+                              - self._seek(below, above))
+
+    def move(self, old, new):
+        """Change one request from cylinder old to cylinder new"""
+        self.remove(old)
+        self.add(new)
+
+    def set_head(self, head):
+        self.head = int(head)
+
+    # Results
+
+    def _path(self, name):
+        """The head's path as straight legs (start, stop, walks_a_partition)
+
+        A leg that walks a partition passes every request in it; the others
+        are jumps between partitions and the disk ends.
+        """
+        if name not in INCREMENTAL_ALGORITHMS:
+            raise ValueError(f"No incremental form for algorithm: {name}")
+        end = self.disk_size - 1
+        low_max = self._below(self.head)
+        high_min = self._at_or_above(self.head)
+        # Each partition as (first, last) in service order, or None when empty
+        right = (high_min, self.maxes[-1]) if high_min is not None else None
+        left = None
+        if low_max is not None:
+            left = (low_max, self.blocks[0][0]) if name in ("SCAN", "LOOK") else (self.blocks[0][0], low_max)
+        stops = []
+        if right:
+            stops.append(right)
+        if name == "SCAN":
+            stops.append((end, end))
+        elif name == "C-SCAN":
+            stops += [(end, end), (0, 0)]
+        if left:
+            stops.append(left)
+
+        legs = []
+        position = self.head
+        for first, last in stops:
+            legs.append((position, first, False))
+            if (first, last) in (left, right):
+                legs.append((first, last, True))
+            position = last
+        return legs
+
+    def total_movement(self, name):
+        return sum(abs(stop - start) for start, stop, _ in self._path(name))
+
+    def num_operations(self, name):
+        return self.total + {"SCAN": 1, "C-SCAN": 2}.get(name, 0)
+
+    def seek_time_ms(self, name):
+        """Drive seek time of the whole order, without building it"""
+        # Walking a partition costs the seeks between its neighbouring
+        # cylinders: all of seek_sum except the pair straddling the head
+        seek = self.seek_sum - self._seek(self._below(self.head), self._at_or_above(self.head))
+        for start, stop, walk in self._path(name):
+            if not walk:
+                seek += self.drive.seek_ms(stop - start)
+        return seek
+
+    def metrics(self, name):
+        """calculate_metrics() of the algorithm's order, with drive fields if a drive was given"""
+        operations = self.num_operations(name)
+        movement = self.total_movement(name)
+        result = {
+            "total_movement": movement,
+            "avg_seek_time": movement / operations if operations else 0,
+            "num_operations": operations
+        }
+        if self.drive is not None:
+            if operations:
+                # Edge and jump stops are seeks only; each request pays rotation and transfer
+                seek = self.seek_time_ms(name)
+                rotation = self.total * self.drive.rotation_ms / 2
+                transfer = self.total * float(self.drive.transfer_time()[0])
+                total = seek + rotation + transfer
+            else:
+                seek = rotation = transfer = total = 0.0
+            result.update({
+                "seek_time_ms": seek,
+                "rotational_latency_ms": rotation,
+                "transfer_time_ms": transfer,
+                "total_time_ms": total,
+                "avg_access_time_ms": total / self.total if self.total else 0.0
+            })
+        return result
+
+    def requests(self):
+        """The queue in sorted order"""
+        values = [value for block in self.blocks for value in block]
+        counts = [self.counts[value] for value in values]
+        return np.repeat(np.array(values, dtype=np.int64), counts)
+
+    def sequence(self, name):
+        """The full service order; O(n), for when it has to be drawn"""
+        return algorithms.ALGORITHMS[name](self.requests(), self.head, self.disk_size)
@@ -1,33 +1,26 @@
+import time
+_START = time.perf_counter()
+
+import argparse
+import csv
+import json
+import re
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib import animation
-from matplotlib.backends.backend_pdf import PdfPages
-import pandas as pd
-import random
+import numpy as np
 from itertools import cycle
-from mpl_toolkits.mplot3d import Axes3D
-import matplotlib.colors as mcolors
-
-def calculate_metrics(sequence):
-    """Calculate performance metrics for a disk scheduling sequence"""
-    if len(sequence) < 2:
-        return {
-            "total_movement": 0,
-            "avg_seek_time": 0,
-            "num_operations": 0
-        }
-    
-    total_movement = sum(abs(sequence[i] - sequence[i-1]) for i in range(1, len(sequence)))
-    avg_seek_time = total_movement / (len(sequence) - 1)
-    num_operations = len(sequence) - 1
-    
-    return {
-        "total_movement": total_movement,
-        "avg_seek_time": avg_seek_time,
-        "num_operations": num_operations
-    }
+import oracle
+import registry
+import workloads
+from drive import DriveModel
+from incremental import INCREMENTAL_ALGORITHMS, IncrementalQueue
+from renderer import SequenceRenderer
+from profiling import PROFILER, instrument_canvas
+from tasks import BackgroundTask
+from timeline import Timeline
+from decimate import MARKER_THRESHOLD, plot_decimated, static_decimate
 
 class DiskSchedulerApp:
     def __init__(self, root):
@@ -62,17 +55,37 @@ class DiskSchedulerApp:
         self.animation_speed = tk.IntVar(value=500)
         self.is_animating = False
         self.anim = None
-        self.selected_algorithms = []
+        self.renderer = None
+        self.timeline = None
+        self.timeline_axis = tk.StringVar(value="step")
+        self.timeline_value = tk.DoubleVar(value=0)
+        self.timeline_text = tk.StringVar(value="")
         self.comparison_mode = tk.BooleanVar(value=False)
         self.random_requests = tk.BooleanVar(value=False)
         self.num_requests = tk.IntVar(value=8)
+        self.workload_pattern = tk.StringVar(value="uniform")
+        self.task = None
+        self.last_results = None
+        self.scenario = None
+        self.timings = {}
+        self.status_text = tk.StringVar(value="")
+        self.profiling = tk.BooleanVar(value=False)
+        self.profile_text = tk.StringVar(value="")
+        self.queue_index = None
+        self.recommender = None
+        self.whatif_cylinder = tk.IntVar(value=0)
+        self.monte_carlo = tk.BooleanVar(value=False)
+        self.mc_tolerance = tk.DoubleVar(value=0.01)
         self.step_mode = tk.BooleanVar(value=False)
         self.current_step = 0
         self.metrics_data = []
+        self.optimal_data = None
         self.sequence = []
+        self.drive = DriveModel()
         self.view_3d = tk.BooleanVar(value=False)
         self.color_dialog = None
         self.lines = {}
+        self.legend_map = {}
 
         # Color scheme for different algorithms
         self.color_map = {
@@ -81,7 +94,12 @@ class DiskSchedulerApp:
             "SCAN": ('#6C5B7B', '#C06C84'),
             "C-SCAN": ('#45B7D1', '#FFBE0B'),
             "LOOK": ('#96CEB4', '#FFEEAD'),
-            "C-LOOK": ('#9B5DE5', '#00BBF9')
+            "C-LOOK": ('#9B5DE5', '#00BBF9'),
+            "N-Step SCAN": ('#F15BB5', '#FEE440'),
+            "F-SCAN": ('#00F5D4', '#9B5DE5'),
+            "Deadline": ('#E76F51', '#2A9D8F'),
+            "MQ-Deadline": ('#264653', '#F4A261'),
+            "SATF": ('#8338EC', '#FB5607')
         }
 
         # Configure grid
@@ -126,7 +144,7 @@ class DiskSchedulerApp:
         speed_slider.grid(row=5, column=1, pady=5, sticky="ew")
 
         # Algorithm selection
-        algorithms = ["FCFS", "SSTF", "SCAN", "C-SCAN", "LOOK", "C-LOOK"]
+        algorithms = list(registry.ALGORITHMS)
         ttk.Label(control_frame, text="Algorithm:", font=('Arial', 10, 'bold')).grid(row=6, column=0, pady=5)
         algorithm_menu = ttk.Combobox(control_frame, textvariable=self.algorithm, values=algorithms)
         algorithm_menu.grid(row=6, column=1, pady=5)
@@ -136,7 +154,7 @@ class DiskSchedulerApp:
                        variable=self.comparison_mode).grid(row=7, column=0, columnspan=2, pady=5)
 
         # Algorithm multi-select listbox (hidden by default)
-        self.algorithm_listbox = tk.Listbox(control_frame, selectmode=tk.MULTIPLE, height=6)
+        self.algorithm_listbox = tk.Listbox(control_frame, selectmode=tk.MULTIPLE, height=len(algorithms))
         self.algorithm_listbox.grid(row=8, column=0, columnspan=2, pady=5, sticky="ew")
         for algo in algorithms:
             self.algorithm_listbox.insert(tk.END, algo)
@@ -156,7 +174,9 @@ class DiskSchedulerApp:
         # Buttons
         ttk.Button(control_frame, text="Simulate", command=self.simulate).grid(row=12, column=0, columnspan=2, pady=10)
         ttk.Button(control_frame, text="Clear", command=self.clear).grid(row=13, column=0, columnspan=2, pady=5)
-        ttk.Button(control_frame, text="Export Report", command=self.export_report).grid(row=14, column=0, columnspan=2, pady=10)
+        ttk.Button(control_frame, text="Export Report", command=self.export_report).grid(row=14, column=0, pady=10)
+        ttk.Button(control_frame, text="Save to Results Store",
+                   command=self.save_to_store).grid(row=14, column=1, pady=10)
         
         # Theme toggle button
         ttk.Button(control_frame, text="Toggle Theme", 
@@ -166,24 +186,89 @@ class DiskSchedulerApp:
         ttk.Button(control_frame, text="Customize Colors", 
                   command=self.open_color_dialog).grid(row=16, column=0, columnspan=2, pady=5)
 
+        # Monte Carlo mode: rank the algorithms over many random queues of
+        # "Number of Requests" each, to the given relative CI tolerance
+        ttk.Checkbutton(control_frame, text="Monte Carlo Mode",
+                       variable=self.monte_carlo).grid(row=17, column=0, columnspan=2, pady=5)
+        ttk.Label(control_frame, text="CI Tolerance:", font=('Arial', 10, 'bold')).grid(row=18, column=0, pady=5)
+        ttk.Entry(control_frame, textvariable=self.mc_tolerance).grid(row=18, column=1, pady=5)
+
+        # Distribution of generated requests (random and Monte Carlo queues)
+        ttk.Label(control_frame, text="Workload Pattern:", font=('Arial', 10, 'bold')).grid(row=19, column=0, pady=5)
+        ttk.Combobox(control_frame, textvariable=self.workload_pattern, values=list(workloads.PATTERNS),
+                     state="readonly").grid(row=19, column=1, pady=5)
+
+        # Progress of the simulation running in the background
+        self.progress_bar = ttk.Progressbar(control_frame, mode='determinate')
+        self.progress_bar.grid(row=20, column=0, columnspan=2, pady=5, sticky="ew")
+        ttk.Label(control_frame, textvariable=self.status_text).grid(row=21, column=0, pady=5)
+        self.cancel_button = ttk.Button(control_frame, text="Cancel", command=self.cancel_task,
+                                        state=tk.DISABLED)
+        self.cancel_button.grid(row=21, column=1, pady=5)
+
+        # Profiling: live frame time/FPS overlay and a Chrome trace export
+        ttk.Checkbutton(control_frame, text="Profiling Overlay", variable=self.profiling,
+                        command=self.toggle_profiling).grid(row=22, column=0, pady=5)
+        ttk.Button(control_frame, text="Export Profile",
+                   command=self.export_profile).grid(row=22, column=1, pady=5)
+        # What-if edits: SCAN-family metrics follow queue edits without a re-run
+        ttk.Label(control_frame, text="What-if Request:", font=('Arial', 10, 'bold')).grid(row=23, column=0, pady=5)
+        ttk.Entry(control_frame, textvariable=self.whatif_cylinder).grid(row=23, column=1, pady=5)
+        ttk.Button(control_frame, text="Add Request",
+                   command=lambda: self.edit_queue(add=True)).grid(row=24, column=0, pady=5)
+        ttk.Button(control_frame, text="Remove Request",
+                   command=lambda: self.edit_queue(add=False)).grid(row=24, column=1, pady=5)
+        ttk.Button(control_frame, text="Sweep Explorer",
+                   command=self.open_explorer).grid(row=25, column=0, columnspan=2, pady=5)
+        # Pre-select the algorithms that did best on similar, already simulated queues
+        ttk.Button(control_frame, text="Recommend Algorithm",
+                   command=self.recommend).grid(row=26, column=0, columnspan=2, pady=5)
+
+        self.profile_overlay = tk.Label(self.root, textvariable=self.profile_text, justify=tk.LEFT,
+                                        font=('Courier', 9), bg='black', fg='#00ff00')
+
+        # Shared timeline under the plot, shown for 2D comparisons
+        self.timeline_frame = ttk.Frame(self.root, padding="5")
+        self.timeline_frame.grid(row=1, column=1, sticky="ew")
+        self.timeline_frame.grid_columnconfigure(1, weight=1)
+        self.play_button = ttk.Button(self.timeline_frame, text="Play", command=self.toggle_timeline)
+        self.play_button.grid(row=0, column=0, padx=5)
+        self.timeline_scale = ttk.Scale(self.timeline_frame, from_=0, to=1, orient='horizontal',
+                                        variable=self.timeline_value, command=self.scrub_timeline)
+        self.timeline_scale.grid(row=0, column=1, padx=5, sticky="ew")
+        timeline_axis = ttk.Combobox(self.timeline_frame, textvariable=self.timeline_axis,
+                                     values=["step", "time"], state="readonly", width=6)
+        timeline_axis.grid(row=0, column=2, padx=5)
+        timeline_axis.bind("<<ComboboxSelected>>", self.change_timeline_axis)
+        ttk.Label(self.timeline_frame, textvariable=self.timeline_text,
+                  justify=tk.LEFT).grid(row=1, column=0, columnspan=3, sticky="w")
+        self.timeline_frame.grid_remove()
+
         # Right panel for visualization
         self.setup_plot()
 
     def setup_plot(self):
         self.stop_animation()
+        if self.timeline is not None:
+            self.timeline.stop()
+            self.timeline = None
+            self.timeline_frame.grid_remove()
         if hasattr(self, 'canvas'):
             self.canvas.get_tk_widget().destroy()
-        if hasattr(self, 'fig'):
-            plt.close(self.fig)
         
+        # Figures are owned by the Tk canvas, so pyplot's global state is not needed
+        self.fig = Figure(figsize=(10, 6))
         if self.view_3d.get():
-            self.fig = plt.figure(figsize=(10, 6))
+            # Registers the '3d' projection; only loaded once 3D view is used
+            from mpl_toolkits.mplot3d import Axes3D
             self.ax = self.fig.add_subplot(111, projection='3d')
         else:
-            self.fig, self.ax = plt.subplots(figsize=(10, 6))
+            self.ax = self.fig.add_subplot(111)
             
-        self.canvas = FigureCanvasTkAgg(self.fig, master=self.root)
+        self.canvas = instrument_canvas(FigureCanvasTkAgg(self.fig, master=self.root))
         self.canvas.get_tk_widget().grid(row=0, column=1, padx=10, pady=10, sticky="nsew")
+        if self.profiling.get():
+            self.profile_overlay.lift()
         self.ax.set_title("Disk Scheduling Visualization")
         self.ax.set_xlabel("Request Sequence")
         self.ax.set_ylabel("Disk Position")
@@ -199,6 +284,7 @@ class DiskSchedulerApp:
         self.theme_mode.set(new_theme)
         self.apply_theme()
     
+    @PROFILER.timed("apply_theme", "render")
     def apply_theme(self):
         theme = self.themes[self.theme_mode.get()]
         
@@ -260,17 +346,11 @@ class DiskSchedulerApp:
         for algo, (color1_var, color2_var) in self.color_vars.items():
             self.color_map[algo] = (color1_var.get(), color2_var.get())
         
-        # Redraw if we have existing data
-        if self.sequence:
+        # Redraw the last results, if any, without recomputing them
+        if self.last_results:
             self.setup_plot()
-            if self.comparison_mode.get():
-                self.simulate_comparison([int(x.strip()) for x in self.request_entry.get().split(",")], 
-                                       self.head_position.get(), 
-                                       self.disk_size.get())
-            else:
-                self.simulate_single([int(x.strip()) for x in self.request_entry.get().split(",")], 
-                                   self.head_position.get(), 
-                                   self.disk_size.get())
+            self.metrics_data = []
+            self.show_results(*self.last_results)
         
         self.color_dialog.destroy()
         self.color_dialog = None
@@ -281,86 +361,306 @@ class DiskSchedulerApp:
         self.is_animating = False
         self.anim = None
 
+    def toggle_profiling(self):
+        if self.profiling.get():
+            PROFILER.enable()
+            self.profile_overlay.place(relx=1.0, rely=0.0, x=-20, y=20, anchor="ne")
+            self.profile_overlay.lift()
+            self.update_profile_overlay()
+        else:
+            PROFILER.disable()
+            self.profile_overlay.place_forget()
+
+    def update_profile_overlay(self):
+        if not self.profiling.get():
+            return
+        frame_ms, fps = PROFILER.frame_stats()
+        counters = PROFILER.summary()["counters"]
+        self.profile_text.set(
+            f"frame {frame_ms:6.1f} ms  {fps:5.1f} FPS\n"
+            f"frames {counters.get('frames', 0)}  redraws {counters.get('redraws', 0)}\n"
+            f"cache hits {counters.get('cache_hits', 0)}  misses {counters.get('cache_misses', 0)}\n"
+            f"requests {counters.get('requests_processed', 0)}"
+        )
+        self.root.after(250, self.update_profile_overlay)
+
+    def export_profile(self):
+        if not PROFILER.events:
+            messagebox.showwarning("Warning", "Nothing profiled yet; turn on Profiling Overlay and simulate")
+            return
+        file_path = filedialog.asksaveasfilename(defaultextension=".json",
+                                                 filetypes=[("Chrome Trace", "*.json")])
+        if not file_path:
+            return
+        PROFILER.export(file_path)
+        messagebox.showinfo("Success", "Profile exported; open it in chrome://tracing or Perfetto")
+
+    def recommend(self):
+        import recommender
+
+        try:
+            requests = [int(x.strip()) for x in self.request_entry.get().split(",")]
+            head_pos = self.head_position.get()
+            disk_size = self.disk_size.get()
+        except (ValueError, tk.TclError):
+            messagebox.showerror("Error", "Invalid input values")
+            return
+        if self.recommender is not None:
+            self.apply_recommendation(self.recommender.recommend(requests, head_pos, disk_size))
+            return
+
+        # The first use may have to build the index from a few quick sweeps
+        def work(progress):
+            return recommender.load_default(
+                lambda done, total: progress(done, total, "Building recommender index"))
+
+        def done(loaded):
+            self.recommender = loaded
+            self.apply_recommendation(loaded.recommend(requests, head_pos, disk_size))
+
+        self.run_task(work, done)
+
+    def apply_recommendation(self, result):
+        from recommender import ROUTINE_TOLERANCE
+
+        best = result["algorithm"]
+        self.algorithm.set(best)
+        # Routine cases need no comparison; otherwise compare only the contenders
+        selected = [best] if result["routine"] else result["candidates"]
+        self.algorithm_listbox.selection_clear(0, tk.END)
+        for i, algo in enumerate(self.algorithm_listbox.get(0, tk.END)):
+            if algo in selected:
+                self.algorithm_listbox.selection_set(i)
+        if result["routine"]:
+            self.status_text.set(f"Recommended: {best}\n(within {ROUTINE_TOLERANCE:.0%} of the best "
+                                 f"on {result['neighbours']} similar queues)")
+        else:
+            self.status_text.set(f"Recommended: {best} (best on {result['confidence']:.0%} of "
+                                 f"{result['neighbours']} similar queues)\nCompare: "
+                                 + ", ".join(result["candidates"]))
+
+    def open_explorer(self):
+        from explorer import SweepExplorer
+
+        algos = self.selected_algorithms() if self.comparison_mode.get() else []
+        try:
+            disk_size = self.disk_size.get()
+        except tk.TclError:
+            messagebox.showerror("Error", "Invalid disk size")
+            return
+        SweepExplorer(self.root, algos or list(registry.ALGORITHMS), disk_size,
+                      self.color_map, self.workload_pattern.get())
+
+    def toggle_timeline(self):
+        if self.timeline is None:
+            return
+        if self.timeline.playing:
+            self.timeline.stop()
+            self.play_button.config(text="Play")
+        else:
+            self.play_button.config(text="Pause")
+            self.timeline.start(self.animation_speed.get(),
+                                on_finish=lambda: self.play_button.config(text="Play"))
+
+    def scrub_timeline(self, value):
+        if self.timeline is not None:
+            self.timeline.show(float(value))
+
+    def timeline_moved(self, value):
+        self.timeline_value.set(value)
+        self.timeline_text.set(self.timeline.describe())
+
+    def change_timeline_axis(self, event=None):
+        # The lines themselves are drawn against the axis, so redraw them
+        if self.last_results and self.timeline is not None:
+            self.setup_plot()
+            self.metrics_data = []
+            self.show_results(*self.last_results)
+
+    def run_task(self, work, on_done):
+        """Run work(progress) on a worker thread, then on_done(result) on the Tk thread"""
+        self.cancel_task()
+        task = None
+
+        def finished(callback):
+            # Results of a superseded or cancelled task are dropped
+            def call(*args):
+                if self.task is not task:
+                    return
+                self.task = None
+                self.reset_progress()
+                try:
+                    callback(*args)
+                except Exception as e:
+                    self.task_failed(e)
+            return call
+
+        def progress(done, total, label):
+            if self.task is task:
+                self.show_progress(done, total, label)
+
+        task = BackgroundTask(self.root, work, finished(on_done), finished(self.task_failed),
+                              progress, finished(self.reset_progress))
+        self.task = task
+        self.status_text.set("Working...")
+        self.cancel_button.config(state=tk.NORMAL)
+        task.start()
+
+    def cancel_task(self):
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+            self.reset_progress()
+            self.status_text.set("Cancelled")
+
+    def show_progress(self, done, total, label):
+        if total is None:
+            self.progress_bar.config(mode='indeterminate')
+            self.progress_bar.step(4)
+        else:
+            self.progress_bar.config(mode='determinate', maximum=total, value=done)
+        self.status_text.set(label)
+
+    def reset_progress(self):
+        self.progress_bar.config(mode='determinate', value=0)
+        self.status_text.set("")
+        self.cancel_button.config(state=tk.DISABLED)
+
+    def task_failed(self, error):
+        if isinstance(error, ValueError):
+            messagebox.showerror("Error", "Invalid input values")
+        else:
+            messagebox.showerror("Error", f"An error occurred: {str(error)}")
+
+    def selected_algorithms(self):
+        if self.comparison_mode.get():
+            return [self.algorithm_listbox.get(i) for i in self.algorithm_listbox.curselection()]
+        return [self.algorithm.get()]
+
     def simulate(self):
         try:
             self.stop_animation()
             self.setup_plot()
             self.metrics_data = []
-            
-            # Get input values
-            if self.random_requests.get():
-                disk_size = self.disk_size.get()
-                requests = sorted(random.sample(range(1, disk_size), min(self.num_requests.get(), disk_size-1)))
-                self.request_entry.delete(0, tk.END)
-                self.request_entry.insert(0, ", ".join(map(str, requests)))
+
+            if self.comparison_mode.get():
+                self.algorithm_listbox.grid()
             else:
-                requests = [int(x.strip()) for x in self.request_entry.get().split(",")]
-            
+                self.algorithm_listbox.grid_remove()
+            algos = self.selected_algorithms()
+            if not algos:
+                messagebox.showwarning("Warning", "Please select at least one algorithm")
+                return
+
             head_pos = self.head_position.get()
             disk_size = self.disk_size.get()
+            comparison = self.comparison_mode.get()
+
+            if self.monte_carlo.get():
+                self.simulate_monte_carlo(algos, head_pos, disk_size)
+                return
             
-            if self.comparison_mode.get():
-                self.algorithm_listbox.grid()
-                self.simulate_comparison(requests, head_pos, disk_size)
+            # Get input values; Tk variables can only be read on this thread
+            if self.random_requests.get():
+                requests = None
+                count = self.num_requests.get()
+                pattern = self.workload_pattern.get()
             else:
-                self.algorithm_listbox.grid_remove()
-                self.simulate_single(requests, head_pos, disk_size)
-                
-            self.canvas.draw()
+                requests = [int(x.strip()) for x in self.request_entry.get().split(",")]
+                pattern = "manual"
+
+            def work(progress):
+                queue = requests
+                if queue is None:
+                    progress(0, None, "Generating requests")
+                    queue = workloads.generate_requests(count, disk_size, pattern)
+                computed = self.compute_results(algos, queue, head_pos, disk_size, progress)
+                index = None
+                if any(algo in INCREMENTAL_ALGORITHMS for algo in algos):
+                    index = IncrementalQueue(queue, head_pos, disk_size, self.drive)
+                return queue, computed, index
+
+            def done(result):
+                queue, computed, self.queue_index = result
+                self.requests = queue
+                if requests is None:
+                    self.request_entry.delete(0, tk.END)
+                    self.request_entry.insert(0, ", ".join(map(str, queue)))
+                self.scenario = {"pattern": pattern, "disk_size": disk_size, "depth": len(queue),
+                                 "head": head_pos}
+                self.show_results(head_pos, disk_size, comparison, computed)
+
+            self.run_task(work, done)
         except ValueError:
             messagebox.showerror("Error", "Invalid input values")
         except Exception as e:
             messagebox.showerror("Error", f"An error occurred: {str(e)}")
 
-    def simulate_single(self, requests, head_pos, disk_size):
-        def fcfs(requests, head, disk_size):
-            return [head] + requests
-
-        def sstf(requests, head, disk_size):
-            sequence = [head]
-            remaining = requests.copy()
-            while remaining:
-                closest = min(remaining, key=lambda x: abs(x - sequence[-1]))
-                sequence.append(closest)
-                remaining.remove(closest)
-            return sequence
-
-        def scan(requests, head, disk_size):
-            requests = sorted(requests + [0, disk_size-1])
-            left = [r for r in requests if r < head]
-            right = [r for r in requests if r >= head]
-            return [head] + right + left[::-1]
-
-        def cscan(requests, head, disk_size):
-            requests = sorted(requests + [0, disk_size-1])
-            left = [r for r in requests if r < head]
-            right = [r for r in requests if r >= head]
-            return [head] + right + [0] + left
-
-        def look(requests, head, disk_size):
-            requests = sorted(requests)
-            left = [r for r in requests if r < head]
-            right = [r for r in requests if r >= head]
-            return [head] + right + left[::-1]
-
-        def clook(requests, head, disk_size):
-            requests = sorted(requests)
-            left = [r for r in requests if r < head]
-            right = [r for r in requests if r >= head]
-            return [head] + right + left
-
-        algorithm_map = {
-            "FCFS": fcfs,
-            "SSTF": sstf,
-            "SCAN": scan,
-            "C-SCAN": cscan,
-            "LOOK": look,
-            "C-LOOK": clook
-        }
-        
-        algo = self.algorithm.get()
-        self.sequence = algorithm_map[algo](requests, head_pos, disk_size)
-        metrics = calculate_metrics(self.sequence)
+    def edit_queue(self, add):
+        """Apply a what-if edit to the queue and update the SCAN-family metrics in place"""
+        if self.queue_index is None:
+            messagebox.showwarning("Warning", "Simulate with SCAN, C-SCAN, LOOK or C-LOOK first")
+            return
+        try:
+            cylinder = self.whatif_cylinder.get()
+            if add:
+                self.queue_index.add(cylinder)
+                self.request_entry.insert(tk.END, f", {cylinder}" if self.queue_index.total > 1 else str(cylinder))
+            else:
+                self.queue_index.remove(cylinder)
+                # Drop the first occurrence from the entry text as well
+                text = self.request_entry.get()
+                match = re.search(rf"(^|,)\s*{cylinder}\s*(?=,|$)", text)
+                if match:
+                    start, end = match.span()
+                    if match.group(1) == "" and end < len(text):
+                        end += 1
+                    self.request_entry.delete(start, end)
+        except (tk.TclError, ValueError) as e:
+            messagebox.showerror("Error", f"Invalid edit: {e}")
+            return
+
+        simulated = {data["Algorithm"]: data for data in self.metrics_data}
+        lines = []
+        for algo in INCREMENTAL_ALGORITHMS:
+            if algo not in simulated:
+                continue
+            movement = self.queue_index.total_movement(algo)
+            lines.append(f"{algo}: {movement} ({movement - simulated[algo]['total_movement']:+d})")
+        self.status_text.set("What-if movement:\n" + "\n".join(lines))
+
+    @PROFILER.timed("compute_results")
+    def compute_results(self, algos, requests, head_pos, disk_size, progress):
+        """Sequences, metrics and the optimal row; runs on the worker thread"""
+        total = len(algos) + 1
+        results = {}
+        timings = {}
+        for i, algo in enumerate(algos):
+            progress(i, total, f"Running {algo}")
+            started = time.perf_counter()
+            results[algo] = registry.get_result(algo, requests, head_pos, disk_size, self.drive)
+            timings[algo] = (time.perf_counter() - started) * 1000
+        progress(len(algos), total, "Computing optimal bound")
+        started = time.perf_counter()
+        with PROFILER.phase("optimal", "algorithm"):
+            optimal = oracle.optimal_metrics(requests, head_pos, disk_size, self.drive)
+        timings[oracle.NAME] = (time.perf_counter() - started) * 1000
+        return results, optimal, timings
+
+    @PROFILER.timed("show_results", "render")
+    def show_results(self, head_pos, disk_size, comparison, computed):
+        self.last_results = (head_pos, disk_size, comparison, computed)
+        results, optimal, self.timings = computed
+        # Lower bound row; kept out of metrics_data so it is never "best"
+        self.optimal_data = {"Algorithm": oracle.NAME, **optimal}
+        if comparison:
+            self.simulate_comparison(results, disk_size)
+        else:
+            self.simulate_single(results)
+        self.canvas.draw()
+
+    def simulate_single(self, results):
+        algo, (self.sequence, metrics) = next(iter(results.items()))
         self.metrics_data.append({"Algorithm": algo, **metrics})
         
         if self.step_mode.get():
@@ -371,65 +671,10 @@ class DiskSchedulerApp:
             self.animate_sequence(self.sequence, algo)
             self.show_metrics()
 
-    def simulate_comparison(self, requests, head_pos, disk_size):
-        def fcfs(requests, head, disk_size):
-            return [head] + requests
-
-        def sstf(requests, head, disk_size):
-            sequence = [head]
-            remaining = requests.copy()
-            while remaining:
-                closest = min(remaining, key=lambda x: abs(x - sequence[-1]))
-                sequence.append(closest)
-                remaining.remove(closest)
-            return sequence
-
-        def scan(requests, head, disk_size):
-            requests = sorted(requests + [0, disk_size-1])
-            left = [r for r in requests if r < head]
-            right = [r for r in requests if r >= head]
-            return [head] + right + left[::-1]
-
-        def cscan(requests, head, disk_size):
-            requests = sorted(requests + [0, disk_size-1])
-            left = [r for r in requests if r < head]
-            right = [r for r in requests if r >= head]
-            return [head] + right + [0] + left
-
-        def look(requests, head, disk_size):
-            requests = sorted(requests)
-            left = [r for r in requests if r < head]
-            right = [r for r in requests if r >= head]
-            return [head] + right + left[::-1]
-
-        def clook(requests, head, disk_size):
-            requests = sorted(requests)
-            left = [r for r in requests if r < head]
-            right = [r for r in requests if r >= head]
-            return [head] + right + left
-
-        algorithm_map = {
-            "FCFS": fcfs,
-            "SSTF": sstf,
-            "SCAN": scan,
-            "C-SCAN": cscan,
-            "LOOK": look,
-            "C-LOOK": clook
-        }
-        
-        selected_indices = self.algorithm_listbox.curselection()
-        if not selected_indices:
-            messagebox.showwarning("Warning", "Please select at least one algorithm")
-            return
-            
-        selected_algos = [self.algorithm_listbox.get(i) for i in selected_indices]
+    def simulate_comparison(self, results, disk_size):
         sequences = {}
-        
-        # Calculate all sequences and metrics
-        for algo in selected_algos:
-            seq = algorithm_map[algo](requests, head_pos, disk_size)
+        for algo, (seq, metrics) in results.items():
             sequences[algo] = seq
-            metrics = calculate_metrics(seq)
             self.metrics_data.append({"Algorithm": algo, **metrics})
         
         # Find best algorithm
@@ -437,31 +682,43 @@ class DiskSchedulerApp:
         
         # Plot all sequences
         self.ax.clear()
-        colors = cycle(['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd', '#8c564b'])
+        palette = cycle(['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd', '#8c564b'])
+        colors = {algo: self.color_map[algo][0] if algo in self.color_map else next(palette)
+                  for algo in sequences}
+        if not self.view_3d.get():
+            self.timeline = Timeline(self.ax, sequences, colors, self.drive, self.timeline_axis.get(),
+                                     requests=self.requests)
         
+        movements = {data["Algorithm"]: data["total_movement"] for data in self.metrics_data}
+        self.lines = {}
         for algo, seq in sequences.items():
-            color = next(colors)
-            x = list(range(len(seq)))
-            y = seq
+            color = colors[algo]
+            x = np.arange(len(seq)) if self.timeline is None else self.timeline.x_values(algo)
+            y = np.asarray(seq)
+            label = f"{algo} ({movements[algo]})"
             if self.view_3d.get():
-                z = list(range(len(seq)))
-                line = self.ax.plot(x, y, z, '-', label=f"{algo} ({calculate_metrics(seq)['total_movement']})", 
-                            color=color, linewidth=2)
-                self.ax.scatter(x, y, z, color=color, s=50)
+                # 3D axes cannot re-decimate on zoom, so reduce once up front
+                xs, ys = static_decimate(x, y)
+                marker = 'o' if len(xs) <= MARKER_THRESHOLD else 'None'
+                line, = self.ax.plot(xs, ys, xs, '-', marker=marker, markersize=7, label=label,
+                                     color=color, linewidth=2)
             else:
-                line = self.ax.plot(x, y, '-', label=f"{algo} ({calculate_metrics(seq)['total_movement']})", 
-                            color=color, linewidth=2)
-                self.ax.scatter(x, y, color=color, s=50)
+                line = plot_decimated(self.ax, x, y, marker='o', markersize=7, label=label,
+                                      color=color, linewidth=2)
+            self.lines[algo] = line
             
             if algo == best_algo:
                 if self.view_3d.get():
-                    self.ax.scatter(x[-1], y[-1], z[-1], color='gold', s=200, edgecolor='black', 
+                    self.ax.scatter(x[-1], y[-1], x[-1], color='gold', s=200, edgecolor='black', 
                                   label=f"Best: {algo}", zorder=3)
                 else:
                     self.ax.scatter(x[-1], y[-1], color='gold', s=200, edgecolor='black', 
                                   label=f"Best: {algo}", zorder=3)
         
-        self.ax.set_xlabel("Request Sequence")
+        if self.timeline is not None and self.timeline.axis == "time":
+            self.ax.set_xlabel("Service Time (ms)")
+        else:
+            self.ax.set_xlabel("Request Sequence")
         self.ax.set_ylabel("Disk Position")
         if self.view_3d.get():
             self.ax.set_zlabel("Time")
@@ -470,14 +727,13 @@ class DiskSchedulerApp:
         
         # Create legend with picker enabled (updated for newer matplotlib)
         legend = self.ax.legend()
-        for line in legend.get_lines():
-            line.set_picker(5)  # 5 points tolerance
+        self.legend_map = {}
+        for legend_line, line in zip(legend.get_lines(), self.lines.values()):
+            legend_line.set_picker(5)  # 5 points tolerance
+            self.legend_map[legend_line] = line
         
         self.fig.canvas.mpl_connect('pick_event', self.on_legend_pick)
         
-        # Store line references
-        self.lines = {algo: line for algo, line in zip(sequences.keys(), self.ax.lines[::2])}
-        
         # Ensure grid is visible
         self.ax.grid(True, alpha=0.5 if self.theme_mode.get() == "dark" else 0.7)
         
@@ -485,140 +741,163 @@ class DiskSchedulerApp:
         self.apply_theme()
         self.canvas.draw()
 
+        if self.timeline is not None:
+            self.timeline.on_change = self.timeline_moved
+            self.timeline_scale.config(to=self.timeline.end)
+            self.timeline_moved(0)
+            self.play_button.config(text="Play")
+            self.timeline_frame.grid()
+
+    def simulate_monte_carlo(self, algos, head_pos, disk_size):
+        import montecarlo
+
+        depth = self.num_requests.get()
+        tolerance = self.mc_tolerance.get()
+        pattern = self.workload_pattern.get()
+
+        def work(progress):
+            def report(summary):
+                progress(summary["runs"], None, f"{summary['runs']} runs")
+            return montecarlo.run_monte_carlo(algos, head_pos, disk_size, depth, tolerance,
+                                              progress=report, pattern=pattern)
+
+        self.run_task(work, self.plot_monte_carlo)
+
+    def plot_monte_carlo(self, result):
+        # Mean head movement with its confidence interval; always a 2D chart
+        self.fig.clear()
+        self.ax = self.fig.add_subplot(111)
+        ranking = result["ranking"]
+        stats = result["algorithms"]
+        self.ax.bar(range(len(ranking)), [stats[a]["mean"] for a in ranking],
+                    yerr=[stats[a]["ci"] for a in ranking], capsize=6,
+                    color=[self.color_map.get(a, ('#1f77b4',))[0] for a in ranking])
+        self.ax.set_xticks(range(len(ranking)))
+        self.ax.set_xticklabels(ranking)
+        self.ax.set_ylabel("Mean Total Head Movement")
+        status = "converged" if result["converged"] else "not converged"
+        self.ax.set_title(f"Monte Carlo Comparison ({result['runs']} runs, {status})")
+        self.ax.grid(True, axis='y', alpha=0.5 if self.theme_mode.get() == "dark" else 0.7)
+        self.apply_theme()
+        self.canvas.draw()
+        self.show_monte_carlo(result)
+
+    def show_monte_carlo(self, result):
+        text = f"Monte Carlo Ranking ({result['runs']} random queues):\n\n"
+        for rank, algo in enumerate(result["ranking"], 1):
+            stats = result["algorithms"][algo]
+            text += f"{rank}. {algo}: {stats['mean']:.1f} ± {stats['ci']:.1f}\n"
+        # Paired difference between each algorithm and the next one down
+        differences = {(d["a"], d["b"]): d for d in result["differences"]}
+        if len(result["ranking"]) > 1:
+            text += "\nDifferences (95% CI):\n"
+        for better, worse in zip(result["ranking"], result["ranking"][1:]):
+            if (worse, better) in differences:
+                d = differences[(worse, better)]
+                mean = d["mean"]
+            else:
+                d = differences[(better, worse)]
+                mean = -d["mean"]
+            text += f"  {worse} - {better}: {mean:.1f} ± {d['ci']:.1f}\n"
+        if not result["converged"]:
+            text += "\nStopped at the run limit before reaching the tolerance."
+        messagebox.showinfo("Monte Carlo Results", text)
+
     def on_legend_pick(self, event):
         # On legend pick, toggle the visibility of the corresponding line
-        line = event.artist
+        legend_line = event.artist
+        line = self.legend_map.get(legend_line)
+        if line is None:
+            return
         line.set_visible(not line.get_visible())
         
         # Change the alpha on the legend item
-        line.set_alpha(1.0 if line.get_visible() else 0.2)
-        
-        # Update all parts of the line (including markers)
-        if line in self.ax.lines:
-            idx = self.ax.lines.index(line)
-            if idx < len(self.ax.collections):
-                self.ax.collections[idx].set_visible(line.get_visible())
+        legend_line.set_alpha(1.0 if line.get_visible() else 0.2)
         
         self.canvas.draw()
 
+    def prepare_sequence_axes(self, title):
+        self.ax.set_xlabel("Request Sequence")
+        self.ax.set_ylabel("Disk Position")
+        self.ax.set_title(title)
+        self.ax.set_ylim(-10, self.disk_size.get() + 10)
+        if self.view_3d.get():
+            self.ax.set_zlabel("Time")
+            self.ax.view_init(elev=30, azim=-60)
+
     def animate_sequence(self, sequence, algo):
         self.sequence = sequence
         self.is_animating = True
         
         color1, color2 = self.color_map[algo]
-        
-        def update(frame):
-            if frame >= len(sequence):
-                self.stop_animation()
-                return
-                
-            self.ax.clear()
-            current_seq = sequence[:frame+1]
-            x = list(range(len(current_seq)))
-            y = current_seq
-            
-            if self.view_3d.get():
-                z = [0] * len(x)
-                if len(x) > 1:
-                    self.ax.plot(x[:-1], y[:-1], z[:-1], '-', color=color1, linewidth=2)
-                    self.ax.scatter(x[:-1], y[:-1], z[:-1], color=color1, s=100)
-                if len(x) > 0:
-                    self.ax.scatter(x[-1], y[-1], z[-1], color='red', s=150)
-                
-                self.ax.set_zlabel("Time")
-                self.ax.view_init(elev=30, azim=-60)
-            else:
-                if len(x) > 1:
-                    self.ax.plot(x[:-1], y[:-1], '-', color=color1, linewidth=2)
-                    self.ax.scatter(x[:-1], y[:-1], color=color1, s=100)
-                if len(x) > 0:
-                    self.ax.scatter(x[-1], y[-1], color='red', s=150)
-                
-            self.ax.set_xlabel("Request Sequence")
-            self.ax.set_ylabel("Disk Position")
-            self.ax.set_title(f"{algo} Disk Scheduling")
-            self.ax.grid(True, alpha=0.5 if self.theme_mode.get() == "dark" else 0.7)
-            self.ax.set_ylim(-10, self.disk_size.get() + 10)
-            
-            if frame > 0:
-                current_movement = sum(abs(sequence[i] - sequence[i-1]) for i in range(1, frame + 1))
-                self.ax.text(0.02, 0.98, f'Current head movement: {current_movement}', 
-                            transform=self.ax.transAxes, 
-                            verticalalignment='top',
-                            bbox=dict(facecolor='white', alpha=0.8, edgecolor='none'))
-            
-            self.apply_theme()
-        
-        self.anim = animation.FuncAnimation(
-            self.fig, 
-            update, 
-            frames=len(sequence),
-            interval=self.animation_speed.get(),
-            repeat=False
-        )
+        self.prepare_sequence_axes(f"{algo} Disk Scheduling")
+        self.renderer = SequenceRenderer(self.ax, sequence, color1, self.view_3d.get())
+        self.anim = self.renderer.start(self.animation_speed.get(), on_finish=self.stop_animation)
 
     def animate_step(self):
         if self.current_step >= len(self.sequence):
             self.next_button.config(state=tk.DISABLED)
+            self.renderer.finish()
             self.show_metrics()
             return
-            
-        self.ax.clear()
-        current_seq = self.sequence[:self.current_step+1]
-        x = list(range(len(current_seq)))
-        y = current_seq
-        
-        color1, color2 = self.color_map[self.algorithm.get()]
-        
-        if self.view_3d.get():
-            z = [0] * len(x)
-            if len(x) > 1:
-                self.ax.plot(x[:-1], y[:-1], z[:-1], '-', color=color1, linewidth=2)
-                self.ax.scatter(x[:-1], y[:-1], z[:-1], color=color1, s=100)
-            if len(x) > 0:
-                self.ax.scatter(x[-1], y[-1], z[-1], color='red', s=150)
-            self.ax.set_zlabel("Time")
-            self.ax.view_init(elev=30, azim=-60)
-        else:
-            if len(x) > 1:
-                self.ax.plot(x[:-1], y[:-1], '-', color=color1, linewidth=2)
-                self.ax.scatter(x[:-1], y[:-1], color=color1, s=100)
-            if len(x) > 0:
-                self.ax.scatter(x[-1], y[-1], color='red', s=150)
-            
-        self.ax.set_xlabel("Request Sequence")
-        self.ax.set_ylabel("Disk Position")
-        self.ax.set_title(f"{self.algorithm.get()} Disk Scheduling (Step {self.current_step+1}/{len(self.sequence)})")
-        self.ax.grid(True, alpha=0.5 if self.theme_mode.get() == "dark" else 0.7)
-        self.ax.set_ylim(-10, self.disk_size.get() + 10)
-        
-        if self.current_step > 0:
-            current_movement = sum(abs(self.sequence[i] - self.sequence[i-1]) for i in range(1, self.current_step + 1))
-            self.ax.text(0.02, 0.98, f'Current head movement: {current_movement}', 
-                        transform=self.ax.transAxes, 
-                        verticalalignment='top',
-                        bbox=dict(facecolor='white', alpha=0.8, edgecolor='none'))
         
-        self.apply_theme()
-        self.canvas.draw()
+        if self.current_step == 0:
+            color1, color2 = self.color_map[self.algorithm.get()]
+            self.prepare_sequence_axes(f"{self.algorithm.get()} Disk Scheduling")
+            self.renderer = SequenceRenderer(self.ax, self.sequence, color1, self.view_3d.get(),
+                                             step_counter=True)
+        self.renderer.show(self.current_step)
 
     def next_step(self):
         self.current_step += 1
         self.animate_step()
 
+    def format_metrics(self, data):
+        text = (
+            f"{data['Algorithm']}:\n"
+            f"  Total Head Movement: {data['total_movement']}\n"
+            f"  Average Seek Time: {data['avg_seek_time']:.2f}\n"
+            f"  Number of Operations: {data['num_operations']}\n"
+        )
+        if "total_time_ms" in data:
+            text += (
+                f"  Total Service Time: {data['total_time_ms']:.2f} ms\n"
+                f"  Average Access Time: {data['avg_access_time_ms']:.2f} ms\n"
+            )
+        if self.optimal_data and data is not self.optimal_data:
+            text += f"  Optimality Gap: {self.movement_gap(data):+.1%}\n"
+        return text + "\n"
+
+    def movement_gap(self, data):
+        return oracle.optimality_gap(data["total_movement"], self.optimal_data["total_movement"])
+
+    def report_rows(self):
+        """Metrics of the simulated algorithms followed by the optimal row"""
+        return self.metrics_data + ([self.optimal_data] if self.optimal_data else [])
+
+    def result_records(self):
+        """report_rows() as long-format records for results.py, one per algorithm"""
+        records = []
+        for data in self.report_rows():
+            record = {"source": "gui", **(self.scenario or {}), "algorithm": data["Algorithm"]}
+            record.update((key, value) for key, value in data.items() if key != "Algorithm")
+            if self.optimal_data and data is not self.optimal_data:
+                record["optimality_gap"] = self.movement_gap(data)
+            if data["Algorithm"] in self.timings:
+                record["elapsed_ms"] = self.timings[data["Algorithm"]]
+            records.append(record)
+        return records
+
     def show_metrics(self):
         metrics_text = "Performance Metrics:\n\n"
-        for data in self.metrics_data:
-            metrics_text += (
-                f"{data['Algorithm']}:\n"
-                f"  Total Head Movement: {data['total_movement']}\n"
-                f"  Average Seek Time: {data['avg_seek_time']:.2f}\n"
-                f"  Number of Operations: {data['num_operations']}\n\n"
-            )
+        for data in self.report_rows():
+            metrics_text += self.format_metrics(data)
         
         if len(self.metrics_data) > 1:
-            best = min(self.metrics_data, key=lambda x: x["total_movement"])["Algorithm"]
+            best = min(self.metrics_data, key=lambda x: x["total_movement"])
             metrics_text += f"Best Algorithm: {best['Algorithm']} (Movement: {best['total_movement']})"
+            fastest = min(self.metrics_data, key=lambda x: x["total_time_ms"])
+            metrics_text += f"\nFastest on Drive Model: {fastest['Algorithm']} ({fastest['total_time_ms']:.2f} ms)"
         
         messagebox.showinfo("Performance Metrics", metrics_text)
 
@@ -643,11 +922,14 @@ class DiskSchedulerApp:
         messagebox.showinfo("Success", "Report exported successfully")
 
     def export_pdf(self, file_path):
+        from matplotlib.backends.backend_pdf import PdfPages
+
         with PdfPages(file_path) as pdf:
             pdf.savefig(self.fig)
             
-            plt.figure(figsize=(8, 6))
-            plt.axis('off')
+            page = Figure(figsize=(8, 6))
+            page_ax = page.add_subplot(111)
+            page_ax.axis('off')
             
             metrics_text = "Disk Scheduling Simulation Report\n\n"
             metrics_text += f"Head Position: {self.head_position.get()}\n"
@@ -655,42 +937,61 @@ class DiskSchedulerApp:
             metrics_text += f"Request Queue: {self.request_entry.get()}\n\n"
             
             metrics_text += "Performance Metrics:\n\n"
-            for data in self.metrics_data:
-                metrics_text += (
-                    f"{data['Algorithm']}:\n"
-                    f"  Total Head Movement: {data['total_movement']}\n"
-                    f"  Average Seek Time: {data['avg_seek_time']:.2f}\n"
-                    f"  Number of Operations: {data['num_operations']}\n\n"
-                )
+            for data in self.report_rows():
+                metrics_text += self.format_metrics(data)
             
             if len(self.metrics_data) > 1:
                 best = min(self.metrics_data, key=lambda x: x["total_movement"])
                 metrics_text += f"Recommended Algorithm: {best['Algorithm']}\n"
-                metrics_text += f"Minimum Head Movement: {best['total_movement']}"
+                metrics_text += f"Minimum Head Movement: {best['total_movement']}\n"
+                fastest = min(self.metrics_data, key=lambda x: x["total_time_ms"])
+                metrics_text += f"Fastest on Drive Model: {fastest['Algorithm']} ({fastest['total_time_ms']:.2f} ms)"
             
-            plt.text(0.1, 0.9, metrics_text, fontsize=10, va='top')
-            pdf.savefig()
-            plt.close()
+            page_ax.text(0.1, 0.9, metrics_text, fontsize=10, va='top')
+            pdf.savefig(page)
 
     def export_csv(self, file_path):
-        data = {
-            "Head Position": [self.head_position.get()],
-            "Disk Size": [self.disk_size.get()],
-            "Request Queue": [self.request_entry.get()]
-        }
-        
-        for metric in self.metrics_data:
-            algo = metric["Algorithm"]
-            data[f"{algo}_Total_Movement"] = [metric["total_movement"]]
-            data[f"{algo}_Avg_Seek_Time"] = [metric["avg_seek_time"]]
-            data[f"{algo}_Num_Operations"] = [metric["num_operations"]]
-        
-        df = pd.DataFrame(data)
-        df.to_csv(file_path, index=False)
+        # Long format: one row per algorithm, with the results store's columns
+        from results import SCHEMA
+
+        records = self.result_records()
+        present = set().union(*records)
+        columns = [name for name, _ in SCHEMA if name in present]
+        with open(file_path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=columns)
+            writer.writeheader()
+            writer.writerows(records)
+
+    def save_to_store(self):
+        if not self.metrics_data:
+            messagebox.showwarning("Warning", "No simulation data to save")
+            return
+
+        path = filedialog.askdirectory(title="Results Store Directory")
+        if not path:
+            return
+
+        from results import ResultsStore
+
+        try:
+            with ResultsStore(path) as store:
+                store.append(self.result_records())
+                total = len(store)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"Could not save results: {e}")
+            return
+        messagebox.showinfo("Success", f"Results saved ({total} rows in store)")
 
     def clear(self):
         try:
             self.stop_animation()
+            self.cancel_task()
+            self.status_text.set("")
+            self.last_results = None
+            self.scenario = None
+            self.timings = {}
+            self.queue_index = None
+            self.requests = []
             self.setup_plot()
             self.request_entry.delete(0, tk.END)
             self.request_entry.insert(0, "98, 183, 37, 122, 14, 124, 65, 67")
@@ -701,14 +1002,43 @@ class DiskSchedulerApp:
             self.random_requests.set(False)
             self.step_mode.set(False)
             self.view_3d.set(False)
+            self.monte_carlo.set(False)
+            self.workload_pattern.set("uniform")
             self.next_button.config(state=tk.DISABLED)
             self.algorithm_listbox.grid_remove()
             self.metrics_data = []
+            self.optimal_data = None
             self.canvas.draw()
         except Exception as e:
             print(f"Error in clear: {e}")
 
-if __name__ == "__main__":
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Disk Scheduling Simulator")
+    parser.add_argument("--startup-time", action="store_true",
+                        help="Print import and time-to-first-window in milliseconds as JSON, then exit")
+    parser.add_argument("--profile", metavar="PATH",
+                        help="Profile the session and write a Chrome trace to PATH on exit")
+    args = parser.parse_args(argv)
+
+    imported = time.perf_counter()
     root = tk.Tk()
     app = DiskSchedulerApp(root)
+    if args.startup_time:
+        # Process pending events so the window is mapped and painted once
+        root.update()
+        first_window = time.perf_counter()
+        print(json.dumps({
+            "import_ms": round((imported - _START) * 1000, 1),
+            "first_window_ms": round((first_window - _START) * 1000, 1)
+        }))
+        root.destroy()
+        return
+    if args.profile:
+        app.profiling.set(True)
+        app.toggle_profiling()
     root.mainloop()
+    if args.profile:
+        PROFILER.export(args.profile)
+
+if __name__ == "__main__":
+    main()
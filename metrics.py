@@ -0,0 +1,31 @@
+import numpy as np
+
+def calculate_metrics(sequence, drive=None, requests=None):
+    """Calculate performance metrics for a disk scheduling sequence
+
+    If a drive model (see drive.py) is given, its millisecond timing
+    metrics are added alongside the cylinder-distance ones; with the
+    requests as well, edge and jump stops are charged only their seek.
+    The sequence may be a list or an array (int32 sequences are summed in
+    int64).
+    """
+    if len(sequence) < 2:
+        metrics = {
+            "total_movement": 0,
+            "avg_seek_time": 0,
+            "num_operations": 0
+        }
+    else:
+        total_movement = int(np.abs(np.diff(np.asarray(sequence))).sum(dtype=np.int64))
+        avg_seek_time = total_movement / (len(sequence) - 1)
+        num_operations = len(sequence) - 1
+        
+        metrics = {
+            "total_movement": total_movement,
+            "avg_seek_time": avg_seek_time,
+            "num_operations": num_operations
+        }
+    
+    if drive is not None:
+        metrics.update(drive.metrics(sequence, requests=requests))
+    return metrics
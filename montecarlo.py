@@ -0,0 +1,194 @@
+"""Monte Carlo comparison of scheduling algorithms.
+
+Every run draws a seeded random queue and schedules it with each selected
+algorithm, so the algorithms are always compared on the same requests
+(common random numbers). Running means and variances are kept with
+Welford's method, for each algorithm and for the difference between every
+pair. Batches of runs are spread over a process pool using the sweep.py
+workers. Sampling stops once the confidence interval on every pairwise
+difference is narrower than the tolerance, or when max_runs is reached.
+"""
+import argparse
+from itertools import combinations
+import json
+import math
+import os
+from statistics import NormalDist
+import sys
+
+import numpy as np
+
+import sweep
+import workloads
+
+MIN_RUNS = 30
+
+class RunningStats:
+    """Streaming mean and variance (Welford, with Chan's merge for batches)"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def extend(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        if not len(values):
+            return
+        count = len(values)
+        mean = float(values.mean())
+        m2 = float(((values - mean) ** 2).sum())
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+
+    @property
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance)
+
+    def half_width(self, z):
+        """Half-width of the normal-approximation confidence interval"""
+        if self.count < 2:
+            return math.inf
+        return z * self.std / math.sqrt(self.count)
+
+def _z(confidence):
+    return NormalDist().inv_cdf((1 + confidence) / 2)
+
+def converged(pairs, algorithm_stats, z, tolerance):
+    """True when every pairwise CI is narrower than tolerance x the smaller mean"""
+    for (a, b), stats in pairs.items():
+        scale = min(algorithm_stats[a].mean, algorithm_stats[b].mean)
+        if stats.count < MIN_RUNS or stats.half_width(z) > tolerance * max(scale, 1):
+            return False
+    return True
+
+def summarize(algorithm_stats, pairs, z, runs, done):
+    ranking = sorted(algorithm_stats, key=lambda name: algorithm_stats[name].mean)
+    return {
+        "runs": runs,
+        "converged": done,
+        "ranking": ranking,
+        "algorithms": {
+            name: {"mean": stats.mean, "std": stats.std, "ci": stats.half_width(z)}
+            for name, stats in algorithm_stats.items()
+        },
+        "differences": [
+            {"a": a, "b": b, "mean": stats.mean, "ci": stats.half_width(z)}
+            for (a, b), stats in pairs.items()
+        ]
+    }
+
+def run_monte_carlo(algorithms, head, disk_size, depth, tolerance=0.01, confidence=0.95,
+                    max_runs=100000, batch_size=64, workers=None, seed=0, progress=None,
+                    pattern="uniform", pattern_params=None):
+    """Compare algorithms on random queues until their ranking is settled
+
+    tolerance is relative: sampling stops when the confidence interval on
+    each pairwise difference in total head movement has a half-width of at
+    most tolerance times the smaller of the two means. progress, if given,
+    is called with the summary so far after every batch. Queues are drawn
+    from the workloads.py pattern. Out-of-range inputs raise ValueError.
+    """
+    if disk_size < 1:
+        raise ValueError(f"Disk size must be positive, got {disk_size}")
+    if not 0 <= head < disk_size:
+        raise ValueError(f"Head position {head} is outside the disk (0 to {disk_size - 1})")
+    if depth < 1:
+        raise ValueError(f"Queue depth must be positive, got {depth}")
+    if max_runs < 1 or batch_size < 1:
+        raise ValueError("max_runs and batch_size must be positive")
+    spec = sweep.normalize_spec({
+        "heads": [head],
+        "disk_sizes": [disk_size],
+        "depths": [depth],
+        "seeds": list(range(seed, seed + max_runs)),
+        "algorithms": list(algorithms),
+        "pattern": pattern,
+        "pattern_params": pattern_params
+    })
+    algorithms = spec["algorithms"]
+    algorithm_stats = {name: RunningStats() for name in algorithms}
+    pairs = {pair: RunningStats() for pair in combinations(algorithms, 2)}
+    z = _z(confidence)
+    workers = workers or os.cpu_count() or 1
+
+    runs = 0
+    done = False
+    batches = iter(range(0, max_runs, batch_size))
+    with sweep.worker_pool(workers, spec) as pool:
+        try:
+            # Results are consumed in submission order so the stopping point
+            # does not depend on scheduling
+            running = []
+            for start in batches:
+                running.append(pool.submit(sweep.run_chunk, start, min(start + batch_size, max_runs)))
+                if len(running) == workers * 2:
+                    break
+            while running and not done:
+                records = running.pop(0).result()
+                start = next(batches, None)
+                if start is not None:
+                    running.append(pool.submit(sweep.run_chunk, start, min(start + batch_size, max_runs)))
+
+                movement = {name: [] for name in algorithms}
+                for record in records:
+                    movement[record["algorithm"]].append(record["total_movement"])
+                movement = {name: np.array(values) for name, values in movement.items()}
+                for name in algorithms:
+                    algorithm_stats[name].extend(movement[name])
+                for (a, b), stats in pairs.items():
+                    stats.extend(movement[a] - movement[b])
+                runs += len(movement[algorithms[0]])
+
+                done = converged(pairs, algorithm_stats, z, tolerance)
+                if progress:
+                    progress(summarize(algorithm_stats, pairs, z, runs, done))
+        finally:
+            # Also reached when progress() raises to abandon the run
+            pool.shutdown(wait=False, cancel_futures=True)
+    return summarize(algorithm_stats, pairs, z, runs, done)
+
+def main(argv=None):
+    import registry
+
+    parser = argparse.ArgumentParser(description="Rank algorithms over many random queues")
+    parser.add_argument("--head", type=int, default=50)
+    parser.add_argument("--disk-size", type=int, default=200)
+    parser.add_argument("--depth", type=int, default=8, help="Requests per queue")
+    parser.add_argument("-a", "--algorithms", nargs="+", choices=list(registry.ALGORITHMS),
+                        default=list(registry.ALGORITHMS))
+    parser.add_argument("--tolerance", type=float, default=0.01,
+                        help="Target CI half-width on each pairwise difference, relative to the mean")
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("--max-runs", type=int, default=100000)
+    parser.add_argument("-j", "--workers", type=int, help="Worker processes (default: all cores)")
+    parser.add_argument("--seed", type=int, default=0, help="First workload seed")
+    parser.add_argument("--pattern", choices=list(workloads.PATTERNS), default="uniform",
+                        help="Workload generator for the random queues")
+    args = parser.parse_args(argv)
+
+    try:
+        result = run_monte_carlo(args.algorithms, args.head, args.disk_size, args.depth, args.tolerance,
+                                 args.confidence, args.max_runs, workers=args.workers, seed=args.seed,
+                                 pattern=args.pattern)
+    except ValueError as e:
+        parser.error(str(e))
+    json.dump(result, sys.stdout, indent=2)
+    print()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""Offline optimal bounds to measure the schedulers against.
+
+For a static queue the least possible head movement is known in closed
+form: go to the nearer end of the requested range first, then sweep to
+the other end. optimal_sequence() returns that order and runs in
+O(n log n) (the sort). optimal_movement() returns just the distance, in O(n).
+
+Once requests arrive over time, no schedule can finish before
+makespan_bound(). The bound relaxes the drive model in two ways. Seeks
+are charged at the cheapest per-cylinder rate the seek curve ever reaches.
+Rotation and transfer are charged as fixed per-request costs. Without
+those per-request costs, moving along a line to serve requests that are
+released over time is solved exactly by an interval DP (Tsitsiklis,
+1992): in some optimal route the requests still to be served always form
+a contiguous range of cylinders, and the next one served is at either end
+of that range. The DP is O(n^2) time and O(n) memory.
+"""
+import math
+
+import numpy as np
+
+import algorithms
+from drive import DriveModel
+from metrics import calculate_metrics
+
+NAME = "OPTIMAL"
+
+def optimal_movement(requests, head):
+    """Least total head movement that serves every request once"""
+    if not len(requests):
+        return 0
+    requests = np.asarray(requests)
+    low = min(int(requests.min()), head)
+    high = max(int(requests.max()), head)
+    return (high - low) + min(head - low, high - head)
+
+def optimal_chunked_movement(chunks, head):
+    """Least total head movement that serves each chunk of requests in turn
+
+    This is the bound for traces replayed one scheduling window at a time.
+    An optimal route through a chunk ends at its lowest or highest request
+    (anywhere else is only a detour), so two running totals, one per end,
+    give the exact optimum in O(n). Returns (movement, requests served).
+    """
+    ends = {head: 0}
+    served = 0
+    for chunk in chunks:
+        if not len(chunk):
+            continue
+        served += len(chunk)
+        low, high = int(np.min(chunk)), int(np.max(chunk))
+        span = high - low
+        ends = {
+            low: min(cost + abs(start - high) + span for start, cost in ends.items()),
+            high: min(cost + abs(start - low) + span for start, cost in ends.items())
+        }
+    return min(ends.values()), served
+
+def optimal_sequence(requests, head, disk_size=None):
+    """A service order that achieves optimal_movement(), as an array like algorithms.py"""
+    dtype = np.int64 if disk_size is None else algorithms.sequence_dtype(disk_size)
+    below, above = algorithms.split_at_head(requests, head, dtype)
+    if len(below) and len(above) and head - below[0] > above[-1] - head:
+        return algorithms.assemble(dtype, head, above, below[::-1])
+    return algorithms.assemble(dtype, head, below[::-1], above)
+
+def optimal_metrics(requests, head, disk_size, drive=None):
+    """calculate_metrics() for the movement-optimal order
+
+    The timing fields (with a drive model) are those of that order, which
+    is not necessarily the fastest one: seek time is not linear in distance.
+    """
+    return calculate_metrics(optimal_sequence(requests, head, disk_size), drive, requests)
+
+def optimality_gap(value, optimum):
+    """Relative excess of value over optimum (0.25 means 25% worse)
+
+    Any excess over an optimum of 0 is infinitely worse.
+    """
+    if optimum == 0:
+        return 0.0 if value == 0 else math.inf
+    return value / optimum - 1
+
+def min_seek_rate(drive, disk_size):
+    """Lowest seek time per cylinder (ms) over every distance on the disk
+
+    Within each region of the seek curve the rate is a/d + b/sqrt(d) or
+    a/d + b, so its minimum is at a region end or at the one stationary
+    point of the short-seek form. Only those distances are evaluated, so
+    the cost does not depend on the number of cylinders.
+    """
+    longest = max(int(disk_size), 2) - 1
+    boundary = max(int(drive.seek_boundary), 1)
+    candidates = {1, longest, min(boundary - 1, longest), min(boundary, longest)}
+    if drive.short_seek_ms * drive.short_seek_sqrt_ms < 0:
+        # d/dd (a/d + b/sqrt(d)) = 0 at sqrt(d) = -2a/b
+        stationary = (2 * drive.short_seek_ms / drive.short_seek_sqrt_ms) ** 2
+        candidates.update({math.floor(stationary), math.ceil(stationary)})
+    distances = np.array(sorted(d for d in candidates if 1 <= d <= longest), dtype=np.float64)
+    return float((drive.seek_time(distances) / distances).min())
+
+def makespan_bound(requests, arrivals, head, disk_size, drive=None, sizes=None, sectors=None):
+    """Lower bound in ms on timesim.simulate()'s makespan under any policy
+
+    Uses the same inputs as timesim.simulate() (without the policy).
+    """
+    drive = drive or DriveModel()
+    if sectors is None and len(requests) and isinstance(requests[0], (tuple, list)):
+        sectors = [r[1] for r in requests]
+        requests = [r[0] for r in requests]
+    n = len(requests)
+    if n == 0:
+        return 0.0
+    positions = np.asarray(requests, dtype=np.float64)
+    releases = np.zeros(n) if arrivals is None else np.asarray(arrivals, dtype=np.float64)
+    sizes = np.full(n, drive.request_bytes) if sizes is None else np.asarray(sizes)
+    # Fixed cost of each request once the head is over it. With exact
+    # sectors the rotational wait can be zero.
+    costs = drive.transfer_time(sizes)
+    if sectors is None:
+        costs = costs + drive.rotation_ms / 2
+    span = max(disk_size, positions.max() + 1, head + 1) - min(positions.min(), head, 0)
+    rate = min_seek_rate(drive, span)
+
+    routed = _route_time(positions, releases, head, rate) + float(costs.min())
+
+    # Travel plus every fixed cost, ignoring arrivals
+    busy = rate * optimal_movement(requests, head) + float(costs.sum())
+    return max(routed, busy)
+
+def _route_time(positions, releases, head, rate):
+    """Earliest time to visit every position no sooner than its release
+
+    The head moves at `rate` ms per cylinder and may wait.
+    """
+    n = len(positions)
+    order = np.argsort(positions, kind="stable")
+    x = positions[order]
+    r = releases[order]
+
+    # State for remaining range [i, i + length - 1]: earliest time with the
+    # head on the request just left of it (at_left) or just right of it
+    # (at_right). Before anything is served both are the start position.
+    at_left = np.zeros(1)
+    at_right = np.zeros(1)
+    left_pos = np.array([float(head)])
+    right_pos = np.array([float(head)])
+    for length in range(n, 0, -1):
+        i = np.arange(n - length + 1)
+        j = i + length - 1
+        # Serve the left end x[i] or the right end x[j] next
+        serve_i = np.maximum(np.minimum(at_left + rate * np.abs(left_pos - x[i]),
+                                        at_right + rate * np.abs(right_pos - x[i])), r[i])
+        serve_j = np.maximum(np.minimum(at_left + rate * np.abs(left_pos - x[j]),
+                                        at_right + rate * np.abs(right_pos - x[j])), r[j])
+        at_left = np.concatenate(([np.inf], serve_i))
+        at_right = np.concatenate((serve_j, [np.inf]))
+        # Head positions for the shorter ranges; the ends that no state
+        # reaches (infinite time) get a placeholder
+        left_pos = np.concatenate((x[:1], x[:n - length + 1]))
+        right_pos = np.concatenate((x[length - 1:], x[-1:]))
+    return float(min(at_left.min(), at_right.min()))
@@ -0,0 +1,98 @@
+"""Pending-request index for online schedulers.
+
+CylinderIndex holds the requests that are waiting for service, grouped by
+cylinder. The set of cylinders that can ever appear is known up front (the
+workload is), so the cylinders are coordinate-compressed and a Fenwick tree
+of per-cylinder counts answers "nearest pending cylinder at or above / at
+or below x" in O(log n). Requests on the same cylinder are kept in arrival
+order.
+"""
+from bisect import bisect_left, bisect_right
+from collections import deque
+
+class CylinderIndex:
+    def __init__(self, cylinders):
+        self.values = sorted(set(cylinders))
+        self.size = len(self.values)
+        self.tree = [0] * (self.size + 1)
+        self.buckets = [deque() for _ in range(self.size)]
+        self.removed = set()
+        self.count = 0
+        # Largest power of two <= size, for the Fenwick descent in _kth
+        self.top = 1 << (self.size.bit_length() - 1) if self.size else 0
+
+    def __len__(self):
+        return self.count
+
+    def _add(self, index, delta):
+        index += 1
+        while index <= self.size:
+            self.tree[index] += delta
+            index += index & -index
+        self.count += delta
+
+    def _prefix(self, index):
+        """Number of pending requests on cylinders values[0..index-1]"""
+        total = 0
+        while index > 0:
+            total += self.tree[index]
+            index -= index & -index
+        return total
+
+    def _kth(self, k):
+        """Index of the cylinder holding the k-th pending request (1-based)"""
+        position = 0
+        step = self.top
+        while step:
+            if position + step <= self.size and self.tree[position + step] < k:
+                position += step
+                k -= self.tree[position]
+            step >>= 1
+        return position
+
+    def add(self, cylinder, request_id):
+        index = bisect_left(self.values, cylinder)
+        self.buckets[index].append(request_id)
+        self._add(index, 1)
+
+    def discard(self, cylinder, request_id):
+        """Remove a specific request that is not necessarily first on its cylinder"""
+        index = bisect_left(self.values, cylinder)
+        self.removed.add(request_id)
+        self._add(index, -1)
+
+    def pop(self, index):
+        """Remove and return the oldest pending request on values[index]"""
+        bucket = self.buckets[index]
+        request_id = bucket.popleft()
+        while request_id in self.removed:
+            self.removed.discard(request_id)
+            request_id = bucket.popleft()
+        self._add(index, -1)
+        return request_id
+
+    def peek(self, index):
+        bucket = self.buckets[index]
+        while bucket[0] in self.removed:
+            self.removed.discard(bucket.popleft())
+        return bucket[0]
+
+    def at_or_above(self, cylinder):
+        """Index of the lowest pending cylinder >= cylinder, or None"""
+        below = self._prefix(bisect_left(self.values, cylinder))
+        if below == self.count:
+            return None
+        return self._kth(below + 1)
+
+    def at_or_below(self, cylinder):
+        """Index of the highest pending cylinder <= cylinder, or None"""
+        upto = self._prefix(bisect_right(self.values, cylinder))
+        if upto == 0:
+            return None
+        return self._kth(upto)
+
+    def lowest(self):
+        return self._kth(1) if self.count else None
+
+    def highest(self):
+        return self._kth(self.count) if self.count else None
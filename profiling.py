@@ -0,0 +1,200 @@
+"""Phase timers, counters and frame statistics for profiling a session.
+
+The hot paths (algorithm runs, calculate_metrics, canvas redraws and
+blits, theme changes) report to the module-level PROFILER. While it is
+disabled (the default) phase() hands back a shared no-op context, so the
+instrumentation costs little more than one attribute check per call.
+
+Once enabled, every phase is kept as a complete event with its thread, and
+counters and per-phase totals are updated. export() writes Chrome's trace
+event format, which opens in chrome://tracing or ui.perfetto.dev, with the
+summary under "otherData":
+
+    import profiling
+    profiling.PROFILER.enable()
+    ...
+    profiling.PROFILER.export("session.json")
+
+Events are timestamped with perf_counter() relative to enable(). Frames are
+recorded separately (frame()) so that frame time and FPS can be shown live
+without summing the whole event list.
+"""
+from collections import deque
+from contextlib import nullcontext
+import json
+import os
+import threading
+import time
+
+# Frames within this many seconds count towards the live FPS
+FPS_WINDOW_S = 1.0
+
+_IDLE = nullcontext()
+
+class _Phase:
+    def __init__(self, profiler, name, category, frame=False):
+        self.profiler = profiler
+        self.name = name
+        self.category = category
+        self.is_frame = frame
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        stop = time.perf_counter()
+        self.profiler.record(self.name, self.category, self.start, stop)
+        if self.is_frame:
+            self.profiler.frame(stop - self.start)
+
+class Profiler:
+    def __init__(self, max_events=1_000_000):
+        self.enabled = False
+        self.max_events = max_events
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.origin = time.perf_counter()
+            self.events = []
+            self.dropped = 0
+            self.phases = {}
+            self.counters = {}
+            self.frames = deque()
+            self.last_frame_ms = 0.0
+
+    def enable(self, reset=True):
+        if reset:
+            self.reset()
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def phase(self, name, category="phase"):
+        """Context manager timing one occurrence of a phase"""
+        if not self.enabled:
+            return _IDLE
+        return _Phase(self, name, category)
+
+    def drawing(self, name):
+        """phase() for something that puts a frame on screen; also feeds frame()"""
+        if not self.enabled:
+            return _IDLE
+        return _Phase(self, name, "render", frame=True)
+
+    def timed(self, name, category="phase"):
+        """Decorator form of phase()"""
+        def decorate(func):
+            def wrapper(*args, **kwargs):
+                with self.phase(name, category):
+                    return func(*args, **kwargs)
+            wrapper.__name__ = func.__name__
+            wrapper.__doc__ = func.__doc__
+            return wrapper
+        return decorate
+
+    def record(self, name, category, start, stop):
+        if not self.enabled:
+            return
+        duration = stop - start
+        with self.lock:
+            stats = self.phases.get(name)
+            if stats is None:
+                stats = self.phases[name] = [0, 0.0, 0.0]
+            stats[0] += 1
+            stats[1] += duration
+            stats[2] = max(stats[2], duration)
+            if len(self.events) < self.max_events:
+                self.events.append((name, category, start, duration, threading.get_ident()))
+            else:
+                self.dropped += 1
+
+    def count(self, name, n=1):
+        if not self.enabled:
+            return
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def frame(self, duration_s):
+        """Note one drawn frame (a full redraw or a blitted update) that took duration_s"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        with self.lock:
+            self.frames.append(now)
+            while self.frames and self.frames[0] < now - FPS_WINDOW_S:
+                self.frames.popleft()
+            self.last_frame_ms = duration_s * 1000
+            self.counters["frames"] = self.counters.get("frames", 0) + 1
+
+    def frame_stats(self):
+        """(last frame time in ms, frames per second over the last FPS_WINDOW_S)"""
+        now = time.perf_counter()
+        with self.lock:
+            recent = sum(1 for t in self.frames if t >= now - FPS_WINDOW_S)
+            return self.last_frame_ms, recent / FPS_WINDOW_S
+
+    def summary(self):
+        """Per-phase count, total, mean and max in ms, plus the counters"""
+        with self.lock:
+            phases = {
+                name: {
+                    "count": count,
+                    "total_ms": total * 1000,
+                    "mean_ms": total * 1000 / count,
+                    "max_ms": longest * 1000
+                }
+                for name, (count, total, longest) in self.phases.items()
+            }
+            return {
+                "elapsed_ms": (time.perf_counter() - self.origin) * 1000,
+                "phases": dict(sorted(phases.items(), key=lambda item: -item[1]["total_ms"])),
+                "counters": dict(self.counters),
+                "dropped_events": self.dropped
+            }
+
+    def chrome_trace(self):
+        """The session as a Chrome trace event object"""
+        pid = os.getpid()
+        with self.lock:
+            events = list(self.events)
+            counters = dict(self.counters)
+        threads = {}
+        trace = []
+        for name, category, start, duration, thread in events:
+            tid = threads.setdefault(thread, len(threads))
+            trace.append({"name": name, "cat": category, "ph": "X", "pid": pid, "tid": tid,
+                          "ts": (start - self.origin) * 1e6, "dur": duration * 1e6})
+        trace += [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                   "args": {"name": "main" if thread == threading.main_thread().ident else f"worker {tid}"}}
+                  for thread, tid in threads.items()]
+        # Final counter values, shown as counter tracks at the end of the session
+        end = (time.perf_counter() - self.origin) * 1e6
+        trace += [{"name": name, "ph": "C", "pid": pid, "tid": 0, "ts": end, "args": {name: value}}
+                  for name, value in counters.items()]
+        return {"traceEvents": trace, "displayTimeUnit": "ms", "otherData": self.summary()}
+
+    def export(self, path):
+        with open(path, "w") as f:
+            json.dump(self.chrome_trace(), f)
+
+PROFILER = Profiler()
+
+def instrument_canvas(canvas, profiler=PROFILER):
+    """Time and count a matplotlib canvas's full redraws
+
+    draw_idle() and the toolbar go through draw(), so every full redraw is
+    seen. Blitted updates are timed by their callers with drawing().
+    """
+    draw = canvas.draw
+
+    def timed_draw(*args, **kwargs):
+        with profiler.drawing("canvas.draw"):
+            draw(*args, **kwargs)
+        profiler.count("redraws")
+
+    canvas.draw = timed_draw
+    return canvas
@@ -0,0 +1,251 @@
+"""Predict the best scheduler for a queue from previously simulated scenarios.
+
+A queue is reduced to a few cheap features (FEATURES): its size, spread
+and locality, where the head sits in it, and how sorted it already is.
+The index is an .npz file of such feature vectors for a set of sweep.py
+scenarios, each with every algorithm's head movement relative to the best
+one. recommend() standardizes the features and finds the nearest indexed
+scenarios by brute force. It then ranks the algorithms by their mean
+relative movement over those neighbours. Against the default index of
+about 4000 scenarios a recommendation takes roughly 0.1 ms for a short
+queue. The features are O(n) with a few NumPy calls, so on a queue of
+10^5 requests it still takes under 2 ms, well below running every
+algorithm.
+
+A recommendation is "routine" when its algorithm was within
+ROUTINE_TOLERANCE of the best in every neighbour. The GUI then selects
+only that algorithm. Otherwise it selects every algorithm that won at
+least one neighbour, so the comparison is still run, just on fewer
+algorithms.
+
+The index is built from sweep results, which are reused when the sweep
+output already exists (see sweep.py --resume):
+
+    python recommender.py build -o recommender.npz
+    python recommender.py build spec.json --results sweep.jsonl -o recommender.npz
+    echo '{"head": 50, "disk_size": 200, "requests": [98, 183, 37, 122]}' | python recommender.py recommend
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+import sweep
+import workloads
+
+FEATURES = ("log_size", "range", "spread", "locality", "head_rank", "head_in_range", "head_position",
+            "sortedness")
+
+DEFAULT_INDEX = os.path.join(os.path.dirname(os.path.abspath(__file__)), "recommender.npz")
+DEFAULT_K = 15
+DEFAULT_METRIC = "total_movement"
+
+# A recommendation this close to the best on every neighbour needs no comparison
+ROUTINE_TOLERANCE = 0.02
+
+def default_specs():
+    """Sweeps over every workload pattern, three disk sizes and queues of 4 to 128 requests"""
+    specs = []
+    for pattern in workloads.PATTERNS:
+        for disk_size in (200, 1000, 5000):
+            specs.append({
+                "heads": sorted({round(f * (disk_size - 1)) for f in (0, 0.1, 0.25, 0.5, 0.75, 0.9, 1)}),
+                "disk_sizes": [disk_size],
+                "depths": [4, 8, 16, 32, 64, 128],
+                "seeds": 8,
+                "algorithms": ["FCFS", "SSTF", "SCAN", "C-SCAN", "LOOK", "C-LOOK"],
+                "pattern": pattern
+            })
+    return specs
+
+def features(requests, head, disk_size):
+    """Feature vector of a queue, in FEATURES order"""
+    queue = np.asarray(requests, dtype=np.float64)
+    n = len(queue)
+    if not n:
+        raise ValueError("Cannot recommend an algorithm for an empty queue")
+    # Few NumPy calls: on short queues their overhead is most of the cost
+    scale = max(disk_size - 1, 1)
+    low, high = queue.min(), queue.max()
+    mean = queue.sum() / n
+    spread = math.sqrt(max(queue @ queue / n - mean * mean, 0.0))
+    steps = queue[1:] - queue[:-1]
+    if n > 1:
+        locality = np.abs(steps).sum() / ((n - 1) * scale)
+        sortedness = np.sign(steps).sum() / (n - 1)
+    else:
+        locality = sortedness = 0.0
+    return np.array([
+        math.log2(n),
+        (high - low) / scale,
+        spread / scale,
+        locality,
+        np.count_nonzero(queue < head) / n,
+        (head - low) / (high - low) if high > low else 0.5,
+        head / scale,
+        sortedness
+    ])
+
+def scenario_rows(spec, records, metric=DEFAULT_METRIC):
+    """Features and per-algorithm relative movement for a sweep's records"""
+    names = spec["algorithms"]
+    by_point = {}
+    for record in records:
+        by_point.setdefault(record["point"], {})[record["algorithm"]] = record[metric]
+    queues = {}
+    rows, ratios = [], []
+    for point, values in sorted(by_point.items()):
+        if len(values) < len(names):
+            continue
+        disk_size, depth, head, seed = sweep.decode(spec, point)
+        key = (disk_size, depth, seed)
+        if key not in queues:
+            queues[key] = sweep.make_queue(seed, disk_size, depth, spec["pattern"], spec["pattern_params"])
+        rows.append(features(queues[key], head, disk_size))
+        movement = np.array([values[name] for name in names], dtype=np.float64)
+        # +1 keeps queues with nothing to move for from dividing by zero
+        ratios.append((movement + 1) / (movement.min() + 1))
+    return rows, ratios
+
+def build_index(specs, path, results=None, workers=None, metric=DEFAULT_METRIC, progress=None):
+    """Run (or resume) the sweeps and write their scenarios to an index file
+
+    results lists one sweep JSONL file per spec. Points already in it are
+    not simulated again. Without it the sweeps go to temporary files.
+    progress, if given, is called as progress(specs_done, len(specs)).
+    Returns the number of indexed scenarios.
+    """
+    specs = [sweep.normalize_spec(spec) for spec in specs]
+    names = specs[0]["algorithms"]
+    if any(spec["algorithms"] != names for spec in specs):
+        raise ValueError("Every sweep of an index must run the same algorithms")
+    if results is not None and len(results) != len(specs):
+        raise ValueError("Give one results file per sweep spec")
+
+    rows, ratios = [], []
+    with tempfile.TemporaryDirectory() as scratch:
+        for i, spec in enumerate(specs):
+            output = results[i] if results else os.path.join(scratch, f"sweep-{i}.jsonl")
+            sweep.run_sweep(spec, output, workers, resume=True)
+            with open(output) as f:
+                spec_rows, spec_ratios = scenario_rows(spec, (json.loads(line) for line in f), metric)
+            rows += spec_rows
+            ratios += spec_ratios
+            if progress:
+                progress(i + 1, len(specs))
+    if not rows:
+        raise ValueError("The sweeps produced no complete scenarios")
+
+    with open(path, "wb") as f:
+        np.savez(f, features=np.array(rows, dtype=np.float32), ratios=np.array(ratios, dtype=np.float32),
+                 algorithms=np.array(names), feature_names=np.array(FEATURES), metric=np.array(metric))
+    return len(rows)
+
+class Recommender:
+    def __init__(self, path=DEFAULT_INDEX):
+        with np.load(path) as data:
+            if tuple(data["feature_names"].tolist()) != FEATURES:
+                raise ValueError(f"{path} was built with different features; rebuild it")
+            points = data["features"].astype(np.float64)
+            self.ratios = data["ratios"].astype(np.float64)
+            self.algorithms = data["algorithms"].tolist()
+            self.metric = str(data["metric"])
+        self.mean = points.mean(axis=0)
+        # Constant features (a sweep of a single size, say) must not divide by zero
+        self.scale = np.where(points.std(axis=0) > 0, points.std(axis=0), 1.0)
+        self.points = (points - self.mean) / self.scale
+        # |p - x|^2 = |p|^2 - 2 p.x + |x|^2; the last term does not change the ranking
+        self.norms = (self.points ** 2).sum(axis=1)
+
+    def __len__(self):
+        return len(self.points)
+
+    def recommend(self, requests, head, disk_size, k=DEFAULT_K):
+        """Predicted best algorithm for a queue, with the evidence for it"""
+        if k < 1:
+            raise ValueError(f"Need at least one neighbour, not k={k}")
+        x = (features(requests, head, disk_size) - self.mean) / self.scale
+        distance = self.norms - 2 * (self.points @ x)
+        k = min(k, len(distance))
+        near = np.argpartition(distance, k - 1)[:k]
+        ratios = self.ratios[near]
+        mean = (ratios.sum(axis=0) / k).tolist()
+        order = np.argsort(mean, kind="stable").tolist()
+        best = order[0]
+        won = ratios <= 1 + 1e-6
+        wins = won.sum(axis=0).tolist()
+        return {
+            "algorithm": self.algorithms[best],
+            "confidence": wins[best] / k,
+            "routine": bool(ratios[:, best].max() <= 1 + ROUTINE_TOLERANCE),
+            "candidates": [self.algorithms[i] for i in order if wins[i]],
+            "ranking": [(self.algorithms[i], mean[i]) for i in order],
+            "neighbours": k,
+            "distance": float(math.sqrt(max(distance[near].max() + x @ x, 0.0)))
+        }
+
+def load_default(progress=None):
+    """Recommender on DEFAULT_INDEX, building it from default_specs() first if missing"""
+    if not os.path.exists(DEFAULT_INDEX):
+        build_index(default_specs(), DEFAULT_INDEX, progress=progress)
+    return Recommender(DEFAULT_INDEX)
+
+def neighbour_count(text):
+    """argparse type for -k"""
+    k = int(text)
+    if k < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, not {k}")
+    return k
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or query the algorithm recommender index")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    builder = commands.add_parser("build", help="Index sweep scenarios (default: a built-in set of sweeps)")
+    builder.add_argument("specs", nargs="*", help="Sweep spec JSON files")
+    builder.add_argument("-o", "--output", default=DEFAULT_INDEX, help="Index file")
+    builder.add_argument("-r", "--results", nargs="+",
+                         help="Sweep JSONL file per spec; reused, and completed if partial")
+    builder.add_argument("-j", "--workers", type=int, help="Worker processes (default: all cores)")
+    builder.add_argument("-m", "--metric", default=DEFAULT_METRIC, help="Metric to minimise")
+
+    recommend = commands.add_parser("recommend", help="Recommend for JSONL scenarios like cli.py's")
+    recommend.add_argument("input", nargs="?", default="-", help="JSONL file (default: stdin)")
+    recommend.add_argument("-i", "--index", default=DEFAULT_INDEX, help="Index file")
+    recommend.add_argument("-k", type=neighbour_count, default=DEFAULT_K, help="Neighbours to consult")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        specs = []
+        for spec_path in args.specs:
+            with open(spec_path) as f:
+                specs.append(json.load(f))
+        count = build_index(specs or default_specs(), args.output, args.results, args.workers, args.metric,
+                            lambda done, total: print(f"\r{done}/{total} sweeps", end="", file=sys.stderr))
+        print(f"\n{count} scenarios indexed in {args.output}", file=sys.stderr)
+        return 0
+
+    if not os.path.exists(args.index):
+        parser.error(f"no index at {args.index}; run the build command first")
+    recommender = Recommender(args.index)
+    infile = sys.stdin if args.input == "-" else open(args.input)
+    try:
+        for line in infile:
+            if not line.strip():
+                continue
+            scenario = json.loads(line)
+            result = recommender.recommend(scenario["requests"], scenario["head"], scenario["disk_size"], args.k)
+            if "id" in scenario:
+                result = {"id": scenario["id"], **result}
+            print(json.dumps(result))
+    finally:
+        if infile is not sys.stdin:
+            infile.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
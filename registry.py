@@ -0,0 +1,121 @@
+"""Single place to look up scheduling algorithms and their cached sequences.
+
+The GUI and the batch tools resolve algorithm names through ALGORITHMS and
+get service orders through get_sequence(), which memoizes them in an LRU
+cache keyed on (algorithm, head, disk size, hash of the request queue).
+Cached sequences are shared between callers and must not be mutated.
+The cache is safe to use from the GUI's worker thread and the main thread
+at the same time. Algorithm runs, metric calculations and cache hits are
+reported to profiling.PROFILER.
+"""
+from collections import OrderedDict
+import hashlib
+import threading
+
+import numpy as np
+
+import algorithms
+from metrics import calculate_metrics
+from profiling import PROFILER
+
+ALGORITHMS = dict(algorithms.ALGORITHMS)
+
+def register(name, func):
+    """Make a scheduler available under `name` to every front end"""
+    ALGORITHMS[name] = func
+    return func
+
+def get_algorithm(name):
+    try:
+        return ALGORITHMS[name]
+    except KeyError:
+        raise ValueError(f"Unknown algorithm: {name}") from None
+
+def requests_digest(requests):
+    """Stable digest of a request queue, used as part of the cache key
+
+    Lists and arrays of any integer dtype with the same values hash alike.
+    """
+    data = np.asarray(requests, dtype=np.int64).tobytes()
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+class SequenceCache:
+    """LRU cache of service orders
+
+    Bounded both by the number of entries and by the total number of
+    cylinder positions held, so a few huge traces cannot pin gigabytes.
+    """
+    def __init__(self, max_entries=64, max_positions=20_000_000):
+        self.max_entries = max_entries
+        self.max_positions = max_positions
+        self.entries = OrderedDict()
+        self.positions = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def resize(self, max_entries=None, max_positions=None):
+        if max_entries is not None:
+            self.max_entries = max_entries
+        if max_positions is not None:
+            self.max_positions = max_positions
+        with self.lock:
+            self._evict()
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.positions = 0
+
+    def _evict(self):
+        while self.entries and (len(self.entries) > self.max_entries
+                                or self.positions > self.max_positions):
+            _, entry = self.entries.popitem(last=False)
+            self.positions -= len(entry["sequence"])
+
+    def _entry(self, name, requests, head, disk_size):
+        key = (name, head, disk_size, len(requests), requests_digest(requests))
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.hits += 1
+                self.entries.move_to_end(key)
+                PROFILER.count("cache_hits")
+                return entry
+            self.misses += 1
+        PROFILER.count("cache_misses")
+        PROFILER.count("requests_processed", len(requests))
+
+        # Computed without the lock so other threads are not held up
+        with PROFILER.phase(f"algorithm:{name}", "algorithm"):
+            sequence = get_algorithm(name)(requests, head, disk_size)
+        entry = {"sequence": sequence, "metrics": {}}
+        with self.lock:
+            if key in self.entries:
+                return self.entries[key]
+            self.entries[key] = entry
+            self.positions += len(sequence)
+            self._evict()
+        return entry
+
+    def get(self, name, requests, head, disk_size):
+        return self._entry(name, requests, head, disk_size)["sequence"]
+
+    def get_result(self, name, requests, head, disk_size, drive=None):
+        """(sequence, metrics) with calculate_metrics() also memoized per drive model"""
+        entry = self._entry(name, requests, head, disk_size)
+        drive_key = None if drive is None else drive.key()
+        if drive_key not in entry["metrics"]:
+            with PROFILER.phase("calculate_metrics", "metrics"):
+                entry["metrics"][drive_key] = calculate_metrics(entry["sequence"], drive, requests)
+        return entry["sequence"], dict(entry["metrics"][drive_key])
+
+sequence_cache = SequenceCache()
+
+def get_sequence(name, requests, head, disk_size):
+    """Service order for a scenario, computed once and then served from the cache"""
+    return sequence_cache.get(name, requests, head, disk_size)
+
+def get_result(name, requests, head, disk_size, drive=None):
+    """Cached service order together with its calculate_metrics() fields"""
+    return sequence_cache.get_result(name, requests, head, disk_size, drive)
@@ -0,0 +1,134 @@
+"""Incremental drawing of a scheduling sequence.
+
+The artists are created once. Each new step draws only the newest segment
+on top of a cached background and blits it, so the cost of a frame does not
+grow with the number of steps already shown. Any full redraw of the canvas
+(resize, theme change, a jump to an arbitrary step) refreshes the cached
+background from a history line that holds the whole shown prefix.
+"""
+import numpy as np
+
+from decimate import MARKER_THRESHOLD, DecimatedLine, PrefixDecimator
+from profiling import PROFILER
+
+class SequenceRenderer:
+    def __init__(self, ax, sequence, color, view_3d=False, step_counter=False,
+                 marker_size=10, head_size=12):
+        self.ax = ax
+        self.canvas = ax.figure.canvas
+        self.view_3d = view_3d
+        self.step_counter = step_counter
+        self.positions = np.asarray(sequence)
+        self.steps = np.arange(len(self.positions))
+        # Running head movement for every step, so frames never re-sum the prefix
+        self.movement = np.concatenate(([0], np.cumsum(np.abs(np.diff(self.positions)))))
+        self.frame = -1
+        self.background = None
+        self.event_source = None
+        self.on_finish = None
+
+        # Markers only make sense while individual steps are distinguishable
+        marker = 'o' if len(self.positions) <= MARKER_THRESHOLD else 'None'
+        style = dict(color=color, linewidth=2, marker=marker, markersize=marker_size)
+        if view_3d:
+            # 3D axes cannot re-decimate at draw time; reduce each prefix incrementally
+            self.prefixes = PrefixDecimator(self.steps, self.positions)
+            self.history, = ax.plot([], [], [], **style)
+            self.head, = ax.plot([], [], [], 'o', color='red', markersize=head_size)
+        else:
+            self.history = DecimatedLine([], [], **style)
+            ax.add_line(self.history)
+            self.head, = ax.plot([], [], 'o', color='red', markersize=head_size, animated=True)
+            # Stamp artist: only ever holds the newest segment of the history
+            self.stamp, = ax.plot([], [], animated=True, **style)
+        text = ax.text2D if view_3d else ax.text
+        self.label = text(0.02, 0.98, '', transform=ax.transAxes,
+                          verticalalignment='top',
+                          bbox=dict(facecolor='white', alpha=0.8, edgecolor='none'),
+                          animated=not view_3d)
+        ax.set_xlim(-0.5, max(len(self.positions) - 1, 1) + 0.5)
+        self._draw_cid = None if view_3d else self.canvas.mpl_connect('draw_event', self._on_draw)
+
+    def _set_history(self, frame):
+        if self.view_3d:
+            x, y = self.prefixes.prefix(frame)
+            self.history.set_data_3d(x, y, np.zeros(len(x)))
+        else:
+            self.history.set_full_data(self.steps[:frame], self.positions[:frame])
+
+    def _set_head(self, frame):
+        x, y = self.steps[frame:frame + 1], self.positions[frame:frame + 1]
+        if self.view_3d:
+            self.head.set_data_3d(x, y, np.zeros(len(x)))
+        else:
+            self.head.set_data(x, y)
+        text = f'Current head movement: {self.movement[frame]}' if frame > 0 else ''
+        if self.step_counter:
+            text = f'Step {frame + 1}/{len(self.positions)}\n{text}'.rstrip()
+        self.label.set_text(text)
+
+    def _on_draw(self, event):
+        # A full redraw happened: re-cache the background and put the
+        # animated artists back on top of it
+        self.background = self.canvas.copy_from_bbox(self.ax.bbox)
+        if self.frame >= 0:
+            self.ax.draw_artist(self.head)
+            self.ax.draw_artist(self.label)
+            self.canvas.blit(self.ax.bbox)
+
+    def show(self, frame):
+        """Display the sequence up to and including the given step"""
+        frame = min(max(frame, 0), len(self.positions) - 1)
+        previous = self.frame
+        self.frame = frame
+        self._set_history(frame)
+        self._set_head(frame)
+
+        if self.view_3d or self.background is None or frame != previous + 1:
+            # Random access or no cached background yet: one full redraw
+            if self.view_3d:
+                self.canvas.draw_idle()
+            else:
+                self.canvas.draw()
+            return
+
+        # Stamp the newly committed segment onto the cached background
+        with PROFILER.drawing("renderer.step"):
+            self.canvas.restore_region(self.background)
+            if frame > 0:
+                start = max(frame - 2, 0)
+                self.stamp.set_data(self.steps[start:frame], self.positions[start:frame])
+                self.ax.draw_artist(self.stamp)
+                self.background = self.canvas.copy_from_bbox(self.ax.bbox)
+            self.ax.draw_artist(self.head)
+            self.ax.draw_artist(self.label)
+            self.canvas.blit(self.ax.bbox)
+
+    def start(self, interval, on_finish=None):
+        """Animate from the first to the last step on a canvas timer"""
+        self.on_finish = on_finish
+        self.event_source = self.canvas.new_timer(interval=interval)
+        self.event_source.add_callback(self._advance)
+        self.event_source.start()
+        return self
+
+    def _advance(self):
+        if self.frame >= len(self.positions) - 1:
+            self.finish()
+            return
+        self.show(self.frame + 1)
+
+    def finish(self):
+        """Stop the timer and leave the final frame as ordinary artists"""
+        if self.event_source is not None:
+            self.event_source.stop()
+            self.event_source = None
+        if self._draw_cid is not None:
+            self.canvas.mpl_disconnect(self._draw_cid)
+            self._draw_cid = None
+        self.head.set_animated(False)
+        self.label.set_animated(False)
+        self.canvas.draw_idle()
+        if self.on_finish is not None:
+            on_finish, self.on_finish = self.on_finish, None
+            on_finish()
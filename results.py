@@ -0,0 +1,333 @@
+"""Columnar, appendable store for simulation results.
+
+A store is a directory of chunk files (chunk-000000.npz, ...) plus an
+index.json holding the schema and per-chunk statistics. Every chunk has one
+array per SCHEMA column, so thousands of runs read back as a few NumPy
+arrays instead of being re-parsed from CSV. Records are long format: one
+row per scenario and algorithm, with columns a record does not have filled
+with the column's missing value (NaN, -1 or "").
+
+Appends are buffered and written chunk_rows at a time. A chunk is written
+to a temporary name and renamed into place before the index is updated,
+so a store that was interrupted mid-write still reads back cleanly.
+
+read() takes only the columns it needs from each chunk and skips chunks
+whose min/max (or, for text columns, distinct values) cannot match the
+filter. For example
+
+    store.read(["head", "total_movement"], where={"algorithm": "LOOK", "disk_size": (200, 1000)})
+
+Run as a script to import JSONL from sweep.py or cli.py, or to query a
+store into CSV:
+
+    python results.py import sweep.jsonl -s runs.results
+    python results.py query runs.results --where algorithm=LOOK disk_size=200:1000 -o look.csv
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+INDEX_FILE = "index.json"
+DEFAULT_CHUNK_ROWS = 65536
+
+# (column, dtype); "str" columns are stored as NumPy unicode arrays
+SCHEMA = [
+    # Scenario
+    ("source", "str"),
+    ("scenario", "str"),
+    ("point", "int64"),
+    ("pattern", "str"),
+    ("disk_size", "int64"),
+    ("depth", "int64"),
+    ("head", "int64"),
+    ("seed", "int64"),
+    ("algorithm", "str"),
+    # Head movement
+    ("total_movement", "int64"),
+    ("avg_seek_time", "float64"),
+    ("num_operations", "int64"),
+    ("optimality_gap", "float64"),
+    # Drive model and event-driven timings
+    ("seek_time_ms", "float64"),
+    ("rotational_latency_ms", "float64"),
+    ("transfer_time_ms", "float64"),
+    ("total_time_ms", "float64"),
+    ("avg_access_time_ms", "float64"),
+    ("makespan_ms", "float64"),
+    ("makespan_lower_bound_ms", "float64"),
+    ("mean_wait_ms", "float64"),
+    ("max_wait_ms", "float64"),
+    ("mean_response_ms", "float64"),
+    ("p50_response_ms", "float64"),
+    ("p95_response_ms", "float64"),
+    ("p99_response_ms", "float64"),
+    ("max_response_ms", "float64"),
+    ("fairness_index", "float64"),
+    # Run bookkeeping
+    ("elapsed_ms", "float64"),
+    ("recorded_at", "float64")
+]
+
+MISSING = {"str": "", "int64": -1, "float64": np.nan}
+
+def _column_array(values, dtype):
+    if dtype == "str":
+        return np.array(values, dtype=str)
+    return np.array(values, dtype=dtype)
+
+def _stats(arrays, schema):
+    """Per-chunk min/max of numeric columns and distinct values of text columns"""
+    stats = {"min": {}, "max": {}, "values": {}}
+    for name, dtype in schema:
+        column = arrays[name]
+        if dtype == "str":
+            stats["values"][name] = np.unique(column).tolist()
+            continue
+        if dtype == "float64":
+            column = column[~np.isnan(column)]
+        if len(column):
+            stats["min"][name] = column.min().item()
+            stats["max"][name] = column.max().item()
+    return stats
+
+def _as_range(condition):
+    if isinstance(condition, tuple):
+        return condition
+    return None
+
+def _may_match(chunk, where):
+    """False when the chunk's statistics rule out every row"""
+    for name, condition in where.items():
+        if name in chunk["values"]:
+            present = set(chunk["values"][name])
+            wanted = condition if isinstance(condition, (list, set)) else [condition]
+            if not present.intersection(wanted):
+                return False
+        elif name in chunk["min"]:
+            low, high = chunk["min"][name], chunk["max"][name]
+            bounds = _as_range(condition)
+            if bounds is None:
+                wanted = condition if isinstance(condition, (list, set)) else [condition]
+                if all(v < low or v > high for v in wanted):
+                    return False
+            elif ((bounds[0] is not None and bounds[0] > high)
+                  or (bounds[1] is not None and bounds[1] < low)):
+                return False
+    return True
+
+def _mask(arrays, where):
+    mask = None
+    for name, condition in where.items():
+        column = arrays[name]
+        bounds = _as_range(condition)
+        if bounds is not None:
+            keep = np.ones(len(column), dtype=bool)
+            if bounds[0] is not None:
+                keep &= column >= bounds[0]
+            if bounds[1] is not None:
+                keep &= column <= bounds[1]
+        elif isinstance(condition, (list, set)):
+            keep = np.isin(column, list(condition))
+        else:
+            keep = column == condition
+        mask = keep if mask is None else mask & keep
+    return mask
+
+class ResultsStore:
+    def __init__(self, path, chunk_rows=DEFAULT_CHUNK_ROWS):
+        self.path = path
+        self.chunk_rows = chunk_rows
+        self.buffer = []
+        index_path = os.path.join(path, INDEX_FILE)
+        if os.path.exists(index_path):
+            with open(index_path) as f:
+                self.index = json.load(f)
+            self.schema = [tuple(column) for column in self.index["schema"]]
+            if self.schema != SCHEMA:
+                missing = [name for name, _ in SCHEMA if name not in dict(self.schema)]
+                if missing:
+                    raise ValueError(f"{path} was written with an older schema (no {', '.join(missing)})")
+        else:
+            os.makedirs(path, exist_ok=True)
+            self.schema = list(SCHEMA)
+            self.index = {"version": 1, "schema": self.schema, "chunks": []}
+            self._write_index()
+        self.dtypes = dict(self.schema)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return sum(chunk["rows"] for chunk in self.index["chunks"]) + len(self.buffer)
+
+    @property
+    def columns(self):
+        return [name for name, _ in self.schema]
+
+    def append(self, records, **defaults):
+        """Buffer result records (dicts); keyword arguments fill every record
+
+        Keys outside the schema raise ValueError rather than being dropped.
+        """
+        now = time.time()
+        for record in records:
+            row = {"recorded_at": now, **defaults, **record}
+            unknown = [key for key in row if key not in self.dtypes]
+            if unknown:
+                raise ValueError(f"Not in the results schema: {', '.join(unknown)}")
+            if "scenario" in row:
+                row["scenario"] = str(row["scenario"])
+            self.buffer.append(row)
+            if len(self.buffer) >= self.chunk_rows:
+                self.flush()
+
+    def flush(self):
+        """Write buffered records out as a new chunk"""
+        if not self.buffer:
+            return
+        arrays = {
+            name: _column_array([row.get(name, MISSING[dtype]) for row in self.buffer], dtype)
+            for name, dtype in self.schema
+        }
+        name = f"chunk-{len(self.index['chunks']):06d}.npz"
+        temporary = os.path.join(self.path, name + ".tmp")
+        with open(temporary, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(temporary, os.path.join(self.path, name))
+        self.index["chunks"].append({"file": name, "rows": len(self.buffer), **_stats(arrays, self.schema)})
+        self._write_index()
+        self.buffer = []
+
+    def close(self):
+        self.flush()
+
+    def _write_index(self):
+        temporary = os.path.join(self.path, INDEX_FILE + ".tmp")
+        with open(temporary, "w") as f:
+            json.dump(self.index, f)
+        os.replace(temporary, os.path.join(self.path, INDEX_FILE))
+
+    def iter_chunks(self, columns=None, where=None):
+        """Yield {column: array} for each written chunk with matching rows
+
+        where maps a column to a value, a list of values, or an inclusive
+        (low, high) range where either end may be None.
+        """
+        columns = list(columns or self.columns)
+        where = where or {}
+        for name in list(columns) + list(where):
+            if name not in self.dtypes:
+                raise ValueError(f"Unknown results column: {name}")
+        for chunk in self.index["chunks"]:
+            if not _may_match(chunk, where):
+                continue
+            with np.load(os.path.join(self.path, chunk["file"])) as data:
+                arrays = {name: data[name] for name in set(columns) | set(where)}
+            mask = _mask(arrays, where)
+            if mask is None:
+                yield {name: arrays[name] for name in columns}
+            elif mask.any():
+                yield {name: arrays[name][mask] for name in columns}
+
+    def read(self, columns=None, where=None):
+        """Matching rows of the written chunks as one array per column"""
+        columns = list(columns or self.columns)
+        parts = list(self.iter_chunks(columns, where))
+        if not parts:
+            return {name: _column_array([], self.dtypes[name]) for name in columns}
+        return {name: np.concatenate([part[name] for part in parts]) for name in columns}
+
+def write_csv(out, arrays):
+    """Write read() output as long-format CSV"""
+    columns = list(arrays)
+    writer = csv.writer(out)
+    writer.writerow(columns)
+    writer.writerows(zip(*(arrays[name].tolist() for name in columns)))
+
+def parse_condition(text, dtype):
+    """'v', 'v1,v2' or 'low:high' (either end optional) from the command line"""
+    convert = str if dtype == "str" else (int if dtype == "int64" else float)
+    if ":" in text and dtype != "str":
+        low, high = text.split(":", 1)
+        return (convert(low) if low else None, convert(high) if high else None)
+    if "," in text:
+        return [convert(v) for v in text.split(",")]
+    return convert(text)
+
+def import_jsonl(lines, store, source):
+    """Append JSON records from sweep.py or cli.py; returns the number stored"""
+    count = 0
+    batch = []
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        record = json.loads(line)
+        # Service orders are not part of the columnar results
+        record.pop("sequence", None)
+        if "id" in record:
+            record["scenario"] = record.pop("id")
+        batch.append(record)
+        if len(batch) >= store.chunk_rows:
+            store.append(batch, source=source)
+            count += len(batch)
+            batch = []
+    store.append(batch, source=source)
+    return count + len(batch)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import into and query a columnar results store")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    importer = commands.add_parser("import", help="Append JSONL records from sweep.py or cli.py")
+    importer.add_argument("input", nargs="?", default="-", help="JSONL file (default: stdin)")
+    importer.add_argument("-s", "--store", required=True, help="Results store directory")
+    importer.add_argument("--source", default="jsonl", help="Value of the source column")
+
+    query = commands.add_parser("query", help="Write matching rows as long-format CSV")
+    query.add_argument("store", help="Results store directory")
+    query.add_argument("-c", "--columns", nargs="+", help="Columns to output (default: all)")
+    query.add_argument("-w", "--where", nargs="+", default=[], metavar="COLUMN=VALUE",
+                       help="Filters: value, v1,v2 or low:high")
+    query.add_argument("-o", "--output", default="-", help="CSV file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    if args.command == "import":
+        infile = sys.stdin if args.input == "-" else open(args.input)
+        try:
+            with ResultsStore(args.store) as store:
+                count = import_jsonl(infile, store, args.source)
+        finally:
+            if infile is not sys.stdin:
+                infile.close()
+        print(f"{count} records added to {args.store}", file=sys.stderr)
+        return 0
+
+    if not os.path.exists(os.path.join(args.store, INDEX_FILE)):
+        parser.error(f"no results store at {args.store}")
+    store = ResultsStore(args.store)
+    where = {}
+    for condition in args.where:
+        name, _, text = condition.partition("=")
+        if name not in store.dtypes:
+            parser.error(f"unknown column: {name}")
+        where[name] = parse_condition(text, store.dtypes[name])
+    arrays = store.read(args.columns, where)
+    outfile = sys.stdout if args.output == "-" else open(args.output, "w", newline="")
+    try:
+        write_csv(outfile, arrays)
+    finally:
+        if outfile is not sys.stdout:
+            outfile.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""Shortest-Access-Time-First scheduling over (cylinder, sector) requests.
+
+SATF picks the pending request whose seek plus rotational wait is
+smallest. Pending requests are indexed by cylinder band and, inside each
+band, by sector. Bands are visited outwards from the head in order of
+their minimum seek time, and sectors inside a band in the order they pass
+under the head. Both orders give lower bounds on access time, so the
+search stops as soon as no unvisited band or sector can beat the best
+request found. Deep queues are therefore searched without touching every
+pending request.
+
+Without sectors the platter position of a request is unknown, and every
+request is charged its expected rotational latency, half a revolution
+(as timesim.simulate() does). The access time is then seek plus a
+constant, so SATF serves the same order as SSTF.
+
+Access times within TIE_MS of each other count as equal, and then the
+earlier request (lower id) wins, as in SSTF. Exact ties are common: with
+every request on sector 0, all requests whose seeks end in the same
+revolution have the same access time. This also limits the pruning.
+Every request whose lower bound is within one revolution of the best
+access time must be looked at. So the work per decision grows with the
+number of pending requests in that seek range, which on a disk of fixed
+size grows with the queue. On benchmarks/bench.py's 2^20-cylinder disk
+with sector-0 requests, a queue takes about 1.1 s at 10k requests and
+11 s at 100k.
+"""
+from bisect import bisect_left, insort
+
+from pending import CylinderIndex
+
+# Access times closer than this (ms) are a tie, broken by request id
+TIE_MS = 1e-9
+
+class SATFPolicy:
+    band_width = 16
+
+    def __init__(self, workload):
+        self.cylinders = workload["cylinders"]
+        self.drive = workload["drive"]
+        self.exact = workload["sectors"] is not None
+        # Without sectors every request sits in one slot and waits half a revolution
+        self.sectors = workload["sectors"] if self.exact else [0] * len(self.cylinders)
+        self.expected_rotation = 0.0 if self.exact else self.drive.rotation_ms / 2
+        self.bands = CylinderIndex([c // self.band_width for c in self.cylinders])
+        # band -> {sector: [request ids]} and band -> sorted occupied sectors
+        self.slots = {}
+        self.occupied = {}
+
+    def __len__(self):
+        return len(self.bands)
+
+    def add(self, request_id):
+        band = self.cylinders[request_id] // self.band_width
+        sector = self.sectors[request_id]
+        slots = self.slots.setdefault(band, {})
+        if sector not in slots:
+            slots[sector] = []
+            insort(self.occupied.setdefault(band, []), sector)
+        slots[sector].append(request_id)
+        self.bands.add(band, request_id)
+
+    def _remove(self, request_id):
+        band = self.cylinders[request_id] // self.band_width
+        sector = self.sectors[request_id]
+        slot = self.slots[band][sector]
+        slot.remove(request_id)
+        if not slot:
+            del self.slots[band][sector]
+            self.occupied[band].remove(sector)
+        self.bands.discard(band, request_id)
+
+    def _band_distance(self, band, head):
+        low = band * self.band_width
+        high = low + self.band_width - 1
+        if head < low:
+            return low - head
+        if head > high:
+            return head - high
+        return 0
+
+    def _scan_expected(self, band, head, best):
+        for request_id in self.slots[band][0]:
+            access = self.drive.seek_ms(self.cylinders[request_id] - head) + self.expected_rotation
+            if access < best[0] - TIE_MS:
+                best = (access, request_id)
+            elif access <= best[0] + TIE_MS and request_id < best[1]:
+                best = (min(access, best[0]), request_id)
+        return best
+
+    def _scan_band(self, band, head, now, seek_bound, best):
+        if not self.exact:
+            return self._scan_expected(band, head, best)
+        drive = self.drive
+        occupied = self.occupied[band]
+        earliest = now + seek_bound
+        spt = drive.sectors_per_track
+        # Sector under the head once the shortest possible seek is over
+        position = (earliest / drive.rotation_ms * spt) % spt
+        start = bisect_left(occupied, position)
+        for i in range(len(occupied)):
+            sector = occupied[(start + i) % len(occupied)]
+            if seek_bound + drive.rotational_wait(sector, earliest) > best[0] + TIE_MS:
+                break
+            for request_id in self.slots[band][sector]:
+                seek = drive.seek_ms(self.cylinders[request_id] - head)
+                access = seek + drive.rotational_wait(sector, now + seek)
+                if access < best[0] - TIE_MS:
+                    best = (access, request_id)
+                elif access <= best[0] + TIE_MS and request_id < best[1]:
+                    best = (min(access, best[0]), request_id)
+        return best
+
+    def next(self, head, now):
+        bands = self.bands
+        values = bands.values
+        head_band = head // self.band_width
+        up = bands.at_or_above(head_band)
+        down = bands.at_or_below(head_band - 1)
+        best = (float("inf"), -1)
+
+        while up is not None or down is not None:
+            up_distance = self._band_distance(values[up], head) if up is not None else None
+            down_distance = self._band_distance(values[down], head) if down is not None else None
+            if down_distance is None or (up_distance is not None and up_distance <= down_distance):
+                band, distance = values[up], up_distance
+                up = bands.at_or_above(band + 1)
+            else:
+                band, distance = values[down], down_distance
+                down = bands.at_or_below(band - 1)
+            seek_bound = self.drive.seek_ms(distance)
+            if seek_bound + self.expected_rotation > best[0] + TIE_MS:
+                break
+            best = self._scan_band(band, head, now, seek_bound, best)
+
+        request_id = best[1]
+        self._remove(request_id)
+        return request_id, []
@@ -0,0 +1,290 @@
+"""Parameter sweeps over a process pool.
+
+A sweep spec is a JSON object such as
+
+    {"heads": [0, 100, 500], "disk_sizes": [200, 1000], "depths": [8, 64],
+     "seeds": 1000, "algorithms": ["SSTF", "LOOK", "C-LOOK"]}
+
+("seeds" is a count or a list, "algorithms" defaults to all of them;
+"pattern" and "pattern_params" pick a workloads.py generator, uniform by
+default). With "arrivals" (a workloads.py arrival process such as
+"poisson", tuned by "arrival_params") each queue is run through the
+event-driven simulation in timesim.py instead, and the records also hold
+its response-time percentiles.
+
+The grid points are every disk size x depth x head x seed combination
+with head < disk size. Each point is numbered, and the workers receive
+contiguous chunks of numbers rather than pickled workloads. Each worker
+regenerates a point's queue from its seed, so the same seed gives every
+head and algorithm the same requests. Workers are started once with the
+spec (initializer) and reused for every chunk. Algorithms that batch.py
+vectorizes run a chunk's queues as one array.
+
+Results are appended to a JSONL file, one record per point and
+algorithm, as each chunk finishes. With --resume the records are read
+back from that file. A point counts as done once it has a record for
+every algorithm, and a point cut short mid-write is run again for the
+algorithms it is missing, so an interrupted sweep picks up where it
+stopped.
+"""
+import argparse
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import json
+import multiprocessing
+import os
+import sys
+
+import numpy as np
+
+import workloads
+
+DEFAULT_CHUNK_SIZE = 256
+
+_spec = None
+
+def normalize_spec(spec):
+    """Fill in defaults and check a sweep spec"""
+    import registry
+
+    seeds = spec.get("seeds", 1)
+    spec = {
+        "heads": [int(h) for h in spec["heads"]],
+        "disk_sizes": [int(d) for d in spec["disk_sizes"]],
+        "depths": [int(n) for n in spec["depths"]],
+        "seeds": list(range(seeds)) if isinstance(seeds, int) else [int(s) for s in seeds],
+        "algorithms": spec.get("algorithms") or list(registry.ALGORITHMS),
+        "pattern": spec.get("pattern", "uniform"),
+        "pattern_params": spec.get("pattern_params") or {},
+        "arrivals": spec.get("arrivals"),
+        "arrival_params": spec.get("arrival_params") or {}
+    }
+    for name in spec["algorithms"]:
+        registry.get_algorithm(name)
+    if spec["arrivals"] is not None and spec["arrivals"] not in workloads.ARRIVALS:
+        raise ValueError(f"Unknown arrival process: {spec['arrivals']}")
+    return spec
+
+def grid_size(spec):
+    return len(spec["disk_sizes"]) * len(spec["depths"]) * len(spec["heads"]) * len(spec["seeds"])
+
+def decode(spec, point):
+    """(disk_size, depth, head, seed) of a point number; seed varies fastest"""
+    point, seed = divmod(point, len(spec["seeds"]))
+    point, head = divmod(point, len(spec["heads"]))
+    disk_size, depth = divmod(point, len(spec["depths"]))
+    return (spec["disk_sizes"][disk_size], spec["depths"][depth],
+            spec["heads"][head], spec["seeds"][seed])
+
+def make_queue(seed, disk_size, depth, pattern="uniform", pattern_params=None):
+    workload = workloads.generate_workload(depth, disk_size, pattern, seed, pattern_params=pattern_params)
+    return workload["cylinder"]
+
+def make_timed_workload(seed, disk_size, depth, spec):
+    return workloads.generate_workload(depth, disk_size, spec["pattern"], seed,
+                                       pattern_params=spec["pattern_params"], arrivals=spec["arrivals"],
+                                       arrival_params=spec["arrival_params"])
+
+def run_timed(spec, disk_size, depth, points):
+    """Records for points whose queues arrive over time (spec["arrivals"])"""
+    import timesim
+
+    records = []
+    generated = {}
+    for point, head, seed in points:
+        if seed not in generated:
+            generated[seed] = make_timed_workload(seed, disk_size, depth, spec)
+        workload = generated[seed]
+        base = {"point": point, "disk_size": disk_size, "depth": depth, "head": head, "seed": seed}
+        for name in spec["algorithms"]:
+            result = timesim.simulate(workload["cylinder"], workload["arrival"], head, disk_size, name,
+                                      writes=workload["write"])
+            records.append({**base, "algorithm": name, **result["metrics"]})
+    return records
+
+def _init_worker(spec):
+    global _spec
+    _spec = spec
+    # Import the scheduling code once per process, not once per chunk
+    import batch
+    import registry
+
+def worker_pool(workers, spec):
+    """Process pool whose workers hold spec for run_chunk()
+
+    Workers come from a fork server (spawned where there is none), never
+    from fork(). The GUI starts pools from a worker thread, and a forked
+    child would inherit locks that other threads hold at that moment.
+    """
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context(method),
+                               initializer=_init_worker, initargs=(spec,))
+
+def run_chunk(start, stop, spec=None):
+    """Run points [start, stop) and return their result records"""
+    import batch
+    from metrics import calculate_metrics
+    import registry
+
+    spec = spec or _spec
+    groups = {}
+    for point in range(start, stop):
+        disk_size, depth, head, seed = decode(spec, point)
+        if head < disk_size:
+            groups.setdefault((disk_size, depth), []).append((point, head, seed))
+
+    records = []
+    for (disk_size, depth), points in groups.items():
+        if spec.get("arrivals") is not None:
+            records.extend(run_timed(spec, disk_size, depth, points))
+            continue
+        heads = np.array([head for _, head, _ in points])
+        # Every head of a seed gets the same queue, so generate it once
+        generated = {}
+        for _, _, seed in points:
+            if seed not in generated:
+                generated[seed] = make_queue(seed, disk_size, depth, spec["pattern"], spec["pattern_params"])
+        queues = np.array([generated[seed] for _, _, seed in points])
+        queues = queues.reshape(len(points), depth)
+        vectorized = [name for name in spec["algorithms"] if name in batch.BATCH_ALGORITHMS]
+        results = batch.run_batch(queues, heads, disk_size, vectorized)
+        for row, (point, head, seed) in enumerate(points):
+            base = {"point": point, "disk_size": disk_size, "depth": depth, "head": head, "seed": seed}
+            for name in spec["algorithms"]:
+                if name in results:
+                    metrics = {
+                        "total_movement": int(results[name]["total_movement"][row]),
+                        "avg_seek_time": float(results[name]["avg_seek_time"][row]),
+                        "num_operations": int(results[name]["num_operations"])
+                    }
+                else:
+                    sequence = registry.get_algorithm(name)(queues[row], head, disk_size)
+                    metrics = calculate_metrics(sequence)
+                records.append({**base, "algorithm": name, **metrics})
+    return records
+
+def completed_points(path, total, algorithms):
+    """Points already in a results file, as (done, present)
+
+    done is a boolean mask of the points with a record for every
+    algorithm. present holds the (point, algorithm) pairs of the points
+    that have only some of them, so that only the missing records are
+    added. A trailing partial line (the sweep was killed mid-write) is cut
+    off so that appending continues on a clean line.
+    """
+    done = np.zeros(total, dtype=bool)
+    if not os.path.exists(path):
+        return done, set()
+    wanted = set(algorithms)
+    found = {}
+    good = 0
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                record = json.loads(line)
+                point = record["point"]
+            except (ValueError, KeyError):
+                break
+            if not 0 <= point < total:
+                break
+            if record.get("algorithm") in wanted:
+                found.setdefault(point, set()).add(record["algorithm"])
+            good += len(line)
+    with open(path, "r+b") as f:
+        f.truncate(good)
+    present = set()
+    for point, names in found.items():
+        if names == wanted:
+            done[point] = True
+        else:
+            present.update((point, name) for name in names)
+    return done, present
+
+def pending_chunks(spec, done, chunk_size):
+    """(start, stop) of every chunk with a valid point not yet in done"""
+    total = len(done)
+    for start in range(0, total, chunk_size):
+        stop = min(start + chunk_size, total)
+        for point in range(start, stop):
+            if not done[point]:
+                disk_size, _, head, _ = decode(spec, point)
+                if head < disk_size:
+                    yield start, stop
+                    break
+
+def run_sweep(spec, output, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, resume=False, progress=None):
+    """Run a sweep, appending records to output; returns the records written
+
+    At most a few chunks per worker are in flight at a time, so memory does
+    not grow with the size of the grid. progress, if given, is called as
+    progress(chunks_finished, chunks_pending) after every chunk.
+    """
+    spec = normalize_spec(spec)
+    total = grid_size(spec)
+    if resume:
+        done, present = completed_points(output, total, spec["algorithms"])
+    else:
+        done, present = np.zeros(total, dtype=bool), set()
+        open(output, "w").close()
+    chunks = list(pending_chunks(spec, done, chunk_size))
+    workers = workers or os.cpu_count() or 1
+
+    written = 0
+    finished = 0
+    with open(output, "a") as out, worker_pool(workers, spec) as pool:
+        queue = iter(chunks)
+        running = set()
+        try:
+            while True:
+                while len(running) < workers * 4:
+                    chunk = next(queue, None)
+                    if chunk is None:
+                        break
+                    running.add(pool.submit(run_chunk, *chunk))
+                if not running:
+                    break
+                finished_now, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished_now:
+                    # Records written before an interruption are not written twice
+                    records = [r for r in future.result()
+                               if not done[r["point"]] and (r["point"], r["algorithm"]) not in present]
+                    out.write("".join(json.dumps(r) + "\n" for r in records))
+                    out.flush()
+                    written += len(records)
+                    finished += 1
+                    if progress:
+                        progress(finished, len(chunks))
+        except KeyboardInterrupt:
+            # Drop queued chunks; whatever was flushed is kept for --resume
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+    return written
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a parameter sweep across a process pool")
+    parser.add_argument("spec", help="JSON file with heads, disk_sizes, depths, seeds and algorithms")
+    parser.add_argument("-o", "--output", required=True, help="JSONL results file")
+    parser.add_argument("-j", "--workers", type=int, help="Worker processes (default: all cores)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="Grid points per task")
+    parser.add_argument("--resume", action="store_true",
+                        help="Keep existing results and only run the missing points")
+    args = parser.parse_args(argv)
+
+    with open(args.spec) as f:
+        spec = json.load(f)
+
+    def report(finished, total):
+        print(f"\r{finished}/{total} chunks", end="", file=sys.stderr, flush=True)
+
+    try:
+        written = run_sweep(spec, args.output, args.workers, args.chunk_size, args.resume, report)
+    except KeyboardInterrupt:
+        print(f"\nInterrupted; rerun with --resume to finish {args.output}", file=sys.stderr)
+        return 130
+    print(f"\n{written} records written to {args.output}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
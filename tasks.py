@@ -0,0 +1,82 @@
+"""Background work for the Tk GUI.
+
+Tk may only be touched from the main thread, so BackgroundTask runs a
+function on a worker thread and passes its progress and result back through
+a queue. The main thread drains that queue every poll_ms with after(). A
+task cannot be interrupted in the middle of a computation, so it is cancelled
+cooperatively: the next progress report after cancel() raises Cancelled in
+the worker.
+"""
+import queue
+import threading
+
+class Cancelled(Exception):
+    """Raised inside a task's work function once the task is cancelled"""
+
+class BackgroundTask:
+    def __init__(self, root, work, on_done, on_error=None, on_progress=None, on_cancel=None,
+                 poll_ms=50):
+        self.root = root
+        self.work = work
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.on_cancel = on_cancel
+        self.poll_ms = poll_ms
+        self.messages = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.thread = None
+        self.finished = False
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        self.root.after(self.poll_ms, self._poll)
+        return self
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    @property
+    def running(self):
+        return not self.finished
+
+    def progress(self, done, total=None, label=""):
+        """Report progress from the worker; total=None means unknown"""
+        if self.cancel_event.is_set():
+            raise Cancelled()
+        self.messages.put(("progress", (done, total, label)))
+
+    def _run(self):
+        try:
+            result = self.work(self.progress)
+            if self.cancel_event.is_set():
+                raise Cancelled()
+            self.messages.put(("done", result))
+        except Cancelled:
+            self.messages.put(("cancelled", None))
+        except Exception as e:
+            self.messages.put(("error", e))
+
+    def _poll(self):
+        latest = None
+        while True:
+            try:
+                kind, payload = self.messages.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "progress":
+                # Only the newest progress report is worth drawing
+                latest = payload
+                continue
+            self.finished = True
+            if kind == "done":
+                self.on_done(payload)
+            elif kind == "error" and self.on_error:
+                self.on_error(payload)
+            elif kind == "cancelled" and self.on_cancel:
+                self.on_cancel()
+            return
+        if latest is not None and self.on_progress and not self.cancel_event.is_set():
+            self.on_progress(*latest)
+        self.root.after(self.poll_ms, self._poll)
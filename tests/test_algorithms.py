@@ -0,0 +1,45 @@
+import numpy as np
+
+import algorithms
+import batch
+
+def quadratic_sstf(requests, head):
+    """The original SSTF: repeatedly take the nearest remaining request"""
+    current = head
+    sequence = [head]
+    remaining = list(requests)
+    while remaining:
+        closest = min(remaining, key=lambda x: abs(x - current))
+        sequence.append(closest)
+        current = closest
+        remaining.remove(closest)
+    return sequence
+
+def random_queues(seed, count, max_depth=60):
+    rng = np.random.default_rng(seed)
+    for _ in range(count):
+        disk_size = int(rng.integers(2, 500))
+        queue = rng.integers(0, disk_size, int(rng.integers(0, max_depth))).tolist()
+        yield queue, int(rng.integers(0, disk_size)), disk_size
+
+def test_sstf_matches_the_quadratic_loop():
+    for queue, head, disk_size in random_queues(1, 2000):
+        assert algorithms.sstf(queue, head, disk_size).tolist() == quadratic_sstf(queue, head)
+
+def test_sequences_fit_their_dtype():
+    assert algorithms.look([5, 1], 3, 200).dtype == np.int32
+    assert algorithms.look([5, 1], 3, 2 ** 40).dtype == np.int64
+
+def test_batch_matches_the_single_queue_algorithms():
+    rng = np.random.default_rng(2)
+    for _ in range(100):
+        rows, depth = int(rng.integers(1, 20)), int(rng.integers(1, 40))
+        disk_size = int(rng.integers(2, 500))
+        workloads = rng.integers(0, disk_size, (rows, depth))
+        heads = rng.integers(0, disk_size, rows)
+        results = batch.run_batch(workloads, heads, disk_size)
+        for name, result in results.items():
+            for row in range(rows):
+                expected = algorithms.ALGORITHMS[name](workloads[row], int(heads[row]), disk_size)
+                assert result["sequence"][row].tolist() == expected.tolist()
+                assert result["total_movement"][row] == np.abs(np.diff(expected.astype(np.int64))).sum()
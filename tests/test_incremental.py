@@ -0,0 +1,36 @@
+import numpy as np
+
+from drive import DriveModel
+from incremental import INCREMENTAL_ALGORITHMS, IncrementalQueue
+from metrics import calculate_metrics
+
+def test_metrics_match_a_full_recalculation_under_edits():
+    rng = np.random.default_rng(23)
+    drive = DriveModel()
+    for _ in range(40):
+        disk_size = int(rng.integers(2, 400))
+        requests = rng.integers(0, disk_size, int(rng.integers(0, 30))).tolist()
+        queue = IncrementalQueue(requests, int(rng.integers(0, disk_size)), disk_size, drive, block_size=4)
+        for _ in range(30):
+            action = rng.integers(0, 4)
+            if action == 0 or not requests:
+                cylinder = int(rng.integers(0, disk_size))
+                queue.add(cylinder)
+                requests.append(cylinder)
+            elif action == 1:
+                cylinder = requests.pop(int(rng.integers(0, len(requests))))
+                queue.remove(cylinder)
+            elif action == 2:
+                old = requests.pop(int(rng.integers(0, len(requests))))
+                new = int(rng.integers(0, disk_size))
+                queue.move(old, new)
+                requests.append(new)
+            else:
+                queue.set_head(int(rng.integers(0, disk_size)))
+            assert queue.requests().tolist() == sorted(requests)
+            for name in INCREMENTAL_ALGORITHMS:
+                expected = calculate_metrics(queue.sequence(name), drive, requests)
+                actual = queue.metrics(name)
+                assert actual.keys() == expected.keys()
+                for key, value in expected.items():
+                    assert np.isclose(actual[key], value), (name, key)
@@ -0,0 +1,22 @@
+import math
+
+import numpy as np
+
+import algorithms
+import oracle
+
+def test_optimality_gap_of_zero_optimum():
+    assert oracle.optimality_gap(0, 0) == 0.0
+    assert oracle.optimality_gap(149, 0) == math.inf
+    assert oracle.optimality_gap(150, 100) == 0.5
+
+def test_optimal_movement_bounds_every_algorithm():
+    rng = np.random.default_rng(14)
+    for _ in range(200):
+        disk_size = int(rng.integers(2, 1000))
+        queue = rng.integers(0, disk_size, int(rng.integers(0, 30))).tolist()
+        head = int(rng.integers(0, disk_size))
+        best = oracle.optimal_movement(queue, head)
+        for name in ("FCFS", "SSTF", "SCAN", "C-SCAN", "LOOK", "C-LOOK"):
+            sequence = algorithms.ALGORITHMS[name](queue, head, disk_size).astype(np.int64)
+            assert np.abs(np.diff(sequence)).sum() >= best
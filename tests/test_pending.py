@@ -0,0 +1,46 @@
+import numpy as np
+
+from pending import CylinderIndex
+
+def test_matches_a_sorted_list_through_adds_pops_and_discards():
+    rng = np.random.default_rng(11)
+    for _ in range(50):
+        cylinders = rng.integers(0, int(rng.integers(1, 60)), int(rng.integers(1, 80))).tolist()
+        index = CylinderIndex(cylinders)
+        pending = []  # (cylinder, request_id) in arrival order
+        unseen = list(range(len(cylinders)))
+        rng.shuffle(unseen)
+        for _ in range(4 * len(cylinders)):
+            action = rng.integers(0, 3)
+            if action == 0 and unseen:
+                request_id = unseen.pop()
+                index.add(cylinders[request_id], request_id)
+                pending.append((cylinders[request_id], request_id))
+            elif action == 1 and pending:
+                # Pop the oldest request on the nearest cylinder at or above a probe
+                probe = int(rng.integers(-1, 61))
+                choice = index.at_or_above(probe)
+                above = [c for c, _ in pending if c >= probe]
+                assert (choice is None) == (not above)
+                if choice is not None:
+                    assert index.values[choice] == min(above)
+                    oldest = next(r for c, r in pending if c == min(above))
+                    assert index.peek(choice) == oldest
+                    assert index.pop(choice) == oldest
+                    pending.remove((min(above), oldest))
+            elif action == 2 and pending:
+                # Discard a request that need not be first on its cylinder
+                cylinder, request_id = pending.pop(int(rng.integers(0, len(pending))))
+                index.discard(cylinder, request_id)
+            assert len(index) == len(pending)
+            probe = int(rng.integers(-1, 61))
+            below = [c for c, _ in pending if c <= probe]
+            choice = index.at_or_below(probe)
+            assert (choice is None) == (not below)
+            if below:
+                assert index.values[choice] == max(below)
+            if pending:
+                assert index.values[index.lowest()] == min(c for c, _ in pending)
+                assert index.values[index.highest()] == max(c for c, _ in pending)
+            else:
+                assert index.lowest() is None and index.highest() is None
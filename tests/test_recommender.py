@@ -0,0 +1,19 @@
+import pytest
+
+import recommender
+
+SPEC = {"heads": [0, 100, 199], "disk_sizes": [200], "depths": [4, 16], "seeds": 4,
+        "algorithms": ["FCFS", "SSTF", "LOOK"]}
+
+def test_recommend_needs_at_least_one_neighbour(tmp_path):
+    path = str(tmp_path / "index.npz")
+    assert recommender.build_index([SPEC], path, workers=1) == 24
+    index = recommender.Recommender(path)
+    result = index.recommend([98, 183, 37, 122], 50, 200, k=3)
+    assert result["algorithm"] in ("FCFS", "SSTF", "LOOK")
+    assert result["neighbours"] == 3
+    for k in (0, -1):
+        with pytest.raises(ValueError):
+            index.recommend([98, 183, 37, 122], 50, 200, k=k)
+    with pytest.raises(SystemExit):
+        recommender.main(["recommend", "-i", path, "-k", "0"])
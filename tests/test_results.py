@@ -0,0 +1,29 @@
+import io
+import json
+
+import cli
+import results
+
+SCENARIOS = [
+    {"id": 1, "head": 10, "disk_size": 200, "requests": [98, 183, 37, 122]},
+    {"id": 2, "head": 150, "disk_size": 1000, "requests": [5, 900, 400]},
+    {"id": 3, "head": 0, "disk_size": 5000, "workload": {"n": 50, "pattern": "zipf", "seed": 7}}
+]
+
+def test_imported_cli_records_filter_on_scenario_parameters(tmp_path):
+    out = io.StringIO()
+    lines = [json.dumps(scenario) for scenario in SCENARIOS]
+    assert cli.run_stream(lines, out, ["FCFS", "LOOK"]) == 0
+    with results.ResultsStore(str(tmp_path / "runs")) as store:
+        assert results.import_jsonl(io.StringIO(out.getvalue()), store, "cli") == 6
+
+    store = results.ResultsStore(str(tmp_path / "runs"))
+    rows = store.read(["scenario", "head", "disk_size", "depth"], where={"disk_size": (100, 300)})
+    assert rows["scenario"].tolist() == ["1", "1"]
+    assert rows["head"].tolist() == [10, 10]
+    assert rows["depth"].tolist() == [4, 4]
+    rows = store.read(["scenario", "pattern", "seed", "depth"], where={"head": (0, 20)})
+    assert sorted(set(rows["scenario"].tolist())) == ["1", "3"]
+    rows = store.read(["pattern", "seed", "depth"], where={"pattern": "zipf"})
+    assert rows["seed"].tolist() == [7, 7]
+    assert rows["depth"].tolist() == [50, 50]
@@ -0,0 +1,44 @@
+import numpy as np
+
+import algorithms
+import timesim
+
+DEFAULT_QUEUE = [98, 183, 37, 122, 14, 124, 65, 67]
+
+def movement(sequence):
+    return int(np.abs(np.diff(np.asarray(sequence, dtype=np.int64))).sum())
+
+def test_without_sectors_satf_does_not_fall_back_to_fcfs():
+    satf = algorithms.satf(DEFAULT_QUEUE, 53, 200)
+    assert movement(satf) <= movement(algorithms.fcfs(DEFAULT_QUEUE, 53, 200))
+    assert movement(satf) == 236
+
+def test_without_sectors_satf_serves_sstf_order():
+    rng = np.random.default_rng(13)
+    for _ in range(300):
+        disk_size = int(rng.integers(2, 5000))
+        queue = rng.integers(0, disk_size, int(rng.integers(0, 60))).tolist()
+        head = int(rng.integers(0, disk_size))
+        assert algorithms.satf(queue, head, disk_size).tolist() == algorithms.sstf(queue, head, disk_size).tolist()
+
+def test_with_sectors_satf_picks_the_shortest_access_each_time():
+    rng = np.random.default_rng(14)
+    drive = timesim.DriveModel()
+    for _ in range(100):
+        n = int(rng.integers(1, 40))
+        cylinders = rng.integers(0, 2000, n).tolist()
+        sectors = rng.integers(0, drive.sectors_per_track, n).tolist()
+        result = timesim.simulate(cylinders, None, 1000, 2000, "SATF", sectors=sectors)
+        order = np.argsort(result["start"], kind="stable").tolist()
+        pending = set(range(n))
+        head, now = 1000, 0.0
+        for request_id in order:
+            access = {
+                i: drive.seek_ms(cylinders[i] - head)
+                + drive.rotational_wait(sectors[i], now + drive.seek_ms(cylinders[i] - head))
+                for i in pending
+            }
+            best = min(access.values())
+            assert request_id == min(i for i, a in access.items() if a <= best + 1e-9)
+            pending.remove(request_id)
+            head, now = cylinders[request_id], result["finish"][request_id]
@@ -0,0 +1,38 @@
+import json
+
+import sweep
+
+SPEC = {"heads": [0, 50, 150], "disk_sizes": [100, 200], "depths": [1, 8], "seeds": 6,
+        "algorithms": ["FCFS", "SSTF", "LOOK", "SATF"]}
+
+def read_records(path):
+    with open(path) as f:
+        return sorted((json.loads(line) for line in f), key=lambda r: (r["point"], r["algorithm"]))
+
+def test_pooled_run_matches_a_serial_run(tmp_path):
+    spec = sweep.normalize_spec(SPEC)
+    sweep.run_sweep(SPEC, str(tmp_path / "pooled.jsonl"), workers=2, chunk_size=7)
+    serial = sorted(sweep.run_chunk(0, sweep.grid_size(spec), spec),
+                    key=lambda r: (r["point"], r["algorithm"]))
+    assert read_records(tmp_path / "pooled.jsonl") == serial
+
+def test_resume_after_interruption_matches_a_clean_run(tmp_path):
+    clean = tmp_path / "clean.jsonl"
+    sweep.run_sweep(SPEC, str(clean), workers=2, chunk_size=7)
+    expected = read_records(clean)
+    data = clean.read_bytes()
+    for cut in (0, len(data) // 3, len(data) // 2 + 5, len(data) - 1):
+        partial = tmp_path / f"partial-{cut}.jsonl"
+        # Cut mid-line, as a killed sweep would leave it
+        partial.write_bytes(data[:cut])
+        sweep.run_sweep(SPEC, str(partial), workers=2, chunk_size=7, resume=True)
+        assert read_records(partial) == expected
+
+def test_explorer_marks_ties_instead_of_crediting_the_first_algorithm():
+    import explorer
+    grid = explorer.ExplorerGrid(["FCFS", "SSTF", "LOOK"], [0, 100, 199], [1, 16], "total_movement")
+    explorer.explore(grid, 200, seeds=3, workers=1)
+    winners = grid.winners(grid.values())
+    # One request: every algorithm moves the head the same distance
+    assert (winners[0] == explorer.TIED).all()
+    assert (winners[1] != explorer.UNKNOWN).all()
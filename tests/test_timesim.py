@@ -0,0 +1,44 @@
+import numpy as np
+
+import algorithms
+from drive import request_mask
+import timesim
+
+def test_every_policy_serves_every_request_once():
+    rng = np.random.default_rng(11)
+    for _ in range(30):
+        n = int(rng.integers(1, 80))
+        disk_size = int(rng.integers(2, 2000))
+        requests = rng.integers(0, disk_size, n)
+        arrivals = np.sort(rng.exponential(5.0, n)) if rng.random() < 0.5 else None
+        writes = (rng.random(n) < 0.3).tolist()
+        head = int(rng.integers(0, disk_size))
+        for policy in timesim.POLICIES:
+            result = timesim.simulate(requests, arrivals, head, disk_size, policy, writes=writes)
+            served = result["sequence"][1:]
+            # Every request appears; extra stops are only SCAN's edges and C-SCAN's jumps
+            counts = np.bincount(served, minlength=disk_size)
+            wanted = np.bincount(requests, minlength=disk_size)
+            extra = counts - wanted
+            assert (extra >= 0).all(), policy
+            assert set(np.flatnonzero(extra)) <= {0, disk_size - 1}, policy
+            # Each request started once, after it arrived, and never overlapped another
+            order = np.argsort(result["start"], kind="stable")
+            assert (result["wait"] >= 0).all()
+            assert (result["start"][order][1:] >= result["finish"][order][:-1] - 1e-9).all()
+
+def test_at_time_zero_requests_are_served_in_the_static_order():
+    rng = np.random.default_rng(12)
+    for _ in range(200):
+        disk_size = int(rng.integers(2, 300))
+        requests = rng.integers(0, disk_size, int(rng.integers(0, 40))).tolist()
+        head = int(rng.integers(0, disk_size))
+        for name in ("FCFS", "SSTF", "SCAN", "C-SCAN", "LOOK", "C-LOOK"):
+            static = algorithms.ALGORITHMS[name](requests, head, disk_size)
+            timed = np.asarray(timesim.simulate(requests, None, head, disk_size, name)["sequence"])
+            # Only SCAN and C-SCAN's non-request stops may differ
+            static_served = static[1:][request_mask(static, requests)]
+            timed_served = timed[1:][request_mask(timed, requests)]
+            assert timed_served.tolist() == static_served.tolist(), name
+            if name not in ("SCAN", "C-SCAN"):
+                assert timed.tolist() == static.tolist(), name
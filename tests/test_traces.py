@@ -0,0 +1,58 @@
+import io
+import itertools
+import json
+
+import numpy as np
+
+import algorithms
+import cli
+import oracle
+import traces
+from drive import DriveModel
+
+def write_spc(path, lbas):
+    with open(path, "w") as f:
+        for i, lba in enumerate(lbas):
+            f.write(f"0,{lba},4096,r,{i / 1000:.6f}\n")
+
+def test_trace_scenario_honours_drive_and_optimal(tmp_path):
+    lbas = np.random.default_rng(10).integers(0, 1 << 20, 500).tolist()
+    write_spc(tmp_path / "trace.spc", lbas)
+    scenario = {"id": "t", "head": 100, "disk_size": 1000, "algorithms": ["SSTF", "SCAN"],
+                "trace": {"path": str(tmp_path / "trace.spc"), "format": "spc", "chunk_size": 64}}
+    records = list(cli.run_scenario(scenario, drive=DriveModel(), optimal=True))
+    assert [r["algorithm"] for r in records] == ["SSTF", "SCAN", oracle.NAME]
+    for record in records[:2]:
+        assert record["total_time_ms"] > 0
+        assert record["optimality_gap"] >= 0
+    assert records[2]["num_operations"] == 500
+
+def test_trace_scenario_rejects_sequence(tmp_path):
+    write_spc(tmp_path / "trace.spc", [1, 2, 3])
+    line = json.dumps({"head": 0, "disk_size": 100, "trace": {"path": str(tmp_path / "trace.spc"), "format": "spc"}})
+    assert cli.run_stream([line], io.StringIO(), include_sequence=True) == 1
+
+def test_chunked_optimum_matches_brute_force():
+    rng = np.random.default_rng(11)
+    for _ in range(100):
+        chunks = [rng.integers(0, 50, int(rng.integers(1, 4))).tolist() for _ in range(int(rng.integers(1, 4)))]
+        head = int(rng.integers(0, 50))
+        best = None
+        for orders in itertools.product(*(itertools.permutations(chunk) for chunk in chunks)):
+            route = [head] + [c for order in orders for c in order]
+            cost = int(np.abs(np.diff(route)).sum())
+            best = cost if best is None else min(best, cost)
+        assert oracle.optimal_chunked_movement(chunks, head) == (best, sum(map(len, chunks)))
+
+def test_replay_timings_sum_over_chunks(tmp_path):
+    lbas = np.random.default_rng(12).integers(0, 1 << 20, 200).tolist()
+    write_spc(tmp_path / "trace.spc", lbas)
+    drive = DriveModel()
+    metrics = traces.replay(str(tmp_path / "trace.spc"), "spc", "LOOK", 0, 1000, 50, drive=drive)
+    total, head = 0.0, 0
+    for chunk in traces.iter_cylinders(str(tmp_path / "trace.spc"), "spc", 1000, 50):
+        sequence = algorithms.look(chunk, head, 1000)
+        total += drive.metrics(sequence, requests=chunk)["total_time_ms"]
+        head = int(sequence[-1])
+    assert np.isclose(metrics["total_time_ms"], total)
+    assert np.isclose(metrics["avg_access_time_ms"], total / 200)
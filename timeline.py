@@ -0,0 +1,170 @@
+"""Shared, scrubbable timeline over several scheduling sequences.
+
+The comparison plot draws every algorithm's full sequence once. The
+Timeline then adds animated artists on top: a cursor and one head marker
+per algorithm. A frame restores the cached background and blits only those
+few artists. Its cost depends on the number of algorithms, not on the
+sequence length or on how far the cursor jumped. The per-algorithm readout
+is plain text (describe()) for the GUI to show in a Tk label. Rendering it
+with matplotlib would cost more than the rest of the frame.
+
+Everything a frame shows is looked up in arrays precomputed on creation.
+These are the positions, the running head movement (a prefix sum of the
+seek distances) and, with a drive model, the running service time. Given
+the requests, edge and jump stops add only their seek time, as in
+DriveModel.metrics(). The cursor runs either over steps, where every
+algorithm is at the same index, or over service time in ms, where each
+algorithm is found with a binary search of its clock.
+"""
+import math
+
+import numpy as np
+
+from profiling import PROFILER
+
+AXES = ("step", "time")
+
+# Playback covers the longest sequence in at most this many frames
+MAX_PLAYBACK_FRAMES = 1000
+
+class Timeline:
+    def __init__(self, ax, sequences, colors, drive=None, axis="step", head_size=10, requests=None):
+        if axis not in AXES:
+            raise ValueError(f"Unknown timeline axis: {axis}")
+        if axis == "time" and drive is None:
+            raise ValueError("A time axis needs a drive model")
+        self.ax = ax
+        self.canvas = ax.figure.canvas
+        self.axis = axis
+        self.names = list(sequences)
+        self.positions = {}
+        self.movement = {}
+        self.clock = {}
+        for name, sequence in sequences.items():
+            positions = np.asarray(sequence)
+            self.positions[name] = positions
+            self.movement[name] = np.concatenate(([0], np.cumsum(np.abs(np.diff(positions.astype(np.int64))))))
+            if drive is not None:
+                seek, rotation, transfer = drive.service_times(positions, requests=requests)
+                self.clock[name] = np.concatenate(([0.0], np.cumsum(seek + rotation + transfer)))
+        self.longest = max(len(p) for p in self.positions.values())
+        if axis == "step":
+            self.end = self.longest - 1
+        else:
+            self.end = max(float(clock[-1]) for clock in self.clock.values())
+        self.value = 0
+        self.background = None
+        self.event_source = None
+        self.on_change = None
+        self.on_finish = None
+
+        self.cursor = ax.axvline(0, color='gray', linestyle='--', linewidth=1, animated=True)
+        self.heads = {
+            name: ax.plot([], [], 'o', color=colors[name], markersize=head_size,
+                          markeredgecolor='black', animated=True)[0]
+            for name in self.names
+        }
+        self._draw_cid = self.canvas.mpl_connect('draw_event', self._on_draw)
+
+    def x_values(self, name):
+        """x coordinates of an algorithm's steps on this timeline's axis"""
+        if self.axis == "step":
+            return np.arange(len(self.positions[name]))
+        return self.clock[name]
+
+    def frame(self, name, value):
+        """Index of the last step of name that is done at cursor value"""
+        last = len(self.positions[name]) - 1
+        if self.axis == "step":
+            return min(int(value), last)
+        return min(int(np.searchsorted(self.clock[name], value, side='right')) - 1, last)
+
+    def _update_artists(self):
+        x = self.value
+        self.cursor.set_xdata([x, x])
+        for name in self.names:
+            i = max(self.frame(name, x), 0)
+            head_x = i if self.axis == "step" else self.clock[name][i]
+            self.heads[name].set_data([head_x], [self.positions[name][i]])
+
+    def describe(self):
+        """One line per algorithm: step, position, movement and time so far"""
+        lines = []
+        for name in self.names:
+            i = max(self.frame(name, self.value), 0)
+            positions = self.positions[name]
+            line = (f"{name}: step {i + 1}/{len(positions)}, position {positions[i]}, "
+                    f"movement {self.movement[name][i]}")
+            if self.clock:
+                line += f", {self.clock[name][i]:.1f} ms"
+            lines.append(line)
+        return "\n".join(lines)
+
+    def _blit_artists(self):
+        self.ax.draw_artist(self.cursor)
+        for head in self.heads.values():
+            self.ax.draw_artist(head)
+        self.canvas.blit(self.ax.bbox)
+
+    def _on_draw(self, event):
+        # A full redraw happened: re-cache the background without the
+        # animated artists and put them back on top
+        self.background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self._update_artists()
+        self._blit_artists()
+
+    def show(self, value):
+        """Move every algorithm to the cursor value (a step or a time in ms)"""
+        self.value = min(max(value, 0), self.end)
+        if self.background is None:
+            self.canvas.draw()
+            return
+        with PROFILER.drawing("timeline.frame"):
+            self._update_artists()
+            self.canvas.restore_region(self.background)
+            self._blit_artists()
+        if self.on_change is not None:
+            self.on_change(self.value)
+
+    @property
+    def playback_increment(self):
+        steps = max(1, math.ceil(self.longest / MAX_PLAYBACK_FRAMES))
+        if self.axis == "step":
+            return steps
+        return self.end * steps / max(self.longest - 1, 1)
+
+    def start(self, interval, on_finish=None):
+        """Play from the current cursor position to the end on a canvas timer"""
+        self.stop()
+        if self.value >= self.end:
+            self.value = 0
+        self.on_finish = on_finish
+        self.event_source = self.canvas.new_timer(interval=interval)
+        self.event_source.add_callback(self._advance)
+        self.event_source.start()
+        return self
+
+    def _advance(self):
+        if self.value >= self.end:
+            self.stop()
+            if self.on_finish is not None:
+                on_finish, self.on_finish = self.on_finish, None
+                on_finish()
+            return
+        self.show(self.value + self.playback_increment)
+
+    @property
+    def playing(self):
+        return self.event_source is not None
+
+    def stop(self):
+        if self.event_source is not None:
+            self.event_source.stop()
+            self.event_source = None
+
+    def remove(self):
+        """Stop playback and detach from the canvas"""
+        self.stop()
+        self.canvas.mpl_disconnect(self._draw_cid)
+        for artist in [self.cursor, *self.heads.values()]:
+            artist.remove()
@@ -0,0 +1,388 @@
+"""Event-driven scheduling with request arrival times.
+
+Unlike the functions in algorithms.py, which see the whole queue at t=0,
+simulate() only lets a policy choose among requests that have arrived by
+the time the previous request finished. Service time comes from a drive
+model, and every request's wait and response time are recorded so tail
+latency and starvation become visible.
+
+Policies keep their pending requests in a CylinderIndex (pending.py), so
+each scheduling decision costs O(log n).
+
+With every arrival at t=0 the policies serve the requests in the same
+order as the static algorithms, but SCAN and C-SCAN do not always make
+the same non-request stops. An online policy cannot know that no more
+work is coming. So when nothing is pending behind the head, it stops at
+the last request instead of running on to the disk end (SCAN) or to the
+end and back to cylinder 0 (C-SCAN). SCAN also makes no second,
+zero-length stop at the end when its last request is already there. The
+timed orders can therefore be shorter than the static ones. For example,
+C-SCAN on [66, 180, 111] from 64 gives 64, 66, 111, 180, where the static
+order is 64, 66, 111, 180, 199, 0.
+"""
+from collections import deque
+
+import numpy as np
+
+from drive import DriveModel
+from metrics import calculate_metrics
+from pending import CylinderIndex
+from satf import SATFPolicy
+
+class FCFSPolicy:
+    def __init__(self, workload):
+        self.queue = deque()
+
+    def __len__(self):
+        return len(self.queue)
+
+    def add(self, request_id):
+        self.queue.append(request_id)
+
+    def next(self, head, now):
+        return self.queue.popleft(), []
+
+class IndexedPolicy:
+    """Base for policies that pick by cylinder position"""
+    def __init__(self, workload):
+        self.cylinders = workload["cylinders"]
+        self.disk_size = workload["disk_size"]
+        self.index = CylinderIndex(self.cylinders)
+
+    def __len__(self):
+        return len(self.index)
+
+    def add(self, request_id):
+        self.index.add(self.cylinders[request_id], request_id)
+
+class SSTFPolicy(IndexedPolicy):
+    def next(self, head, now):
+        index = self.index
+        lo = index.at_or_below(head)
+        hi = index.at_or_above(head)
+        if lo is None:
+            choice = hi
+        elif hi is None:
+            choice = lo
+        else:
+            down = head - index.values[lo]
+            up = index.values[hi] - head
+            if up != down:
+                choice = hi if up < down else lo
+            else:
+                # Same tie-break as algorithms.sstf: earlier request first
+                choice = hi if index.peek(hi) < index.peek(lo) else lo
+        return index.pop(choice), []
+
+def sweep(index, head, moving_up, disk_size=None):
+    """Next stop of an elevator sweep over a CylinderIndex
+
+    Returns (choice, path, moving_up). With disk_size the head runs to the
+    edge before reversing (SCAN); without it, it reverses at the last
+    pending request (LOOK).
+    """
+    choice = index.at_or_above(head) if moving_up else index.at_or_below(head)
+    if choice is not None:
+        return choice, [], moving_up
+    path = []
+    if disk_size is not None:
+        edge = disk_size - 1 if moving_up else 0
+        if edge != head:
+            path = [edge]
+        head = edge
+    moving_up = not moving_up
+    choice = index.at_or_above(head) if moving_up else index.at_or_below(head)
+    return choice, path, moving_up
+
+class LOOKPolicy(IndexedPolicy):
+    to_edge = False
+
+    def __init__(self, workload):
+        super().__init__(workload)
+        self.moving_up = True
+
+    def next(self, head, now):
+        edge = self.disk_size if self.to_edge else None
+        choice, path, self.moving_up = sweep(self.index, head, self.moving_up, edge)
+        return self.index.pop(choice), path
+
+class SCANPolicy(LOOKPolicy):
+    to_edge = True
+
+class CSCANPolicy(IndexedPolicy):
+    """C-SCAN that wraps around only when requests are pending below the head"""
+
+    def next(self, head, now):
+        index = self.index
+        choice = index.at_or_above(head)
+        if choice is not None:
+            return index.pop(choice), []
+        # Run to the last cylinder, return to 0 and sweep upwards again
+        return index.pop(index.lowest()), [self.disk_size - 1, 0]
+
+class CLOOKPolicy(IndexedPolicy):
+    def next(self, head, now):
+        index = self.index
+        choice = index.at_or_above(head)
+        if choice is None:
+            choice = index.lowest()
+        return index.pop(choice), []
+
+class NStepSCANPolicy:
+    """SCAN over successive batches of at most N requests in arrival order
+
+    Requests that arrive while a batch is being swept wait for a later
+    batch, so a stream of nearby arrivals cannot starve older requests.
+    """
+    batch_size = 10
+
+    def __init__(self, workload):
+        self.cylinders = workload["cylinders"]
+        self.disk_size = workload["disk_size"]
+        self.batch = CylinderIndex(self.cylinders)
+        self.waiting = deque()
+        self.moving_up = True
+
+    def __len__(self):
+        return len(self.batch) + len(self.waiting)
+
+    def add(self, request_id):
+        self.waiting.append(request_id)
+
+    def next(self, head, now):
+        if not len(self.batch):
+            for _ in range(min(self.batch_size, len(self.waiting))):
+                request_id = self.waiting.popleft()
+                self.batch.add(self.cylinders[request_id], request_id)
+        choice, path, self.moving_up = sweep(self.batch, head, self.moving_up, self.disk_size)
+        return self.batch.pop(choice), path
+
+class FSCANPolicy:
+    """SCAN over a frozen queue while new arrivals collect in a second queue"""
+    def __init__(self, workload):
+        self.cylinders = workload["cylinders"]
+        self.disk_size = workload["disk_size"]
+        self.active = CylinderIndex(self.cylinders)
+        self.waiting = CylinderIndex(self.cylinders)
+        self.moving_up = True
+
+    def __len__(self):
+        return len(self.active) + len(self.waiting)
+
+    def add(self, request_id):
+        self.waiting.add(self.cylinders[request_id], request_id)
+
+    def next(self, head, now):
+        if not len(self.active):
+            self.active, self.waiting = self.waiting, self.active
+        choice, path, self.moving_up = sweep(self.active, head, self.moving_up, self.disk_size)
+        return self.active.pop(choice), path
+
+READ, WRITE = 0, 1
+
+class DeadlinePolicy:
+    """Read/write deadline scheduler with expiry FIFOs
+
+    Requests sit both in a per-direction sorted queue (one-way ascending
+    elevator) and in a per-direction FIFO. Dispatch follows sector order in
+    batches of up to fifo_batch requests. Reads are preferred, but writes
+    get a batch after writes_starved read batches. Whenever the oldest
+    request of the current direction has passed its expiry time, service
+    jumps to it. This strict variant checks expiry before every dispatch.
+    """
+    read_expire_ms = 500.0
+    write_expire_ms = 5000.0
+    fifo_batch = 16
+    writes_starved = 2
+    check_every_dispatch = True
+
+    def __init__(self, workload):
+        self.cylinders = workload["cylinders"]
+        self.arrivals = workload["arrivals"]
+        self.writes = workload["writes"]
+        self.sorted = (CylinderIndex(self.cylinders), CylinderIndex(self.cylinders))
+        self.fifo = (deque(), deque())
+        self.expire = (self.read_expire_ms, self.write_expire_ms)
+        self.served = bytearray(len(self.cylinders))
+        self.direction = READ
+        self.batched = self.fifo_batch
+        self.starved = 0
+
+    def __len__(self):
+        return len(self.sorted[READ]) + len(self.sorted[WRITE])
+
+    def add(self, request_id):
+        direction = WRITE if self.writes[request_id] else READ
+        self.sorted[direction].add(self.cylinders[request_id], request_id)
+        self.fifo[direction].append(request_id)
+
+    def _oldest(self, direction):
+        fifo = self.fifo[direction]
+        while fifo and self.served[fifo[0]]:
+            fifo.popleft()
+        return fifo[0] if fifo else None
+
+    def _expired(self, direction, now):
+        oldest = self._oldest(direction)
+        return oldest is not None and now >= self.arrivals[oldest] + self.expire[direction]
+
+    def _choose_direction(self):
+        reads = len(self.sorted[READ])
+        writes = len(self.sorted[WRITE])
+        if reads and (not writes or self.starved < self.writes_starved):
+            if writes:
+                self.starved += 1
+            return READ
+        self.starved = 0
+        return WRITE
+
+    def next(self, head, now):
+        direction = self.direction
+        index = self.sorted[direction]
+        continue_batch = self.batched < self.fifo_batch and len(index)
+        if continue_batch and self.check_every_dispatch and self._expired(direction, now):
+            continue_batch = False
+            choice = None
+        else:
+            choice = index.at_or_above(head) if continue_batch else None
+
+        if choice is None:
+            # Start a new batch: pick a direction, then the expired FIFO head
+            # or the next request in sector order
+            direction = self.direction = self._choose_direction()
+            index = self.sorted[direction]
+            self.batched = 0
+            if not self._expired(direction, now):
+                choice = index.at_or_above(head)
+
+        if choice is None:
+            request_id = self._oldest(direction)
+            index.discard(self.cylinders[request_id], request_id)
+        else:
+            request_id = index.pop(choice)
+        self.served[request_id] = 1
+        self.batched += 1
+        return request_id, []
+
+class MQDeadlinePolicy(DeadlinePolicy):
+    """mq-deadline style batching: expiry is only checked between batches
+
+    Once a batch starts it runs for fifo_batch requests in sector order,
+    which trades some tail latency for longer sequential runs.
+    """
+    check_every_dispatch = False
+
+POLICIES = {
+    "FCFS": FCFSPolicy,
+    "SSTF": SSTFPolicy,
+    "SCAN": SCANPolicy,
+    "C-SCAN": CSCANPolicy,
+    "LOOK": LOOKPolicy,
+    "C-LOOK": CLOOKPolicy,
+    "N-Step SCAN": NStepSCANPolicy,
+    "F-SCAN": FSCANPolicy,
+    "Deadline": DeadlinePolicy,
+    "MQ-Deadline": MQDeadlinePolicy,
+    "SATF": SATFPolicy
+}
+
+def latency_metrics(wait, response):
+    """Percentiles of per-request latency plus Jain's fairness index"""
+    if len(response) == 0:
+        return {}
+    p50, p95, p99 = np.percentile(response, [50, 95, 99])
+    squares = float(np.sum(np.square(response)))
+    return {
+        "mean_wait_ms": float(np.mean(wait)),
+        "max_wait_ms": float(np.max(wait)),
+        "mean_response_ms": float(np.mean(response)),
+        "p50_response_ms": float(p50),
+        "p95_response_ms": float(p95),
+        "p99_response_ms": float(p99),
+        "max_response_ms": float(np.max(response)),
+        # 1.0 when every request waits equally long, 1/n when one request takes all
+        "fairness_index": float(np.sum(response)) ** 2 / (len(response) * squares) if squares else 1.0
+    }
+
+def simulate(requests, arrivals, head, disk_size, policy="LOOK", drive=None, sizes=None, writes=None,
+             sectors=None):
+    """Run a scheduling policy over requests that arrive over time
+
+    `arrivals` are arrival times in ms (None means all at t=0) and `writes`
+    flags write requests (None means all reads). With `sectors` the
+    rotational latency of each request is exact for the platter position
+    at the end of its seek; without them it is half a revolution. Requests
+    may also be given as (cylinder, sector) pairs. Returns a
+    dict with the service "sequence" (head first, like algorithms.py),
+    per-request "start", "finish", "wait" and "response" arrays in ms and
+    the combined "metrics".
+    """
+    drive = drive or DriveModel()
+    if sectors is None and len(requests) and isinstance(requests[0], (tuple, list)):
+        sectors = [int(r[1]) for r in requests]
+        requests = [r[0] for r in requests]
+    cylinders = [int(c) for c in requests]
+    n = len(cylinders)
+    arrivals = np.zeros(n) if arrivals is None else np.asarray(arrivals, dtype=np.float64)
+    sizes = np.full(n, drive.request_bytes) if sizes is None else np.asarray(sizes)
+    transfer = drive.transfer_time(sizes).tolist()
+    half_rotation = drive.rotation_ms / 2
+
+    writes = [False] * n if writes is None else [bool(w) for w in writes]
+    if sectors is not None:
+        sectors = [int(s) for s in sectors]
+    scheduler = POLICIES[policy]({
+        "cylinders": cylinders,
+        "disk_size": disk_size,
+        "arrivals": arrivals.tolist(),
+        "writes": writes,
+        "sectors": sectors,
+        "drive": drive
+    })
+    order = np.argsort(arrivals, kind="stable").tolist()
+    arrival_order = arrivals[order].tolist()
+    start = [0.0] * n
+    finish = [0.0] * n
+    sequence = [head]
+    now = 0.0
+    admitted = 0
+
+    for _ in range(n):
+        if not len(scheduler):
+            # Idle until the next request shows up
+            now = max(now, arrival_order[admitted])
+        while admitted < n and arrival_order[admitted] <= now:
+            scheduler.add(order[admitted])
+            admitted += 1
+
+        request_id, path = scheduler.next(head, now)
+        stops = path + [cylinders[request_id]]
+        seek = 0.0
+        for stop in stops:
+            seek += drive.seek_ms(stop - head)
+            head = stop
+        sequence.extend(stops)
+
+        if sectors is None:
+            rotation = half_rotation
+        else:
+            rotation = drive.rotational_wait(sectors[request_id], now + seek)
+        start[request_id] = now
+        now += seek + rotation + transfer[request_id]
+        finish[request_id] = now
+
+    start = np.array(start)
+    finish = np.array(finish)
+    wait = start - arrivals
+    response = finish - arrivals
+    metrics = calculate_metrics(sequence)
+    metrics.update(latency_metrics(wait, response))
+    metrics["makespan_ms"] = float(now)
+    return {
+        "sequence": sequence,
+        "start": start,
+        "finish": finish,
+        "wait": wait,
+        "response": response,
+        "metrics": metrics
+    }
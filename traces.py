@@ -0,0 +1,152 @@
+"""Streaming readers for block-I/O traces.
+
+Supported formats:
+  blkparse  default text output of blkparse (one event per line)
+  spc       UMass/SPC CSV: ASU,LBA,Size,Opcode,Timestamp
+  msr       MSR-Cambridge CSV: Timestamp,Hostname,DiskNumber,Type,Offset,Size,ResponseTime
+
+Files are memory-mapped and parsed line by line into fixed-size typed
+buffers, which are handed out as NumPy chunks. At no point is the trace
+held as a Python list, so arbitrarily large files replay in constant memory.
+"""
+from array import array
+import mmap
+import os
+
+import numpy as np
+
+import registry
+
+SECTOR_SIZE = 512
+DEFAULT_CHUNK_SIZE = 65536
+
+def parse_blkparse(line, action=b"D"):
+    #   8,0    3        1     0.000000000  697  D   W 223490 + 8 [kjournald]
+    fields = line.split()
+    if len(fields) < 10 or fields[5] != action or fields[8] != b"+":
+        return None
+    return float(fields[3]), int(fields[7]), int(fields[9]) * SECTOR_SIZE, b"W" in fields[6]
+
+def parse_spc(line):
+    # 0,303567,3584,w,0.000000
+    fields = line.split(b",")
+    if len(fields) < 5:
+        return None
+    return float(fields[4]), int(fields[1]), int(fields[2]), fields[3].strip().lower() == b"w"
+
+def parse_msr(line):
+    # 128166372003061629,hm,1,Read,3154265088,32768,1186
+    fields = line.split(b",")
+    if len(fields) < 6:
+        return None
+    # Windows filetime ticks (100 ns) to seconds; byte offsets to sectors
+    return (int(fields[0]) / 1e7, int(fields[4]) // SECTOR_SIZE, int(fields[5]),
+            fields[3].strip().lower() == b"write")
+
+PARSERS = {
+    "blkparse": parse_blkparse,
+    "spc": parse_spc,
+    "msr": parse_msr
+}
+
+def _lines(path):
+    if os.path.getsize(path) == 0:
+        return
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for line in iter(mm.readline, b""):
+            yield line
+
+def read_trace(path, fmt, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield the trace as dicts of NumPy arrays with up to chunk_size requests
+
+    Each chunk has "timestamp" (seconds), "lba" (sectors), "size" (bytes)
+    and "write" (bool). Lines that do not parse (headers, blkparse summary
+    lines, other event types) are skipped.
+    """
+    if fmt not in PARSERS:
+        raise ValueError(f"Unknown trace format: {fmt}")
+    parse = PARSERS[fmt]
+
+    def empty():
+        return array('d'), array('q'), array('q'), array('b')
+
+    timestamps, lbas, sizes, writes = empty()
+    for line in _lines(path):
+        try:
+            record = parse(line)
+        except ValueError:
+            continue
+        if record is None:
+            continue
+        timestamps.append(record[0])
+        lbas.append(record[1])
+        sizes.append(record[2])
+        writes.append(record[3])
+        if len(lbas) >= chunk_size:
+            yield _chunk(timestamps, lbas, sizes, writes)
+            timestamps, lbas, sizes, writes = empty()
+    if lbas:
+        yield _chunk(timestamps, lbas, sizes, writes)
+
+def _chunk(timestamps, lbas, sizes, writes):
+    return {
+        "timestamp": np.frombuffer(timestamps, dtype=np.float64),
+        "lba": np.frombuffer(lbas, dtype=np.int64),
+        "size": np.frombuffer(sizes, dtype=np.int64),
+        "write": np.frombuffer(writes, dtype=np.int8).astype(bool)
+    }
+
+def max_lba(path, fmt, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Highest LBA touched by the trace, found with one streaming pass"""
+    highest = 0
+    for chunk in read_trace(path, fmt, chunk_size):
+        highest = max(highest, int(chunk["lba"].max()))
+    return highest
+
+def lba_to_cylinder(lba, disk_size, max_lba):
+    """Scale LBAs linearly onto the simulator's 0..disk_size-1 cylinder range"""
+    scale = disk_size / (max_lba + 1)
+    cylinders = (np.asarray(lba, dtype=np.float64) * scale).astype(np.int64)
+    return np.clip(cylinders, 0, disk_size - 1)
+
+def iter_cylinders(path, fmt, disk_size, chunk_size=DEFAULT_CHUNK_SIZE, highest_lba=None):
+    """Yield the trace as int64 cylinder arrays of up to chunk_size requests"""
+    if highest_lba is None:
+        highest_lba = max_lba(path, fmt, chunk_size)
+    for chunk in read_trace(path, fmt, chunk_size):
+        yield lba_to_cylinder(chunk["lba"], disk_size, highest_lba)
+
+def replay(path, fmt, algorithm, head, disk_size, chunk_size=DEFAULT_CHUNK_SIZE, highest_lba=None,
+           drive=None):
+    """Run a scheduler over a trace, one chunk (scheduling window) at a time
+
+    Each chunk is scheduled as one queue starting from where the previous
+    chunk left the head. algorithm is a registry name or a scheduler
+    function. Returns calculate_metrics-style totals; with a drive model
+    they include its millisecond timings, summed over the chunks.
+    """
+    schedule = algorithm if callable(algorithm) else registry.get_algorithm(algorithm)
+    total_movement = 0
+    num_operations = 0
+    num_requests = 0
+    timings = {"seek_time_ms": 0.0, "rotational_latency_ms": 0.0, "transfer_time_ms": 0.0,
+               "total_time_ms": 0.0}
+    for cylinders in iter_cylinders(path, fmt, disk_size, chunk_size, highest_lba):
+        sequence = schedule(cylinders, head, disk_size)
+        total_movement += int(np.abs(np.diff(sequence)).sum())
+        num_operations += len(sequence) - 1
+        num_requests += len(cylinders)
+        head = int(sequence[-1])
+        if drive is not None:
+            chunk = drive.metrics(sequence, requests=cylinders)
+            for name in timings:
+                timings[name] += chunk[name]
+    metrics = {
+        "total_movement": total_movement,
+        "avg_seek_time": total_movement / num_operations if num_operations else 0,
+        "num_operations": num_operations
+    }
+    if drive is not None:
+        metrics.update(timings)
+        metrics["avg_access_time_ms"] = timings["total_time_ms"] / num_requests if num_requests else 0.0
+    return metrics
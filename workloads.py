@@ -0,0 +1,203 @@
+"""Seeded synthetic workload generators.
+
+Request positions come from one of the PATTERNS:
+
+  uniform     independent uniform cylinders (repeats allowed)
+  zipf        Zipf-distributed popularity over fixed-size regions of the disk
+  hotspot     a share of requests lands in a few hot areas, the rest uniform
+  sequential  interleaved sequential streams that occasionally jump
+
+Optionally each request gets a read/write flag and an arrival time from
+one of the ARRIVALS processes (poisson, or bursty on/off). Everything is
+drawn with NumPy in chunks, so a workload of 10^8 requests can be streamed
+from generate() in constant memory. Disk sizes may be up to 2**62 cylinders;
+no range(disk_size) is ever built.
+
+Positions, write flags and arrival times are drawn from independent streams
+spawned from the seed. So, for example, adding arrival times to a workload
+does not change its cylinders.
+"""
+import numpy as np
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+class Uniform:
+    def __init__(self, disk_size, rng):
+        self.disk_size = disk_size
+        self.rng = rng
+
+    def take(self, count):
+        return self.rng.integers(0, self.disk_size, count, dtype=np.int64)
+
+class Zipf:
+    """Region k (in popularity order) is chosen with probability ~ 1/k^s
+
+    The popularity order is a random permutation of the regions, so the
+    hot regions are scattered over the disk.
+    """
+
+    def __init__(self, disk_size, rng, s=1.2, regions=1024):
+        self.disk_size = disk_size
+        self.rng = rng
+        regions = max(1, min(int(regions), disk_size))
+        self.width = -(-disk_size // regions)
+        weights = np.arange(1, regions + 1, dtype=np.float64) ** -s
+        self.cdf = np.cumsum(weights) / weights.sum()
+        self.region_start = rng.permutation(regions).astype(np.int64) * self.width
+
+    def take(self, count):
+        rank = np.searchsorted(self.cdf, self.rng.random(count), side="right")
+        rank = np.minimum(rank, len(self.cdf) - 1)
+        offset = self.rng.integers(0, self.width, count, dtype=np.int64)
+        return np.minimum(self.region_start[rank] + offset, self.disk_size - 1)
+
+class Hotspot:
+    def __init__(self, disk_size, rng, hot_fraction=0.1, hot_probability=0.9, hotspots=1):
+        self.disk_size = disk_size
+        self.rng = rng
+        self.hot_probability = hot_probability
+        self.hot_width = max(1, int(disk_size * hot_fraction) // hotspots)
+        self.hot_start = rng.integers(0, disk_size - self.hot_width + 1, hotspots, dtype=np.int64)
+
+    def take(self, count):
+        hot = self.rng.random(count) < self.hot_probability
+        spot = self.rng.integers(0, len(self.hot_start), count)
+        near = self.hot_start[spot] + self.rng.integers(0, self.hot_width, count, dtype=np.int64)
+        anywhere = self.rng.integers(0, self.disk_size, count, dtype=np.int64)
+        return np.where(hot, near, anywhere)
+
+class Sequential:
+    """streams interleaved sequential readers, each advancing by stride
+
+    A request jumps to a random cylinder with jump_probability, and its
+    stream continues sequentially from there. Positions wrap at the end of
+    the disk and carry over from one chunk to the next.
+    """
+
+    def __init__(self, disk_size, rng, streams=1, jump_probability=0.01, stride=1):
+        self.disk_size = disk_size
+        self.rng = rng
+        self.streams = streams
+        self.jump_probability = jump_probability
+        self.stride = stride
+        self.position = rng.integers(0, disk_size, streams, dtype=np.int64)
+
+    def take(self, count):
+        if count == 0:
+            return np.empty(0, dtype=np.int64)
+        stream = self.rng.integers(0, self.streams, count)
+        jump = self.rng.random(count) < self.jump_probability
+
+        # Group by stream (keeping request order within each) and cut every
+        # stream into runs that start at a jump or at the stream's first
+        # request in this chunk
+        order = np.argsort(stream, kind="stable")
+        stream = stream[order]
+        jump = jump[order]
+        first_of_stream = np.r_[True, stream[1:] != stream[:-1]]
+        run_starts = np.flatnonzero(first_of_stream | jump)
+        run = np.cumsum(first_of_stream | jump) - 1
+        base = np.where(jump[run_starts],
+                        self.rng.integers(0, self.disk_size, len(run_starts), dtype=np.int64),
+                        self.position[stream[run_starts]])
+        step = (np.arange(count) - run_starts[run]) * self.stride % self.disk_size
+        positions = (base[run] + step) % self.disk_size
+
+        last_of_stream = np.r_[first_of_stream[1:], True]
+        self.position[stream[last_of_stream]] = (positions[last_of_stream] + self.stride) % self.disk_size
+        cylinders = np.empty(count, dtype=np.int64)
+        cylinders[order] = positions
+        return cylinders
+
+class PoissonArrivals:
+    def __init__(self, rng, mean_interval_ms=10.0):
+        self.rng = rng
+        self.mean_interval_ms = mean_interval_ms
+        self.clock = 0.0
+
+    def take(self, count):
+        times = self.clock + np.cumsum(self.rng.exponential(self.mean_interval_ms, count))
+        if count:
+            self.clock = float(times[-1])
+        return times
+
+class BurstyArrivals:
+    """On/off arrivals with the same long-run rate as PoissonArrivals
+
+    Requests come in bursts of burst_size on average, burst_interval_ms
+    apart. The idle gaps between bursts are stretched so that the mean
+    interval over the whole workload stays mean_interval_ms.
+    """
+
+    def __init__(self, rng, mean_interval_ms=10.0, burst_size=16, burst_interval_ms=0.5):
+        if burst_interval_ms > mean_interval_ms:
+            raise ValueError("burst_interval_ms must not exceed mean_interval_ms")
+        self.rng = rng
+        self.burst_probability = 1.0 / burst_size
+        self.burst_interval_ms = burst_interval_ms
+        self.gap_ms = mean_interval_ms * burst_size - burst_interval_ms * (burst_size - 1)
+        self.clock = 0.0
+
+    def take(self, count):
+        new_burst = self.rng.random(count) < self.burst_probability
+        gaps = np.where(new_burst, self.rng.exponential(self.gap_ms, count),
+                        self.rng.exponential(self.burst_interval_ms, count))
+        times = self.clock + np.cumsum(gaps)
+        if count:
+            self.clock = float(times[-1])
+        return times
+
+PATTERNS = {
+    "uniform": Uniform,
+    "zipf": Zipf,
+    "hotspot": Hotspot,
+    "sequential": Sequential
+}
+
+ARRIVALS = {
+    "poisson": PoissonArrivals,
+    "bursty": BurstyArrivals
+}
+
+def generate(n, disk_size, pattern="uniform", seed=None, chunk_size=DEFAULT_CHUNK_SIZE,
+             write_fraction=0.0, arrivals=None, pattern_params=None, arrival_params=None):
+    """Yield a workload as chunks of up to chunk_size requests
+
+    Each chunk is a dict with int64 "cylinder" and bool "write" arrays, plus
+    float64 "arrival" times in ms when an arrival process is named.
+    """
+    if pattern not in PATTERNS:
+        raise ValueError(f"Unknown workload pattern: {pattern}")
+    if arrivals is not None and arrivals not in ARRIVALS:
+        raise ValueError(f"Unknown arrival process: {arrivals}")
+    disk_size = int(disk_size)
+    if disk_size < 1:
+        raise ValueError("disk_size must be positive")
+    position_seed, write_seed, arrival_seed = np.random.SeedSequence(seed).spawn(3)
+    positions = PATTERNS[pattern](disk_size, np.random.default_rng(position_seed), **(pattern_params or {}))
+    write_rng = np.random.default_rng(write_seed)
+    clock = None
+    if arrivals is not None:
+        clock = ARRIVALS[arrivals](np.random.default_rng(arrival_seed), **(arrival_params or {}))
+
+    for start in range(0, n, chunk_size):
+        count = min(chunk_size, n - start)
+        chunk = {
+            "cylinder": positions.take(count),
+            "write": write_rng.random(count) < write_fraction
+        }
+        if clock is not None:
+            chunk["arrival"] = clock.take(count)
+        yield chunk
+
+def generate_workload(n, disk_size, pattern="uniform", seed=None, **kwargs):
+    """generate() collected into single arrays, for workloads that fit in memory"""
+    chunks = list(generate(n, disk_size, pattern, seed, **kwargs))
+    if not chunks:
+        return {"cylinder": np.empty(0, dtype=np.int64), "write": np.empty(0, dtype=bool)}
+    return {key: np.concatenate([c[key] for c in chunks]) for key in chunks[0]}
+
+def generate_requests(n, disk_size, pattern="uniform", seed=None, **pattern_params):
+    """Just the cylinders, as the int64 array the scheduling functions take"""
+    workload = generate_workload(n, disk_size, pattern, seed, pattern_params=pattern_params)
+    return workload["cylinder"]